@@ -0,0 +1,226 @@
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+# Request kinds decoded together by WhisperASR.transcribe_batch_scored.
+BATCHED_KINDS = ("text", "scored")
+
+
+class _Request:
+    __slots__ = ("audio", "future", "enqueued", "deadline", "kind", "kwargs")
+
+    def __init__(self, audio, future, enqueued, deadline, kind="text", kwargs=None):
+        self.audio = audio
+        self.future = future
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.kind = kind
+        self.kwargs = kwargs or {}
+
+
+class BatchingASRScheduler:
+    """
+    Cross-session batching in front of one WhisperASR.
+
+    Utterances submitted by any session within `max_wait_ms` of the first
+    queued one are transcribed together with `WhisperASR.transcribe_batch_scored`
+    (one encoder pass, one decode); plain and scored requests share a batch,
+    each with its own language (None = detect). A batch is flushed early when
+    it is full or when waiting longer would push the oldest request past its
+    latency SLO, using a running estimate of batch duration. Word-level
+    partial passes (`submit_words`) and structured decodes (`submit_structured`)
+    are not batched but share the same model thread.
+    """
+
+    def __init__(self, asr, max_batch_size=8, max_wait_ms=30, slo_ms=1500):
+        self.asr = asr
+        self.model_size = getattr(asr, "model_size", None)
+        self.max_batch_size = max_batch_size
+        self.max_wait_sec = max_wait_ms / 1000.0
+        self.slo_sec = slo_ms / 1000.0
+        self._queue: deque[_Request] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Running estimate: batch_sec ~= base + per_item * batch_size
+        self._est_base_sec = 0.2
+        self._est_item_sec = 0.1
+
+        self.requests = 0
+        self.batches = 0
+        self.slo_violations = 0
+        self.batch_sizes = Counter()
+        self.queue_wait_ms = deque(maxlen=1000)
+
+        self._thread = threading.Thread(target=self._run, name="asr-batcher", daemon=True)
+        self._thread.start()
+
+    # ----------------------------------------------------------- submission
+
+    def _enqueue(self, audio, kind, kwargs, slo_ms=None) -> Future:
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+        now = time.time()
+        slo = self.slo_sec if slo_ms is None else slo_ms / 1000.0
+        # Copy: callers may pass ring buffer views that are overwritten later.
+        request = _Request(np.array(audio, dtype=np.float32), Future(), now, now + slo, kind, kwargs)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is shut down")
+            self._queue.append(request)
+            self.requests += 1
+            self._cond.notify()
+        return request.future
+
+    def submit(self, audio: np.ndarray, slo_ms: float | None = None, language: str | None = None) -> Future:
+        """Future resolving to the transcript of `audio`."""
+        return self._enqueue(audio, "text", {"language": language}, slo_ms)
+
+    def submit_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None, language: str | None = None, scored: bool = False
+    ) -> Future:
+        return self._enqueue(
+            audio, "words", {"initial_prompt": initial_prompt, "language": language, "scored": scored}
+        )
+
+    def submit_scored(self, audio: np.ndarray, language: str | None = None) -> Future:
+        """Future resolving to a ScoredTranscript."""
+        return self._enqueue(audio, "scored", {"language": language})
+
+    def submit_structured(self, audio: np.ndarray, **kwargs) -> Future:
+        """Future resolving to WhisperASR.transcribe_structured hypotheses (not batched)."""
+        return self._enqueue(audio, "structured", kwargs)
+
+    def transcribe(self, audio: np.ndarray, sample_rate=16000) -> str:
+        return self.submit(audio).result()
+
+    def transcribe_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None, sample_rate=16000, language=None, scored=False
+    ):
+        return self.submit_words(audio, initial_prompt=initial_prompt, language=language, scored=scored).result()
+
+    # ------------------------------------------------------------- batching
+
+    def _estimate_batch_sec(self, size: int) -> float:
+        return self._est_base_sec + self._est_item_sec * size
+
+    def _collect(self) -> list[_Request]:
+        """Block until a batch is ready; caller holds no lock."""
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return []
+
+            head = self._queue[0]
+            if head.kind not in BATCHED_KINDS:
+                return [self._queue.popleft()]
+
+            window_end = head.enqueued + self.max_wait_sec
+            while True:
+                texts = [r for r in self._queue if r.kind in BATCHED_KINDS]
+                size = min(len(texts), self.max_batch_size)
+                now = time.time()
+                earliest_deadline = min(r.deadline for r in texts[:size])
+                # Flush if full, window elapsed, or waiting would break the SLO.
+                if (
+                    size >= self.max_batch_size
+                    or now >= window_end
+                    or now + self._estimate_batch_sec(size + 1) >= earliest_deadline
+                    or self._closed
+                ):
+                    break
+                self._cond.wait(timeout=max(window_end - now, 0.0))
+
+            batch = texts[:size]
+            for request in batch:
+                self._queue.remove(request)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            start = time.time()
+            # Stats are read from other threads (metrics endpoint, replay report).
+            with self._cond:
+                for request in batch:
+                    self.queue_wait_ms.append((start - request.enqueued) * 1000.0)
+            try:
+                if batch[0].kind == "words":
+                    results = [self.asr.transcribe_words(batch[0].audio, **batch[0].kwargs)]
+                elif batch[0].kind == "structured":
+                    results = [self.asr.transcribe_structured(batch[0].audio, **batch[0].kwargs)]
+                else:
+                    scored = self.asr.transcribe_batch_scored(
+                        [r.audio for r in batch], [r.kwargs.get("language") for r in batch]
+                    )
+                    results = [s if r.kind == "scored" else s.text for r, s in zip(batch, scored)]
+            except Exception as exc:
+                for request in batch:
+                    request.future.set_exception(exc)
+                continue
+            end = time.time()
+
+            with self._cond:
+                if batch[0].kind in BATCHED_KINDS:
+                    self.batches += 1
+                    self.batch_sizes[len(batch)] += 1
+                    self._update_estimate(len(batch), end - start)
+                self.slo_violations += sum(end > request.deadline for request in batch)
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+    def _update_estimate(self, size: int, duration: float, alpha=0.2) -> None:
+        predicted = self._estimate_batch_sec(size)
+        error = duration - predicted
+        # Split the correction between the fixed and per-item terms.
+        self._est_base_sec = max(self._est_base_sec + alpha * error / 2, 0.0)
+        self._est_item_sec = max(self._est_item_sec + alpha * error / (2 * size), 0.0)
+
+    # ---------------------------------------------------------------- stats
+
+    @property
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> dict[str, float]:
+        # Snapshot under the lock: the batcher thread keeps appending.
+        with self._cond:
+            queue_depth = len(self._queue)
+            waits = list(self.queue_wait_ms)
+            batch_sizes = dict(self.batch_sizes)
+            requests, batches, slo_violations = self.requests, self.batches, self.slo_violations
+            est_base_sec, est_item_sec = self._est_base_sec, self._est_item_sec
+        waits.sort()
+        total_items = sum(size * count for size, count in batch_sizes.items())
+        return {
+            "queue_depth": float(queue_depth),
+            "requests": float(requests),
+            "batches": float(batches),
+            "avg_batch_size": total_items / batches if batches else 0.0,
+            "max_batch_size": float(max(batch_sizes, default=0)),
+            "queue_wait_p95_ms": waits[int(round((len(waits) - 1) * 0.95))] if waits else 0.0,
+            "slo_violations": float(slo_violations),
+            "est_batch_base_ms": est_base_sec * 1000.0,
+            "est_batch_item_ms": est_item_sec * 1000.0,
+        }
+
+    def warm_up(self) -> None:
+        from audio.sources import synthetic_speech
+
+        self.transcribe(synthetic_speech())
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
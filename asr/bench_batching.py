@@ -0,0 +1,114 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import glob
+import json
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from asr.whisper_asr import WhisperASR
+from asr.batch_scheduler import BatchingASRScheduler
+
+
+def load_corpus(wav_dir: str | None, count: int) -> list[np.ndarray]:
+    """16 kHz mono WAVs from wav_dir, or synthetic 2-6 s noise bursts."""
+    if wav_dir:
+        audios = []
+        for path in sorted(glob.glob(os.path.join(wav_dir, "*.wav")))[:count]:
+            with wave.open(path, "rb") as wav:
+                pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+            audios.append(pcm.astype(np.float32) / 32768.0)
+        return audios
+    rng = np.random.default_rng(0)
+    return [
+        (0.05 * rng.standard_normal(int(16000 * rng.uniform(2.0, 6.0)))).astype(np.float32)
+        for _ in range(count)
+    ]
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[int(round((len(values) - 1) * q))] if values else 0.0
+
+
+def bench_sequential(asr: WhisperASR, audios: list[np.ndarray]) -> dict:
+    latencies = []
+    start = time.time()
+    for audio in audios:
+        t0 = time.time()
+        # Same greedy decode settings as the batched path, batch of one.
+        asr.transcribe_batch([audio])
+        latencies.append((time.time() - t0) * 1000.0)
+    wall = time.time() - start
+    return {
+        "mode": "per_utterance",
+        "utterances": len(audios),
+        "wall_sec": wall,
+        "throughput_utt_per_sec": len(audios) / wall,
+        "latency_p50_ms": _pct(latencies, 0.5),
+        "latency_p95_ms": _pct(latencies, 0.95),
+    }
+
+
+def bench_batched(asr: WhisperASR, audios: list[np.ndarray], sessions: int, max_batch: int, wait_ms: float) -> dict:
+    scheduler = BatchingASRScheduler(asr, max_batch_size=max_batch, max_wait_ms=wait_ms, slo_ms=60000)
+
+    def caller(audio):
+        t0 = time.time()
+        scheduler.transcribe(audio)
+        return (time.time() - t0) * 1000.0
+
+    # `sessions` concurrent callers submitting back-to-back.
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        latencies = list(pool.map(caller, audios))
+    wall = time.time() - start
+    stats = scheduler.stats()
+    scheduler.shutdown()
+    return {
+        "mode": "batched",
+        "sessions": sessions,
+        "utterances": len(audios),
+        "wall_sec": wall,
+        "throughput_utt_per_sec": len(audios) / wall,
+        "latency_p50_ms": _pct(latencies, 0.5),
+        "latency_p95_ms": _pct(latencies, 0.95),
+        "scheduler": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched vs per-utterance Whisper throughput on CPU")
+    parser.add_argument("--wav-dir", help="directory of 16 kHz mono WAV utterances")
+    parser.add_argument("--count", type=int, default=32)
+    parser.add_argument("--model", default="medium")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    audios = load_corpus(args.wav_dir, args.count)
+    print(f"⏳ Loading Whisper ({args.model})...")
+    asr = WhisperASR(model_size=args.model)
+    asr.transcribe_batch(audios[:1])   # warm-up
+
+    results = {
+        "model": args.model,
+        "sequential": bench_sequential(asr, audios),
+        "batched": bench_batched(asr, audios, args.sessions, args.max_batch, args.wait_ms),
+    }
+    results["speedup"] = (
+        results["batched"]["throughput_utt_per_sec"] / results["sequential"]["throughput_utt_per_sec"]
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
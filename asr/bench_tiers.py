@@ -0,0 +1,192 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import glob
+import json
+import re
+import time
+
+from audio.sources import load_wav
+from asr.router import ASRTierRouter, parse_tiers
+from asr.whisper_asr import WhisperASR
+from logic.state_machine import State
+from logic.verify import best_candidate, extract_dob, extract_last4, extract_mobile
+
+
+def load_turns(wav_dir: str) -> list[dict]:
+    """
+    Recorded turns: <name>.wav with the reference transcript in <name>.txt.
+    The turn's state is inferred from what the reference contains (a mobile
+    number -> VERIFY_MOBILE, last 4 digits or a date -> VERIFY_SECONDARY).
+    """
+    turns = []
+    for path in sorted(glob.glob(os.path.join(wav_dir, "*.wav"))):
+        ref_path = os.path.splitext(path)[0] + ".txt"
+        if not os.path.exists(ref_path):
+            continue
+        with open(ref_path, "r", encoding="utf-8") as f:
+            reference = f.read().strip()
+        if extract_mobile(reference):
+            state = State.VERIFY_MOBILE
+        elif extract_last4(reference) or extract_dob(reference):
+            state = State.VERIFY_SECONDARY
+        else:
+            state = State.LISTENING
+        turns.append({"path": path, "audio": load_wav(path), "reference": reference, "state": state})
+    return turns
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def word_errors(reference: str, hypothesis: str) -> tuple[int, int]:
+    """(edit distance in words, reference length)."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1], len(ref)
+
+
+def _extractor(reference: str, state: State):
+    if state == State.VERIFY_MOBILE:
+        return extract_mobile
+    if state == State.VERIFY_SECONDARY:
+        # A date in the reference is what the caller gave; otherwise the last 4 digits.
+        return extract_dob if extract_dob(reference) else extract_last4
+    return None
+
+
+def field_correct(reference: str, hypothesis: str, state: State) -> bool | None:
+    """
+    Does the hypothesis yield the same verification value the session would
+    extract from the reference? None for turns that are not verification.
+    """
+    extract = _extractor(reference, state)
+    if extract is None:
+        return None
+    return extract(hypothesis) == extract(reference)
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[int(round((len(values) - 1) * q))] if values else 0.0
+
+
+def score(turns: list[dict], texts: list[str], latencies: list[float]) -> dict:
+    errors = total = 0
+    fields = []
+    for turn, text in zip(turns, texts):
+        e, n = word_errors(turn["reference"], text)
+        errors, total = errors + e, total + n
+        correct = field_correct(turn["reference"], text, turn["state"])
+        if correct is not None:
+            fields.append(correct)
+    return {
+        "latency_p50_ms": _pct(latencies, 0.5),
+        "latency_p95_ms": _pct(latencies, 0.95),
+        "wer": errors / total if total else 0.0,
+        "field_accuracy": sum(fields) / len(fields) if fields else None,
+    }
+
+
+def run_tier(asr: WhisperASR, turns: list[dict]) -> list[dict]:
+    asr.transcribe_scored(turns[0]["audio"])   # warm-up
+    results = []
+    for turn in turns:
+        t0 = time.perf_counter()
+        result = asr.transcribe_scored(turn["audio"])
+        results.append({"result": result, "latency_ms": (time.perf_counter() - t0) * 1000.0})
+    return results
+
+
+def run_structured(asr: WhisperASR, turns: list[dict], alternatives: int, language: str) -> dict | None:
+    """Verification turns only: the digit/date decoding profile, value voted across alternatives."""
+    turns = [turn for turn in turns if turn["state"] in (State.VERIFY_MOBILE, State.VERIFY_SECONDARY)]
+    if not turns:
+        return None
+    asr.transcribe_structured(turns[0]["audio"], language=language, alternatives=alternatives)   # warm-up
+    latencies, correct = [], []
+    for turn in turns:
+        t0 = time.perf_counter()
+        hypotheses = asr.transcribe_structured(turn["audio"], language=language, alternatives=alternatives)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        extract = _extractor(turn["reference"], turn["state"])
+        correct.append(best_candidate(hypotheses, extract) == extract(turn["reference"]))
+    return {
+        "turns": len(turns),
+        "latency_p50_ms": _pct(latencies, 0.5),
+        "latency_p95_ms": _pct(latencies, 0.95),
+        "field_accuracy": sum(correct) / len(correct),
+    }
+
+
+def simulate_router(router: ASRTierRouter, turns: list[dict], per_tier: dict[str, list[dict]]) -> dict:
+    """
+    Replay the router's policy on the measured per-tier decodes: chosen
+    tier, plus the large tier's decode on top when the fast result is unsure.
+    """
+    texts, latencies, escalations = [], [], 0
+    for i, turn in enumerate(turns):
+        tier = router.choose(turn["state"], turn["audio"].shape[0] / 16000)
+        decoded = per_tier[tier][i]
+        latency, text = decoded["latency_ms"], decoded["result"].text
+        if tier != router.large and not router.confident(decoded["result"]):
+            escalations += 1
+            large = per_tier[router.large][i]
+            latency, text = latency + large["latency_ms"], large["result"].text
+        texts.append(text)
+        latencies.append(latency)
+    return {**score(turns, texts, latencies), "escalation_rate": escalations / len(turns)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Latency and accuracy per Whisper tier (and the digit/date profile) on recorded turns"
+    )
+    parser.add_argument("wav_dir", help="directory of <name>.wav + <name>.txt reference pairs")
+    parser.add_argument("--tiers", default=os.getenv("ASR_TIERS") or "base,medium", help="smallest first")
+    parser.add_argument("--short-sec", type=float, default=1.5)
+    parser.add_argument("--min-logprob", type=float, default=-0.7)
+    parser.add_argument("--max-no-speech", type=float, default=0.6)
+    parser.add_argument("--alternatives", type=int, default=3, help="structured profile hypotheses")
+    parser.add_argument("--structured-language", default="en")
+    args = parser.parse_args()
+
+    turns = load_turns(args.wav_dir)
+    if not turns:
+        parser.error("no <name>.wav + <name>.txt pairs found")
+    tiers = parse_tiers(args.tiers)
+    per_tier = {}
+    results = {"turns": len(turns), "tiers": {}}
+    for name in tiers:
+        print(f"⏳ Loading Whisper ({name})...")
+        asr = WhisperASR(model_size=name)
+        decoded = per_tier[name] = run_tier(asr, turns)
+        results["tiers"][name] = score(
+            turns, [d["result"].text for d in decoded], [d["latency_ms"] for d in decoded]
+        )
+        # Same verification turns through the digit/date profile, for comparison.
+        results["tiers"][name]["structured"] = run_structured(
+            asr, turns, args.alternatives, args.structured_language
+        )
+    if len(tiers) > 1:
+        router = ASRTierRouter(
+            {name: None for name in tiers},
+            short_sec=args.short_sec,
+            min_logprob=args.min_logprob,
+            max_no_speech=args.max_no_speech,
+        )
+        results["routed"] = simulate_router(router, turns, per_tier)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import os
+from collections import deque
+
+# Callers mix these freely within one call (and one sentence).
+CODE_SWITCH_LANGUAGES = {"hi", "en"}
+
+
+class LanguageTracker:
+    """
+    Per-session spoken language, so Whisper stops detecting it every turn.
+
+    `language` is what the next decode should use (None = detect). Each
+    decode is fed back through `observe()`. Once the last `confirm_turns`
+    confident detections (probability >= `min_probability`) agree, that
+    language is pinned; if they are a Hindi/English mix, the code-switch
+    language is pinned instead. The FAQ keywords are romanized Hinglish, so
+    by default a code-switching caller is decoded as "en" (Latin script).
+    A pinned decode scoring below `min_logprob` unpins, and the following
+    turns detect again.
+
+    ASR time per second of audio is tracked separately for detected and
+    pinned turns; `stats()["saved_ms"]` is the difference applied to the
+    pinned audio.
+    """
+
+    def __init__(
+        self,
+        confirm_turns: int = 2,
+        min_probability: float = 0.8,
+        min_logprob: float = -1.0,
+        code_switch_language: str = "en",
+    ):
+        self.confirm_turns = confirm_turns
+        self.min_probability = min_probability
+        self.min_logprob = min_logprob
+        self.code_switch_language = code_switch_language
+        self.pinned = None
+        self.code_switched = False
+        self._detections = deque(maxlen=confirm_turns)
+
+        self.detected_turns = 0
+        self.pinned_turns = 0
+        self.pins = 0
+        self.redetections = 0
+        self._detected_ms = self._detected_sec = 0.0
+        self._pinned_ms = self._pinned_sec = 0.0
+
+    @property
+    def language(self) -> str | None:
+        return self.pinned
+
+    def pin(self, language: str) -> None:
+        """Language known up front (e.g. from the client); a low-confidence decode still unpins it."""
+        self.pinned, self.code_switched = language, False
+        self._detections.clear()
+        self.pins += 1
+        print(f"[LANG] pinned {language} (given)")
+
+    def observe(self, result, language: str | None, asr_ms: float, audio_sec: float) -> None:
+        """
+        result: ScoredTranscript of the turn
+        language: what the decode was given (None if it detected)
+        """
+        if language is not None:
+            self.pinned_turns += 1
+            self._pinned_ms += asr_ms
+            self._pinned_sec += audio_sec
+            if result.text and result.avg_logprob < self.min_logprob and self.pinned == language:
+                print(f"[LANG] low confidence under {language} (logprob={result.avg_logprob:.2f}); re-detecting")
+                self.redetections += 1
+                self.pinned = None
+                self.code_switched = False
+                self._detections.clear()
+            return
+
+        self.detected_turns += 1
+        self._detected_ms += asr_ms
+        self._detected_sec += audio_sec
+        if not result.text or result.language_probability < self.min_probability:
+            return
+        self._detections.append(result.language)
+        if len(self._detections) < self.confirm_turns:
+            return
+        seen = set(self._detections)
+        if len(seen) == 1:
+            self.pinned, self.code_switched = result.language, False
+        elif seen <= CODE_SWITCH_LANGUAGES:
+            self.pinned, self.code_switched = self.code_switch_language, True
+        else:
+            return
+        self.pins += 1
+        print(f"[LANG] pinned {self.pinned}" + (" (hi/en code-switch)" if self.code_switched else ""))
+
+    def stats(self) -> dict[str, float]:
+        detect_rate = self._detected_ms / self._detected_sec if self._detected_sec else 0.0
+        pinned_rate = self._pinned_ms / self._pinned_sec if self._pinned_sec else 0.0
+        return {
+            "detected_turns": float(self.detected_turns),
+            "pinned_turns": float(self.pinned_turns),
+            "pins": float(self.pins),
+            "redetections": float(self.redetections),
+            "detected_ms_per_sec": detect_rate,
+            "pinned_ms_per_sec": pinned_rate,
+            "saved_ms": (detect_rate - pinned_rate) * self._pinned_sec if detect_rate and pinned_rate else 0.0,
+        }
+
+
+def load_language_tracker() -> LanguageTracker:
+    """Thresholds from LANGUAGE_* / ASR_CODE_SWITCH_LANGUAGE."""
+    return LanguageTracker(
+        confirm_turns=int(os.getenv("LANGUAGE_CONFIRM_TURNS", "2")),
+        min_probability=float(os.getenv("LANGUAGE_MIN_PROBABILITY", "0.8")),
+        min_logprob=float(os.getenv("LANGUAGE_REDETECT_LOGPROB", "-1.0")),
+        code_switch_language=os.getenv("ASR_CODE_SWITCH_LANGUAGE", "en"),
+    )
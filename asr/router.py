@@ -0,0 +1,217 @@
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from logic.state_machine import State
+
+# Turns whose answer is a number or a date: a small model gets these right.
+STRUCTURED_STATES = {State.VERIFY_MOBILE, State.VERIFY_SECONDARY, State.VERIFY_FAILED}
+
+
+class ASRTierRouter:
+    """
+    Several Whisper backends of increasing size behind the ASR backend API.
+
+    `submit_turn(audio, state, language)` picks a tier from the conversation state and
+    the utterance length: verification turns (digits, dates) and very short
+    replies go to the fastest tier, free-form questions to the largest. A
+    fast-tier result with low confidence (avg log-probability below
+    `min_logprob`, or no-speech probability above `max_no_speech`) is
+    decoded again on the largest tier. The returned future carries
+    `asr_tier` and `escalated` once resolved. `submit_structured` does the
+    same for the digit/date decoding profile of verification turns.
+
+    Everything else (`submit`, `submit_words` for streaming partials) goes
+    to the largest tier, so the router can stand in for a single backend.
+    """
+
+    def __init__(
+        self,
+        tiers: dict,
+        short_sec: float = 1.5,
+        min_logprob: float = -0.7,
+        max_no_speech: float = 0.6,
+    ):
+        # Smallest model first, as listed in ASR_TIERS.
+        self.tiers = dict(tiers)
+        self.names = list(self.tiers)
+        self.fast = self.names[0]
+        self.large = self.names[-1]
+        self.model_size = self.large
+        self.short_sec = short_sec
+        self.min_logprob = min_logprob
+        self.max_no_speech = max_no_speech
+
+        self._lock = threading.Lock()
+        self.routed = Counter()
+        self.escalations = 0
+        self.latency_ms = {name: deque(maxlen=1000) for name in self.names}
+
+    # ------------------------------------------------------------- routing
+
+    def choose(self, state: State | None, audio_sec: float) -> str:
+        if state in STRUCTURED_STATES or audio_sec <= self.short_sec:
+            return self.fast
+        return self.large
+
+    def confident(self, result) -> bool:
+        return result.avg_logprob >= self.min_logprob and result.no_speech_prob <= self.max_no_speech
+
+    def submit_turn(
+        self,
+        audio: np.ndarray,
+        state: State | None = None,
+        language: str | None = None,
+        scored: bool = False,
+    ) -> Future:
+        """
+        Future resolving to the transcript of one endpointed utterance (a
+        ScoredTranscript with `scored`). `language` skips detection.
+        """
+        tier = self.choose(state, audio.shape[0] / 16000)
+
+        def decode(backend, audio):
+            if scored:
+                return backend.submit_scored(audio, language=language)
+            return backend.submit(audio, language=language)
+
+        if tier == self.large:
+            return self._route(tier, lambda backend: decode(backend, audio))
+        return self._route(
+            tier,
+            lambda backend: backend.submit_scored(audio, language=language),
+            accept=lambda result: (
+                (result if scored else result.text) if self.confident(result) else None,
+                result.avg_logprob,
+            ),
+            escalate=decode,
+            audio=audio,
+        )
+
+    def submit_structured(self, audio: np.ndarray, **kwargs) -> Future:
+        """
+        Digit/date decoding profile (WhisperASR.transcribe_structured) on the
+        fast tier; escalated when the best hypothesis scores below `min_logprob`.
+        """
+        return self._route(
+            self.fast,
+            lambda backend: backend.submit_structured(audio, **kwargs),
+            accept=lambda hyps: (hyps if hyps and hyps[0][1] >= self.min_logprob else None,
+                                 hyps[0][1] if hyps else float("-inf")),
+            escalate=lambda backend, audio: backend.submit_structured(audio, **kwargs),
+            audio=audio,
+        )
+
+    def _route(self, tier: str, submit, accept=None, escalate=None, audio=None) -> Future:
+        """
+        Submit to `tier`. With `accept`, its result is checked: accept(result)
+        returns (value or None if unsure, score); unsure results are
+        resubmitted to the large tier with `escalate`.
+        """
+        outer = Future()
+        with self._lock:
+            self.routed[tier] += 1
+        if accept is None:
+            self._attach(outer, tier, submit(self.tiers[tier]), escalated=False)
+            return outer
+
+        # The escalation decode may run after the caller's buffer has moved on.
+        audio = np.array(audio, dtype=np.float32)
+        started = time.time()
+        inner = submit(self.tiers[tier])
+
+        def on_fast(done: Future):
+            if outer.cancelled():
+                return
+            try:
+                value, score = accept(done.result())
+            except Exception as exc:
+                if outer.set_running_or_notify_cancel():
+                    outer.set_exception(exc)
+                return
+            self._observe(tier, started)
+            if value is not None:
+                outer.asr_tier, outer.escalated = tier, False
+                if outer.set_running_or_notify_cancel():
+                    outer.set_result(value)
+                return
+            with self._lock:
+                self.escalations += 1
+            print(f"[ASR] {tier} unsure (logprob={score:.2f}); escalating to {self.large}")
+            self._attach(outer, self.large, escalate(self.tiers[self.large], audio), escalated=True)
+
+        inner.add_done_callback(on_fast)
+        return outer
+
+    def _attach(self, outer: Future, tier: str, inner: Future, escalated: bool) -> None:
+        started = time.time()
+
+        def on_done(done: Future):
+            if outer.cancelled():
+                return
+            outer.asr_tier, outer.escalated = tier, escalated
+            if not outer.set_running_or_notify_cancel():
+                return
+            try:
+                result = done.result()
+            except Exception as exc:
+                outer.set_exception(exc)
+                return
+            self._observe(tier, started)
+            outer.set_result(result)
+
+        inner.add_done_callback(on_done)
+
+    def _observe(self, tier: str, started: float) -> None:
+        with self._lock:
+            self.latency_ms[tier].append((time.time() - started) * 1000.0)
+
+    # --------------------------------------------- single-backend interface
+
+    def submit(self, audio: np.ndarray, **kwargs) -> Future:
+        return self.tiers[self.large].submit(audio, **kwargs)
+
+    def submit_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None, language: str | None = None, scored: bool = False
+    ) -> Future:
+        return self.tiers[self.large].submit_words(
+            audio, initial_prompt=initial_prompt, language=language, scored=scored
+        )
+
+    def transcribe(self, audio: np.ndarray, sample_rate=16000) -> str:
+        return self.submit(audio).result()
+
+    def transcribe_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None, sample_rate=16000, language=None, scored=False
+    ):
+        return self.submit_words(audio, initial_prompt=initial_prompt, language=language, scored=scored).result()
+
+    def warm_up(self) -> None:
+        for backend in self.tiers.values():
+            backend.warm_up()
+
+    def shutdown(self) -> None:
+        for backend in self.tiers.values():
+            backend.shutdown()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            fast_turns = self.routed[self.fast]
+            stats = {
+                "escalations": float(self.escalations),
+                "escalation_rate": self.escalations / fast_turns if fast_turns else 0.0,
+            }
+            for name in self.names:
+                latencies = sorted(self.latency_ms[name])
+                stats[f"{name}_turns"] = float(self.routed[name])
+                stats[f"{name}_p50_ms"] = latencies[len(latencies) // 2] if latencies else 0.0
+        return stats
+
+
+def parse_tiers(value: str | None) -> list[str]:
+    """ASR_TIERS=base,medium -> ["base", "medium"] (smallest first)."""
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
@@ -0,0 +1,207 @@
+import re
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from asr.whisper_asr import ScoredTranscript
+
+
+def _norm_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of a growing utterance (local agreement).
+
+    While the user speaks, `update()` re-decodes the not-yet-committed tail of
+    the utterance every `interval_sec`. Words on which two consecutive passes
+    agree are committed and never decoded again; the rest is the unstable tail.
+    At endpoint `finalize()` only has to decode audio after the last committed
+    word, so most ASR work is already done when the user stops talking.
+
+    If `asr` exposes `submit_words()` (ASRWorkerPool), passes run in the
+    background: `update()` never blocks and at most one pass is in flight.
+    Pass intervals and finalize time use `clock` (the session clock).
+
+    Every decode uses `language` (None = detect); the session keeps it set
+    to its pinned language. `finalize_async(audio, scored=True)` resolves to
+    a ScoredTranscript of the full text carrying the tail decode's
+    confidence and detected language, for the session's LanguageTracker.
+    """
+
+    def __init__(self, asr, interval_sec=0.8, min_audio_sec=1.0, sample_rate=16000, clock=None):
+        self.asr = asr
+        self.clock = clock or time.time
+        self.language = None
+        self.interval_sec = interval_sec
+        self.min_audio_sec = min_audio_sec
+        self.sample_rate = sample_rate
+        self.reset()
+
+    def reset(self):
+        self.committed = []         # (start_sec, end_sec, word), utterance-relative
+        self._hypothesis = []       # uncommitted words from the previous pass
+        self._last_pass_time = None
+        self._cancel_inflight()
+        self.passes = 0
+        self.last_finalize_sec = 0.0
+        self.last_tail_sec = 0.0
+
+    @property
+    def commit_offset_sec(self) -> float:
+        return self.committed[-1][1] if self.committed else 0.0
+
+    @property
+    def committed_text(self) -> str:
+        return "".join(w for _, _, w in self.committed).strip()
+
+    @property
+    def partial_text(self) -> str:
+        return "".join(w for _, _, w in self.committed + self._hypothesis).strip()
+
+    @property
+    def is_async(self) -> bool:
+        return hasattr(self.asr, "submit_words")
+
+    def _tail_request(self, audio: np.ndarray):
+        offset = self.commit_offset_sec
+        tail = audio[int(offset * self.sample_rate):]
+        if tail.shape[0] < int(0.1 * self.sample_rate):
+            return offset, None, None
+        # Condition on the committed text so the tail continues it naturally.
+        prompt = self.committed_text[-200:] or None
+        return offset, tail, prompt
+
+    def _cancel_inflight(self):
+        inflight = getattr(self, "_inflight", None)
+        if inflight is not None:
+            inflight.inner.cancel()
+            inflight.cancel()
+        self._inflight = None
+
+    @staticmethod
+    def _shift(words, offset):
+        return [(start + offset, end + offset, word) for start, end, word in words]
+
+    def _decode_tail(self, audio: np.ndarray, scored: bool = False):
+        offset, tail, prompt = self._tail_request(audio)
+        if tail is None:
+            return ([], None) if scored else []
+        decoded = self.asr.transcribe_words(tail, initial_prompt=prompt, language=self.language, scored=scored)
+        if scored:
+            words, tail_score = decoded
+            return self._shift(words, offset), tail_score
+        return self._shift(decoded, offset)
+
+    def _submit_tail(self, audio: np.ndarray, scored: bool = False) -> Future:
+        """Tail decode; resolves to shifted words, or (words, ScoredTranscript of the tail) if `scored`."""
+        offset, tail, prompt = self._tail_request(audio)
+        result = Future()
+        if tail is None:
+            result.inner = result
+            result.set_result(([], None) if scored else [])
+            return result
+        inner = self.asr.submit_words(tail, initial_prompt=prompt, language=self.language, scored=scored)
+
+        def _done(f):
+            if result.done():
+                return
+            if f.cancelled():
+                result.cancel()
+            elif f.exception() is not None:
+                result.set_exception(f.exception())
+            elif scored:
+                words, tail_score = f.result()
+                result.set_result((self._shift(words, offset), tail_score))
+            else:
+                result.set_result(self._shift(f.result(), offset))
+
+        inner.add_done_callback(_done)
+        result.inner = inner
+        return result
+
+    def _scored_final(self, text: str, tail_score) -> ScoredTranscript:
+        if tail_score is None or not tail_score.text:
+            # Nothing left to decode: no new evidence about the language.
+            return ScoredTranscript(text, 0.0, 0.0, self.language, 1.0 if self.language else 0.0)
+        return ScoredTranscript(
+            text, tail_score.avg_logprob, tail_score.no_speech_prob,
+            tail_score.language, tail_score.language_probability,
+        )
+
+    def _agree(self, words):
+        agreed = 0
+        for prev, new in zip(self._hypothesis, words):
+            if _norm_word(prev[2]) != _norm_word(new[2]):
+                break
+            agreed += 1
+        self.committed.extend(words[:agreed])
+        self._hypothesis = words[agreed:]
+
+    def update(self, audio: np.ndarray, now: float | None = None) -> str | None:
+        """
+        audio: the whole utterance so far (e.g. a ring buffer view)
+        returns: new partial hypothesis if a decode pass completed, else None
+        """
+        now = self.clock() if now is None else now
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+        if audio.shape[0] < int(self.min_audio_sec * self.sample_rate):
+            return None
+        partial = None
+        if self._inflight is not None:
+            if not self._inflight.done():
+                return None
+            inflight, self._inflight = self._inflight, None
+            if not inflight.cancelled() and inflight.exception() is None:
+                self._agree(inflight.result())
+                self.passes += 1
+                partial = self.partial_text
+        if self._last_pass_time is not None and now - self._last_pass_time < self.interval_sec:
+            return partial
+
+        self._last_pass_time = now
+        if self.is_async:
+            self._inflight = self._submit_tail(audio)
+            return partial
+        self._agree(self._decode_tail(audio))
+        self.passes += 1
+        return self.partial_text
+
+    def finalize(self, audio: np.ndarray) -> str:
+        """Decode only the unstable tail and return the full transcript."""
+        return self.finalize_async(audio).result()
+
+    def finalize_async(self, audio: np.ndarray, scored: bool = False) -> Future:
+        """Non-blocking finalize(); the Future resolves to the full transcript (a ScoredTranscript if `scored`)."""
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+        # A partial pass in flight would only delay the tail decode; drop it.
+        self._cancel_inflight()
+        start = self.clock()
+        self.last_tail_sec = max(audio.shape[0] / self.sample_rate - self.commit_offset_sec, 0.0)
+        committed = list(self.committed)
+        if self.is_async:
+            tail_future = self._submit_tail(audio, scored=scored)
+        else:
+            tail_future = Future()
+            tail_future.set_result(self._decode_tail(audio, scored=scored))
+
+        result = Future()
+
+        def _done(f):
+            self.last_finalize_sec = self.clock() - start
+            if f.cancelled():
+                result.cancel()
+            elif f.exception() is not None:
+                result.set_exception(f.exception())
+            elif scored:
+                words, tail_score = f.result()
+                result.set_result(self._scored_final("".join(w for _, _, w in committed + words).strip(), tail_score))
+            else:
+                result.set_result("".join(w for _, _, w in committed + f.result()).strip())
+
+        tail_future.add_done_callback(_done)
+        return result
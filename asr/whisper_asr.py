@@ -1,5 +1,21 @@
+from dataclasses import dataclass
+
 import numpy as np
-from faster_whisper import WhisperModel
+
+# Primes the decoder towards digit strings and dates in verification turns.
+STRUCTURED_PROMPT = "My mobile number is 9876543210. Last 4 digits 4321. Date of birth 15-08-1990."
+STRUCTURED_MAX_TOKENS = 64
+
+
+@dataclass
+class ScoredTranscript:
+    """Transcript plus Whisper's own confidence signals, for tier escalation."""
+    text: str
+    avg_logprob: float      # duration-weighted mean over segments; -inf if none
+    no_speech_prob: float   # highest over segments; 1.0 if none
+    language: str | None = None
+    language_probability: float = 1.0   # 1.0 when the language was given, not detected
+
 
 class WhisperASR:
     def __init__(self, model_size="medium", device="cpu"):
@@ -7,15 +23,21 @@ class WhisperASR:
         model_size: tiny | base | small | medium
         medium improves accuracy but is slower on CPU
         """
+        # Imported here: faster_whisper pulls in CTranslate2, which is slow to
+        # import and not needed by callers that only use the ASR pool.
+        from faster_whisper import WhisperModel
+
+        self.model_size = model_size
         self.model = WhisperModel(
             model_size,
             device=device,
             compute_type="int8"
         )
 
-    def transcribe(self, audio: np.ndarray, sample_rate=16000) -> str:
+    def transcribe(self, audio: np.ndarray, sample_rate=16000, language: str | None = None) -> str:
         """
         audio: numpy array of shape (n_samples,) or (n_samples, 1)
+        language: Whisper code to skip detection, None to auto-detect Hindi / English
         returns: transcribed text
         """
         if audio.ndim == 2:
@@ -23,7 +45,7 @@ class WhisperASR:
 
         segments, _ = self.model.transcribe(
             audio,
-            language=None,          # auto-detect Hindi / English
+            language=language,
             vad_filter=False        # we already did VAD ourselves
         )
 
@@ -32,3 +54,193 @@ class WhisperASR:
             text += seg.text
 
         return text.strip()
+
+    def transcribe_scored(self, audio: np.ndarray, sample_rate=16000, language: str | None = None) -> ScoredTranscript:
+        """Like transcribe(), with avg log-probability, no-speech probability and the language used."""
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+
+        segments, info = self.model.transcribe(
+            audio,
+            language=language,
+            vad_filter=False,
+        )
+        return self._score(segments, info, language)
+
+    @staticmethod
+    def _score(segments, info, language: str | None) -> ScoredTranscript:
+        text = ""
+        weighted, total, no_speech = 0.0, 0.0, 0.0
+        for seg in segments:
+            text += seg.text
+            duration = max(seg.end - seg.start, 0.01)
+            weighted += seg.avg_logprob * duration
+            total += duration
+            no_speech = max(no_speech, seg.no_speech_prob)
+        detected = getattr(info, "language", language)
+        probability = 1.0 if language else getattr(info, "language_probability", 0.0)
+        if not total:
+            return ScoredTranscript("", float("-inf"), 1.0, detected, probability)
+        return ScoredTranscript(text.strip(), weighted / total, no_speech, detected, probability)
+
+    def transcribe_words(
+        self,
+        audio: np.ndarray,
+        initial_prompt: str | None = None,
+        sample_rate=16000,
+        language: str | None = None,
+        scored: bool = False,
+    ):
+        """
+        Like transcribe(), but returns word-level (start_sec, end_sec, word)
+        tuples so callers can align and commit partial hypotheses.
+        scored: return (words, ScoredTranscript) so the caller also gets the
+        decode's confidence and language
+        """
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+
+        segments, info = self.model.transcribe(
+            audio,
+            language=language,
+            vad_filter=False,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=initial_prompt or None,
+        )
+
+        segments = list(segments)
+        words = []
+        for seg in segments:
+            for word in seg.words or []:
+                words.append((word.start, word.end, word.word))
+        if scored:
+            return words, self._score(segments, info, language)
+        return words
+
+    def transcribe_structured(
+        self,
+        audio: np.ndarray,
+        language: str = "en",
+        alternatives: int = 3,
+        prompt: str = STRUCTURED_PROMPT,
+    ) -> list[tuple[str, float]]:
+        """
+        Decoding profile for digits and dates (verification turns): one
+        encoder pass, pinned language, no timestamps, no conditioning on
+        earlier text, a digit-biased prompt and a short token budget.
+        Returns up to `alternatives` hypotheses, best first, as
+        (text, length-normalized log-probability); alternatives=1 is plain
+        greedy decoding.
+        """
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+        model = self.model
+        extractor = model.feature_extractor
+        mel = extractor(audio[: extractor.n_samples])
+        features = pad_or_trim(mel[..., : extractor.nb_max_frames])
+        encoder_output = model.encode(features[np.newaxis].astype(np.float32))
+
+        tokenizer = Tokenizer(
+            model.hf_tokenizer,
+            model.model.is_multilingual,
+            task="transcribe",
+            language=language,
+        )
+        prompt_tokens = [tokenizer.sot_prev] + tokenizer.encode(" " + prompt.strip())
+        prompt_tokens += list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+        result = model.model.generate(
+            encoder_output,
+            [prompt_tokens],
+            beam_size=alternatives,
+            num_hypotheses=alternatives,
+            return_scores=True,
+            max_length=STRUCTURED_MAX_TOKENS,
+            suppress_blank=True,
+            suppress_tokens=[-1],
+        )[0]
+        return [
+            (tokenizer.decode(ids).strip(), score)
+            for ids, score in zip(result.sequences_ids, result.scores)
+        ]
+
+    def transcribe_batch(self, audios: list[np.ndarray], language: str | None = None) -> list[str]:
+        """
+        Transcribe several short utterances (<= 30 s each) in one batched
+        encoder pass and one batched greedy decode.
+        audios: list of numpy arrays of shape (n_samples,) or (n_samples, 1)
+        returns: one transcript per input, in order
+        """
+        return [r.text for r in self.transcribe_batch_scored(audios, [language] * len(audios))]
+
+    def transcribe_batch_scored(
+        self,
+        audios: list[np.ndarray],
+        languages: list[str | None] | None = None,
+    ) -> list[ScoredTranscript]:
+        """
+        transcribe_batch() with a language per item (None = detect) and
+        ScoredTranscript results. Detection runs once for the whole batch,
+        and only if some item needs it.
+        """
+        if not audios:
+            return []
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+
+        model = self.model
+        extractor = model.feature_extractor
+        features = []
+        for audio in audios:
+            if audio.ndim == 2:
+                audio = audio[:, 0]
+            mel = extractor(audio[: extractor.n_samples])
+            features.append(pad_or_trim(mel[..., : extractor.nb_max_frames]))
+        encoder_output = model.encode(np.stack(features).astype(np.float32))
+
+        languages = list(languages or [None] * len(audios))
+        probabilities = [1.0] * len(audios)
+        if any(lang is None for lang in languages):
+            # One detection call for the whole batch; items may differ.
+            detected = model.model.detect_language(encoder_output)
+            for i, results in enumerate(detected):
+                if languages[i] is None:
+                    token, probabilities[i] = results[0]
+                    languages[i] = token[2:-2]
+
+        tokenizers = {}
+        prompts = []
+        for lang in languages:
+            if lang not in tokenizers:
+                tokenizers[lang] = Tokenizer(
+                    model.hf_tokenizer,
+                    model.model.is_multilingual,
+                    task="transcribe",
+                    language=lang,
+                )
+            tokenizer = tokenizers[lang]
+            prompts.append(list(tokenizer.sot_sequence) + [tokenizer.no_timestamps])
+
+        results = model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=1,
+            max_length=448,
+            suppress_blank=True,
+            suppress_tokens=[-1],
+            return_scores=True,
+            return_no_speech_prob=True,
+        )
+        return [
+            ScoredTranscript(
+                tokenizers[lang].decode(result.sequences_ids[0]).strip(),
+                result.scores[0],
+                result.no_speech_prob,
+                lang,
+                probability,
+            )
+            for lang, probability, result in zip(languages, probabilities, results)
+        ]
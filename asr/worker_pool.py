@@ -0,0 +1,118 @@
+import multiprocessing as mp
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Loaded once per worker process by _init_worker.
+_worker_asr = None
+
+
+def _init_worker(model_size: str, device: str) -> None:
+    global _worker_asr
+    from asr.whisper_asr import WhisperASR
+
+    _worker_asr = WhisperASR(model_size=model_size, device=device)
+
+
+def _run_in_worker(method: str, shm_name: str, n_samples: int, kwargs: dict):
+    # Spawned workers share the parent's resource tracker, so attaching here
+    # does not add a second owner; the parent unlinks the block when done.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio = np.ndarray((n_samples,), dtype=np.float32, buffer=shm.buf)
+        result = getattr(_worker_asr, method)(audio, **kwargs)
+        del audio
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # A lingering view into the block; the parent unlinks it regardless.
+            pass
+    return result
+
+
+class ASRWorkerPool:
+    """
+    Whisper in separate processes so decoding never blocks audio capture.
+
+    Utterances are copied once into a shared-memory block and only its name
+    crosses the process boundary, so the audio itself is never pickled.
+    Each worker loads its own model; `num_workers` utterances decode in parallel.
+    """
+
+    def __init__(self, model_size="medium", device="cpu", num_workers: int | None = None):
+        self.model_size = model_size
+        self.num_workers = int(num_workers or os.getenv("ASR_WORKERS", "1"))
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, device),
+        )
+
+    def submit(self, audio: np.ndarray, method="transcribe", **kwargs) -> Future:
+        """
+        audio: numpy array of shape (n_samples,) or (n_samples, 1); copied into
+               shared memory before returning, so ring buffer views are safe
+        returns: Future resolving to the result of WhisperASR.<method>
+        """
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+        n_samples = audio.shape[0]
+        shm = shared_memory.SharedMemory(create=True, size=max(n_samples * 4, 4))
+        np.ndarray((n_samples,), dtype=np.float32, buffer=shm.buf)[:] = audio
+
+        try:
+            future = self._executor.submit(_run_in_worker, method, shm.name, n_samples, kwargs)
+        except Exception:
+            self._release(shm)
+            raise
+        future.add_done_callback(lambda _f: self._release(shm))
+        return future
+
+    def submit_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None, language: str | None = None, scored: bool = False
+    ) -> Future:
+        return self.submit(
+            audio, method="transcribe_words", initial_prompt=initial_prompt, language=language, scored=scored
+        )
+
+    def submit_scored(self, audio: np.ndarray, language: str | None = None) -> Future:
+        """Future resolving to a ScoredTranscript; `language` skips detection."""
+        return self.submit(audio, method="transcribe_scored", language=language)
+
+    def submit_structured(self, audio: np.ndarray, **kwargs) -> Future:
+        """Future resolving to WhisperASR.transcribe_structured hypotheses."""
+        return self.submit(audio, method="transcribe_structured", **kwargs)
+
+    @staticmethod
+    def _release(shm: shared_memory.SharedMemory) -> None:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    # Blocking drop-in replacements for WhisperASR.
+
+    def transcribe(self, audio: np.ndarray, sample_rate=16000) -> str:
+        return self.submit(audio).result()
+
+    def transcribe_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None, sample_rate=16000, language=None, scored=False
+    ):
+        return self.submit_words(audio, initial_prompt=initial_prompt, language=language, scored=scored).result()
+
+    def warm_up(self) -> None:
+        """Start every worker, load its model and run one decode before the first real utterance."""
+        from audio.sources import synthetic_speech
+
+        audio = synthetic_speech()
+        futures = [self.submit(audio) for _ in range(self.num_workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
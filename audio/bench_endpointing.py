@@ -0,0 +1,160 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import glob
+import json
+
+import numpy as np
+
+from audio.endpointing import AdaptiveEndpointer, FixedEndpointer
+from audio.sources import CHUNK_SAMPLES, SAMPLE_RATE, load_wav
+from audio.vad import FRAME_SAMPLES, VADDetector
+from logic.state_machine import State
+
+LEAD_SEC = 1.0
+TAIL_SEC = 3.0
+
+
+def trim(audio: np.ndarray) -> np.ndarray:
+    """Cut leading/trailing silence: keep first..last frame within 20 dB of the loudest."""
+    n = audio.shape[0] // FRAME_SAMPLES
+    if not n:
+        return audio
+    frames = audio[: n * FRAME_SAMPLES].reshape(n, FRAME_SAMPLES)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    loud = np.nonzero(rms >= rms.max() * 0.1)[0]
+    return audio[loud[0] * FRAME_SAMPLES:(loud[-1] + 1) * FRAME_SAMPLES]
+
+
+def build_turn(segments: list[np.ndarray], pause_sec: float, noise_rms: float, rng) -> tuple[np.ndarray, int]:
+    """
+    One caller turn: speech segments (e.g. digit groups) separated by
+    `pause_sec`, with silence before and after and white noise at
+    `noise_rms` on top. returns: (audio, sample index where speech ends)
+    """
+    pause = np.zeros(int(pause_sec * SAMPLE_RATE), dtype=np.float32)
+    parts = [np.zeros(int(LEAD_SEC * SAMPLE_RATE), dtype=np.float32)]
+    for i, segment in enumerate(segments):
+        if i:
+            parts.append(pause)
+        parts.append(segment)
+    speech_end = sum(part.shape[0] for part in parts)
+    parts.append(np.zeros(int(TAIL_SEC * SAMPLE_RATE), dtype=np.float32))
+    audio = np.concatenate(parts)
+    if noise_rms > 0:
+        audio = audio + rng.normal(0.0, noise_rms, audio.shape[0]).astype(np.float32)
+    return audio, speech_end
+
+
+def score_vad(detector: VADDetector, audio: np.ndarray) -> list:
+    """VAD result per CHUNK_SAMPLES chunk, as a session sees them."""
+    stream = detector.create_stream()
+    results = []
+    for start in range(0, audio.shape[0] - CHUNK_SAMPLES + 1, CHUNK_SAMPLES):
+        results.append(stream.process_chunk(audio[start:start + CHUNK_SAMPLES]))
+    stream.close()
+    return results
+
+
+def run_turn(endpointer, audio: np.ndarray, vad_results: list, state: State) -> tuple[float | None, str]:
+    """
+    Session listening logic over one turn: returns (endpoint time in
+    seconds, "silence" | "max_length"), or (None, "none") if it never ended.
+    """
+    endpointer.reset()
+    onset = None
+    for i, vad in enumerate(vad_results):
+        start = i * CHUNK_SAMPLES
+        end = start + CHUNK_SAMPLES
+        chunk = audio[start:end]
+        now = end / SAMPLE_RATE
+        event = endpointer.update(vad, float(np.sqrt(np.mean(chunk ** 2))), now, state)
+        if event == "speech" and onset is None:
+            onset = start
+        elif event == "end" and onset is not None:
+            utterance = audio[onset:end]
+            if utterance.shape[0] >= int(SAMPLE_RATE * endpointer.min_utterance_sec) and (
+                float(np.sqrt(np.mean(utterance ** 2))) >= endpointer.utterance_min_rms()
+            ):
+                return now, "silence"
+            onset = None
+        if onset is not None and end - onset >= int(SAMPLE_RATE * endpointer.max_sec(state)):
+            return now, "max_length"
+    return None, "none"
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[int(round((len(values) - 1) * q))] if values else 0.0
+
+
+def summarize(outcomes: list[dict]) -> dict:
+    delays = [o["delay_ms"] for o in outcomes if o["outcome"] == "ok"]
+    n = len(outcomes)
+    return {
+        "turns": n,
+        "delay_p50_ms": _pct(delays, 0.5),
+        "delay_p95_ms": _pct(delays, 0.95),
+        "false_cutoff_rate": sum(o["outcome"] == "cutoff" for o in outcomes) / n if n else 0.0,
+        "max_length_rate": sum(o["outcome"] == "max_length" for o in outcomes) / n if n else 0.0,
+        "missed_rate": sum(o["outcome"] == "missed" for o in outcomes) / n if n else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Endpoint delay and false cut-offs: fixed vs adaptive endpointing on recorded speech"
+    )
+    parser.add_argument("wav_dir", help="directory of recorded utterances (16 kHz mono WAV)")
+    parser.add_argument("--groups", type=int, default=3, help="utterances per turn, e.g. digit groups")
+    parser.add_argument("--pauses", default="0.3,0.6,0.9", help="pauses between groups (sec)")
+    parser.add_argument("--noise", default="0,0.002,0.006", help="white noise RMS levels (line noise)")
+    parser.add_argument("--states", default="LISTENING,VERIFY_MOBILE")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    segments = [trim(load_wav(path)) for path in sorted(glob.glob(os.path.join(args.wav_dir, "*.wav")))]
+    segments = [s for s in segments if s.shape[0]]
+    if len(segments) < args.groups:
+        parser.error(f"need at least {args.groups} WAV files")
+    pauses = [float(p) for p in args.pauses.split(",")]
+    noise_levels = [float(n) for n in args.noise.split(",")]
+    states = [State[name.strip()] for name in args.states.split(",")]
+    policies = {"fixed": FixedEndpointer, "adaptive": AdaptiveEndpointer}
+
+    print("⏳ Loading VAD...")
+    detector = VADDetector()
+    rng = np.random.default_rng(args.seed)
+    outcomes = {name: {} for name in policies}
+    for noise_rms in noise_levels:
+        for pause_sec in pauses:
+            for i in range(len(segments) - args.groups + 1):
+                audio, speech_end = build_turn(segments[i:i + args.groups], pause_sec, noise_rms, rng)
+                vad_results = score_vad(detector, audio)
+                for name, policy in policies.items():
+                    for state in states:
+                        endpoint, reason = run_turn(policy(), audio, vad_results, state)
+                        delay_ms = None
+                        if endpoint is None:
+                            outcome = "missed"
+                        elif endpoint * SAMPLE_RATE < speech_end:
+                            outcome = "cutoff"
+                        else:
+                            outcome = "max_length" if reason == "max_length" else "ok"
+                            delay_ms = (endpoint - speech_end / SAMPLE_RATE) * 1000.0
+                        key = f"{state.name}/noise={noise_rms}"
+                        outcomes[name].setdefault(key, []).append({"outcome": outcome, "delay_ms": delay_ms})
+
+    results = {
+        name: {key: summarize(turns) for key, turns in by_key.items()}
+        for name, by_key in outcomes.items()
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import os
+
+from logic.state_machine import State
+from logic.verify import extract_dob, extract_last4, extract_mobile
+
+SAMPLE_RATE = 16000
+MIN_UTTERANCE_SEC = 0.35
+SILENCE_SEC = 0.35
+MIN_RMS = 0.001
+START_RMS = 0.003
+MAX_UTTERANCE_SEC = 10.0
+
+
+def _secondary_value(text: str) -> str | None:
+    return extract_dob(text) or extract_last4(text)
+
+
+# States where the caller reads out digits, with what a complete answer parses to.
+NUMBER_STATES = {
+    State.VERIFY_MOBILE: extract_mobile,
+    State.VERIFY_FAILED: extract_mobile,
+    State.VERIFY_SECONDARY: _secondary_value,
+}
+
+
+class FixedEndpointer:
+    """
+    End-of-turn detection with fixed thresholds.
+
+    A chunk is speech if the VAD stream is triggered or its RMS is at least
+    `start_rms`. `update()` returns "speech" for speech chunks, "end" once
+    `silence_sec` of silence follows speech, and "silence" otherwise. The
+    session then drops turns shorter than `min_utterance_sec` or quieter
+    than `utterance_min_rms()`, and cuts turns at `max_sec(state)`.
+    """
+
+    def __init__(
+        self,
+        silence_sec: float = SILENCE_SEC,
+        start_rms: float = START_RMS,
+        min_rms: float = MIN_RMS,
+        min_utterance_sec: float = MIN_UTTERANCE_SEC,
+        max_utterance_sec: float = MAX_UTTERANCE_SEC,
+    ):
+        self.silence_sec = silence_sec
+        self.start_rms = start_rms
+        self.min_rms = min_rms
+        self.min_utterance_sec = min_utterance_sec
+        self.max_utterance_sec = max_utterance_sec
+        self.last_hold_sec = silence_sec
+        self.reset()
+
+    def reset(self) -> None:
+        """New listening turn."""
+        self.speech_active = False
+        self.last_speech_time = None
+
+    def resume(self, now: float) -> None:
+        """Speech is (again) in progress, e.g. the caller barged in or kept talking."""
+        self.speech_active = True
+        self.last_speech_time = now
+
+    def hint(self, text: str) -> None:
+        """Latest partial transcript of the turn (streaming ASR)."""
+
+    def is_speech(self, vad_result, rms: float) -> bool:
+        return vad_result.speaking or rms >= self.start_rms
+
+    def hold_sec(self, state: State | None) -> float:
+        return self.silence_sec
+
+    def max_sec(self, state: State | None) -> float:
+        return self.max_utterance_sec
+
+    @property
+    def longest_utterance_sec(self) -> float:
+        return self.max_utterance_sec
+
+    def utterance_min_rms(self) -> float:
+        return self.min_rms
+
+    def update(self, vad_result, rms: float, now: float, state: State | None = None) -> str:
+        """
+        vad_result: VADStreamResult for the audio since the last call
+        rms: RMS of that audio
+        now: capture time of its last sample
+        """
+        if self.is_speech(vad_result, rms):
+            self.speech_active = True
+            self.last_speech_time = now
+            return "speech"
+        if self.speech_active and self.last_speech_time:
+            hold = self.hold_sec(state)
+            if now - self.last_speech_time >= hold:
+                self.last_hold_sec = hold
+                self.speech_active = False
+                self.last_speech_time = None
+                return "end"
+        return "silence"
+
+    def stats(self) -> dict[str, float]:
+        return {"hold_sec": self.last_hold_sec}
+
+
+class AdaptiveEndpointer(FixedEndpointer):
+    """
+    End-of-turn detection that adapts to the line and the question.
+
+    - Noise floor: the RMS of chunks the VAD scores as clearly non-speech
+      (every frame below `noise_prob`) is tracked with a running average
+      that follows drops fast and rises slowly. A chunk only counts as
+      speech on energy if it is `noise_ratio` times above the floor, so a
+      noisy line no longer looks like endless speech. The utterance energy
+      gate scales the same way.
+    - Uncertain pauses: when the latest frames fall between `noise_prob` and
+      the VAD threshold (breath, a trailing syllable), the hold grows by
+      `uncertain_sec`.
+    - Dialogue state: while the caller reads out a mobile number, last 4
+      digits or a date (NUMBER_STATES), pauses between digit groups are
+      allowed up to `number_silence_sec` until the partial transcript (if
+      streaming ASR provides one) holds a complete value, and the turn may
+      run to `number_max_utterance_sec`.
+    """
+
+    def __init__(
+        self,
+        silence_sec: float = SILENCE_SEC,
+        number_silence_sec: float = 0.9,
+        uncertain_sec: float = 0.25,
+        start_rms: float = START_RMS,
+        min_rms: float = MIN_RMS,
+        noise_ratio: float = 3.0,
+        speech_prob: float = 0.3,
+        noise_prob: float = 0.15,
+        min_utterance_sec: float = MIN_UTTERANCE_SEC,
+        max_utterance_sec: float = MAX_UTTERANCE_SEC,
+        number_max_utterance_sec: float = 15.0,
+    ):
+        self.number_silence_sec = number_silence_sec
+        self.uncertain_sec = uncertain_sec
+        self.noise_ratio = noise_ratio
+        self.speech_prob = speech_prob
+        self.noise_prob = noise_prob
+        self.number_max_utterance_sec = number_max_utterance_sec
+        # Per call, not per turn: the line does not change between turns.
+        self.noise_floor = None
+        super().__init__(silence_sec, start_rms, min_rms, min_utterance_sec, max_utterance_sec)
+
+    def reset(self) -> None:
+        super().reset()
+        self._hint = None
+        self._uncertain = False
+
+    def hint(self, text: str) -> None:
+        self._hint = text
+
+    def _track_noise(self, rms: float) -> None:
+        if self.noise_floor is None:
+            self.noise_floor = rms
+            return
+        alpha = 0.3 if rms < self.noise_floor else 0.02
+        self.noise_floor += alpha * (rms - self.noise_floor)
+
+    def speech_rms(self) -> float:
+        """Energy above which a chunk counts as speech even if the VAD disagrees."""
+        return max(self.start_rms, (self.noise_floor or 0.0) * self.noise_ratio)
+
+    def utterance_min_rms(self) -> float:
+        return max(self.min_rms, (self.noise_floor or 0.0) * self.noise_ratio / 2)
+
+    def is_speech(self, vad_result, rms: float) -> bool:
+        probs = vad_result.probs
+        if probs and max(probs) < self.noise_prob and not vad_result.speaking:
+            self._track_noise(rms)
+        self._uncertain = bool(probs) and self.noise_prob <= probs[-1] < self.speech_prob
+        return vad_result.speaking or rms >= self.speech_rms()
+
+    def _number_pending(self, state: State | None) -> bool:
+        extract = NUMBER_STATES.get(state)
+        return extract is not None and (self._hint is None or extract(self._hint) is None)
+
+    def hold_sec(self, state: State | None) -> float:
+        hold = self.number_silence_sec if self._number_pending(state) else self.silence_sec
+        if self._uncertain:
+            hold += self.uncertain_sec
+        return hold
+
+    def max_sec(self, state: State | None) -> float:
+        if state in NUMBER_STATES:
+            return self.number_max_utterance_sec
+        return self.max_utterance_sec
+
+    @property
+    def longest_utterance_sec(self) -> float:
+        return max(self.max_utterance_sec, self.number_max_utterance_sec)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "hold_sec": self.last_hold_sec,
+            "noise_floor": self.noise_floor or 0.0,
+            "speech_rms": self.speech_rms(),
+        }
+
+
+def load_endpointer() -> FixedEndpointer:
+    """
+    ENDPOINTING=adaptive (default): AdaptiveEndpointer
+    ENDPOINTING=fixed: the fixed SILENCE_SEC / START_RMS / MIN_RMS rule
+    """
+    silence_sec = float(os.getenv("ENDPOINT_SILENCE_SEC", str(SILENCE_SEC)))
+    mode = os.getenv("ENDPOINTING", "adaptive")
+    if mode == "fixed":
+        return FixedEndpointer(silence_sec=silence_sec)
+    if mode != "adaptive":
+        raise ValueError(f"Unknown ENDPOINTING: {mode}")
+    return AdaptiveEndpointer(
+        silence_sec=silence_sec,
+        number_silence_sec=float(os.getenv("ENDPOINT_NUMBER_SILENCE_SEC", "0.9")),
+        noise_ratio=float(os.getenv("ENDPOINT_NOISE_RATIO", "3.0")),
+    )
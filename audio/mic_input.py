@@ -1,44 +1,122 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 import sounddevice as sd
-import queue
+import time
 import numpy as np
 
-class MicInput:
-    def __init__(self, sample_rate=16000, channels=1):
+from audio.ring_buffer import CaptureRing
+from audio.sources import AudioSource
+from bot.events import Wakeup
+
+
+def _latency_setting(value):
+    """'low' / 'high' or a number of seconds, as sounddevice expects."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class MicInput(AudioSource):
+    """
+    Live microphone source (sounddevice input stream).
+
+    The PortAudio callback only copies the block into a preallocated
+    CaptureRing, stamps it with its ADC capture time and signals readers
+    through lock-free Wakeups (`on_chunk` is expected to be one); no
+    allocation, no lock, no printing on the audio thread. A stalled consumer
+    makes the ring drop new blocks (counted in `stats()`) instead of growing
+    memory.
+    `last_capture_time` is the capture time of the first sample of the block
+    last returned by read().
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, blocksize=None, latency=None, buffer_sec=None):
         self.sample_rate = sample_rate
         self.channels = channels
-        self.audio_queue = queue.Queue()
+        # 512 samples = one VAD frame per callback; 0 lets PortAudio choose.
+        self.blocksize = int(blocksize if blocksize is not None else os.getenv("MIC_BLOCKSIZE", "512"))
+        self.latency = _latency_setting(latency or os.getenv("MIC_LATENCY", "low"))
+        buffer_sec = float(buffer_sec or os.getenv("MIC_BUFFER_SEC", "10"))
+        capacity = int(sample_rate * buffer_sec)
+        # Variable-size callbacks (blocksize=0) can be small; leave room for many.
+        self.ring = CaptureRing(capacity, max_blocks=capacity // min(self.blocksize or 64, 64) + 1)
+        self._ready = Wakeup()
+        self.last_capture_time = None
+        self.device_overflows = 0
+        self.stream = None
 
-    def _callback(self, indata, frames, time, status):
-        if status:
-            print("Mic status:", status)
-        self.audio_queue.put(indata.copy())
+    def _callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.device_overflows += 1
+        now = time.time()
+        adc = time_info.inputBufferAdcTime
+        # PortAudio times are on the stream clock; map the ADC time to wall time.
+        # Some host APIs report 0: assume the block just finished recording.
+        capture_time = now - (time_info.currentTime - adc) if adc else now - frames / self.sample_rate
+        self.ring.push(indata[:, 0], capture_time)
+        self._ready.set()
+        if self.on_chunk is not None:
+            self.on_chunk()
 
     def start(self):
         self.stream = sd.InputStream(
             samplerate=self.sample_rate,
             channels=self.channels,
             dtype="float32",
+            blocksize=self.blocksize,
+            latency=self.latency,
             callback=self._callback
         )
         self.stream.start()
-        print("🎙️ Microphone started")
+        print(
+            f"🎙️ Microphone started (blocksize={self.blocksize}, "
+            f"input latency={self.stream.latency * 1000:.0f} ms)"
+        )
 
     def stop(self):
         self.stream.stop()
         self.stream.close()
-        print("🛑 Microphone stopped")
+        self._ready.close()
+        stats = self.stats()
+        print(
+            "🛑 Microphone stopped "
+            f"(ring overflows={stats['overflows']:.0f}, device overflows={stats['device_overflows']:.0f})"
+        )
 
-    def read(self):
-        """Get next audio chunk"""
-        try:
-            return self.audio_queue.get(timeout=1)
-        except queue.Empty:
-            return None
+    def read(self, timeout=1.0):
+        """
+        Next captured block as a (frames, 1) view, valid until the next
+        read()/clear(); None if nothing arrives within `timeout`.
+        """
+        deadline = time.time() + timeout
+        while True:
+            block = self.ring.pop()
+            if block is not None:
+                samples, self.last_capture_time = block
+                return samples.reshape(-1, 1)
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            self._ready.wait(remaining)
 
     def clear_queue(self):
         """Drop stale audio chunks to keep turn alignment tight."""
-        with self.audio_queue.mutex:
-            self.audio_queue.queue.clear()
+        self.ring.clear()
+
+    clear = clear_queue
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "queued_blocks": float(len(self.ring)),
+            "overflows": float(self.ring.overflows),
+            "dropped_sec": self.ring.dropped_samples / self.sample_rate,
+            "device_overflows": float(self.device_overflows),
+        }
 
 # Example usage
 if __name__ == "__main__":
@@ -46,9 +124,11 @@ if __name__ == "__main__":
     mic.start()
 
     print("Speak for 5 seconds...")
-    for _ in range(50):
+    for _ in range(160):
         chunk = mic.read()
         if chunk is not None:
-            print("Audio chunk shape:", chunk.shape)
+            lag_ms = (time.time() - mic.last_capture_time) * 1000
+            print("Audio chunk shape:", chunk.shape, f"capture->read {lag_ms:.1f} ms")
 
     mic.stop()
+    print(mic.stats())
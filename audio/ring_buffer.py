@@ -0,0 +1,197 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity float32 ring buffer for captured mono audio.
+
+    Samples are addressed by absolute index (count of samples ever appended),
+    so callers can keep cursors (VAD position, utterance start) that stay valid
+    while the buffer wraps. The storage is mirrored (written twice, `capacity`
+    apart) so any window up to `capacity` samples is a contiguous zero-copy view.
+    A running sum of squares makes the RMS of any retained range O(1).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=np.float32)
+        # _cumsq[i % capacity] = sum of squares of samples 0..i (inclusive), absolute i
+        self._cumsq = np.zeros(self.capacity, dtype=np.float64)
+        self._sq_total = 0.0
+        self.total_written = 0
+
+    def __len__(self) -> int:
+        return min(self.total_written, self.capacity)
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still held."""
+        return self.total_written - len(self)
+
+    def append(self, chunk: np.ndarray) -> None:
+        """
+        chunk: numpy array (frames, 1) or (frames,)
+        """
+        if chunk.ndim == 2:
+            chunk = chunk[:, 0]
+        n = chunk.shape[0]
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Only the newest `capacity` samples can be kept; account for the rest.
+            skipped = chunk[: n - self.capacity].astype(np.float64)
+            self._sq_total += float(np.dot(skipped, skipped))
+            self.total_written += n - self.capacity
+            chunk = chunk[n - self.capacity:]
+            n = self.capacity
+
+        pos = self.total_written % self.capacity
+        first = min(n, self.capacity - pos)
+        rest = n - first
+        cap = self.capacity
+
+        self._data[pos:pos + first] = chunk[:first]
+        self._data[pos + cap:pos + cap + first] = chunk[:first]
+        if rest:
+            self._data[:rest] = chunk[first:]
+            self._data[cap:cap + rest] = chunk[first:]
+
+        cumsq = np.cumsum(np.square(chunk, dtype=np.float64)) + self._sq_total
+        self._cumsq[pos:pos + first] = cumsq[:first]
+        if rest:
+            self._cumsq[:rest] = cumsq[first:]
+        self._sq_total = float(cumsq[-1])
+        self.total_written += n
+
+    def _check_range(self, start: int, end: int) -> None:
+        if start < self.oldest or end > self.total_written or start > end:
+            raise IndexError(
+                f"range [{start}, {end}) outside retained audio "
+                f"[{self.oldest}, {self.total_written})"
+            )
+
+    def window(self, start: int, end: int | None = None) -> np.ndarray:
+        """Zero-copy view of absolute range [start, end). Valid until the next append."""
+        end = self.total_written if end is None else end
+        self._check_range(start, end)
+        pos = start % self.capacity
+        return self._data[pos:pos + (end - start)]
+
+    def latest(self, n: int) -> np.ndarray:
+        """Zero-copy view of the newest `n` samples."""
+        n = min(n, len(self))
+        return self.window(self.total_written - n)
+
+    def extract(self, start: int, end: int | None = None) -> np.ndarray:
+        """Contiguous copy of [start, end), safe to hand to ASR after further appends."""
+        return self.window(start, end).copy()
+
+    def _sq_before(self, index: int) -> float:
+        if index == self.total_written:
+            return self._sq_total
+        if index <= 0:
+            return 0.0
+        return float(self._cumsq[(index - 1) % self.capacity])
+
+    def rms(self, start: int, end: int | None = None) -> float:
+        end = self.total_written if end is None else end
+        self._check_range(start, end)
+        if end == start:
+            return 0.0
+        if start > 0 and start == self.oldest and len(self) == self.capacity:
+            # The sample just before `start` has been overwritten; recompute.
+            view = self.window(start, end).astype(np.float64)
+            return float(np.sqrt(np.dot(view, view) / (end - start)))
+        energy = self._sq_before(end) - self._sq_before(start)
+        return float(np.sqrt(max(energy, 0.0) / (end - start)))
+
+
+class CaptureRing:
+    """
+    Single-producer/single-consumer ring of captured audio blocks.
+
+    The producer (the PortAudio callback) copies each block into preallocated
+    mirrored storage and records its capture time; the consumer pops blocks
+    as zero-copy views. There is no lock: each side only advances its own
+    counters, and the producer publishes a block by bumping its counter after
+    the samples are in place. A block that does not fit is dropped and counted
+    instead of blocking the audio thread or growing memory.
+    """
+
+    def __init__(self, capacity: int, max_blocks: int):
+        if capacity <= 0 or max_blocks <= 0:
+            raise ValueError("capacity and max_blocks must be positive")
+        self.capacity = int(capacity)
+        self.max_blocks = int(max_blocks)
+        self._data = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._block_start = np.zeros(self.max_blocks, dtype=np.int64)
+        self._block_len = np.zeros(self.max_blocks, dtype=np.int64)
+        self._block_time = np.zeros(self.max_blocks, dtype=np.float64)
+        # Producer-owned.
+        self._write_sample = 0
+        self._write_block = 0
+        self.overflows = 0
+        self.dropped_samples = 0
+        # Consumer-owned; the last popped block stays reserved until the next pop.
+        self._read_sample = 0
+        self._read_block = 0
+        self._held_end = 0
+
+    def __len__(self) -> int:
+        """Blocks waiting to be popped."""
+        return self._write_block - self._read_block
+
+    def push(self, samples: np.ndarray, capture_time: float) -> bool:
+        """Producer side. Returns False (and counts an overflow) if the block does not fit."""
+        n = samples.shape[0]
+        cap = self.capacity
+        if (
+            n > cap - (self._write_sample - self._read_sample)
+            or self._write_block - self._read_block >= self.max_blocks
+        ):
+            self.overflows += 1
+            self.dropped_samples += n
+            return False
+        pos = self._write_sample % cap
+        first = min(n, cap - pos)
+        rest = n - first
+        self._data[pos:pos + first] = samples[:first]
+        self._data[pos + cap:pos + cap + first] = samples[:first]
+        if rest:
+            self._data[:rest] = samples[first:]
+            self._data[cap:cap + rest] = samples[first:]
+        slot = self._write_block % self.max_blocks
+        self._block_start[slot] = self._write_sample
+        self._block_len[slot] = n
+        self._block_time[slot] = capture_time
+        # Publish: samples first, then the block that points at them.
+        self._write_sample += n
+        self._write_block += 1
+        return True
+
+    def pop(self) -> tuple[np.ndarray, float] | None:
+        """
+        Consumer side: (samples, capture time of the first sample) of the
+        oldest block, or None. The view stays valid until the next pop()/clear().
+        """
+        self._read_sample = self._held_end
+        if self._read_block == self._write_block:
+            return None
+        slot = self._read_block % self.max_blocks
+        start = int(self._block_start[slot])
+        n = int(self._block_len[slot])
+        capture_time = float(self._block_time[slot])
+        self._read_block += 1
+        self._held_end = start + n
+        pos = start % self.capacity
+        return self._data[pos:pos + n], capture_time
+
+    def clear(self) -> int:
+        """Consumer side: drop every queued block; returns how many were dropped."""
+        dropped = 0
+        while self.pop() is not None:
+            dropped += 1
+        self._read_sample = self._held_end
+        return dropped
@@ -0,0 +1,152 @@
+import threading
+import time
+import wave
+
+import numpy as np
+
+
+class AudioSink:
+    """
+    Destination for synthesized speech: int16 mono PCM blocks.
+
+    `write()` may block (a sound card accepts audio at playback speed);
+    `abort()` drops anything already buffered so barge-in silences the bot
+    within one block. `first_sample_time` is when the first samples of the
+    current utterance were accepted; `mark_utterance()` resets it.
+    """
+
+    def __init__(self):
+        self.first_sample_time = None
+        self.samples_written = 0
+
+    def mark_utterance(self) -> None:
+        self.first_sample_time = None
+
+    def write(self, pcm: np.ndarray, sample_rate: int) -> None:
+        if self.first_sample_time is None:
+            self.first_sample_time = time.time()
+        self.samples_written += pcm.shape[0]
+        self._write(pcm, sample_rate)
+
+    def _write(self, pcm: np.ndarray, sample_rate: int) -> None:
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SoundDeviceSink(AudioSink):
+    """Local speakers through a sounddevice output stream."""
+
+    def __init__(self, latency="low"):
+        super().__init__()
+        self.latency = latency
+        self._stream = None
+        self._sample_rate = None
+        # write() blocks for up to one block; abort() waits for it, then
+        # drops whatever the device still has queued.
+        self._lock = threading.Lock()
+
+    def _write(self, pcm, sample_rate):
+        import sounddevice as sd
+
+        with self._lock:
+            if self._stream is None or self._sample_rate != sample_rate:
+                self._close_locked()
+                self._stream = sd.OutputStream(
+                    samplerate=sample_rate, channels=1, dtype="int16", latency=self.latency
+                )
+                self._stream.start()
+                self._sample_rate = sample_rate
+            self._stream.write(pcm.reshape(-1, 1))
+
+    def abort(self):
+        # Discards the device buffer; the stream is reopened on the next write.
+        with self._lock:
+            if self._stream is not None:
+                self._stream.abort()
+                self._stream.close()
+                self._stream = None
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+class FileSink(AudioSink):
+    """Appends everything spoken to one WAV file (debugging, offline runs)."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._wav = None
+
+    def _write(self, pcm, sample_rate):
+        if self._wav is None:
+            self._wav = wave.open(self.path, "wb")
+            self._wav.setnchannels(1)
+            self._wav.setsampwidth(2)
+            self._wav.setframerate(sample_rate)
+        self._wav.writeframes(pcm.astype("<i2").tobytes())
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+class _PacedSink(AudioSink):
+    """Releases audio no faster than real time, like a sound card would."""
+
+    def __init__(self, realtime: bool = True, lead_sec: float = 0.1):
+        super().__init__()
+        self.realtime = realtime
+        self.lead_sec = lead_sec
+        self._play_until = 0.0
+
+    def _pace(self, samples: int, sample_rate: int) -> None:
+        if not self.realtime:
+            return
+        now = time.time()
+        self._play_until = max(self._play_until, now) + samples / sample_rate
+        ahead = self._play_until - now - self.lead_sec
+        if ahead > 0:
+            time.sleep(ahead)
+
+    def abort(self):
+        self._play_until = 0.0
+
+
+class NetworkSink(_PacedSink):
+    """
+    Streams PCM to a remote listener through `send(pcm_bytes, sample_rate)`,
+    paced to real time with `lead_sec` of look-ahead so a stop only leaves
+    that much audio in flight.
+    """
+
+    def __init__(self, send, realtime: bool = True, lead_sec: float = 0.1):
+        super().__init__(realtime, lead_sec)
+        self.send = send
+
+    def _write(self, pcm, sample_rate):
+        self.send(pcm.astype("<i2").tobytes(), sample_rate)
+        self._pace(pcm.shape[0], sample_rate)
+
+
+class NullSink(_PacedSink):
+    """Discards audio; optionally paced to real time. For tests and replays."""
+
+    def __init__(self, realtime: bool = False, lead_sec: float = 0.0):
+        super().__init__(realtime, lead_sec)
+
+    def _write(self, pcm, sample_rate):
+        self._pace(pcm.shape[0], sample_rate)
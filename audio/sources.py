@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 512
+
+
+class AudioSource:
+    """
+    Where a session's audio comes from: 16 kHz mono float32 chunks.
+
+    `read()` returns the next chunk, or None if nothing arrived before the
+    timeout; `exhausted` turns True once a finite source has nothing left.
+    `clear()` drops buffered input (bot echo / backlog before a listen turn).
+    Sources that capture on their own thread call `on_chunk()` (if set) each
+    time a chunk is ready, so the session loop can sleep until then.
+    `last_capture_time` is the wall-clock capture time of the first sample of
+    the chunk last read, when the source knows it (None otherwise).
+    """
+
+    sample_rate = SAMPLE_RATE
+    exhausted = False
+    on_chunk = None
+    last_capture_time = None
+
+    def start(self) -> None:
+        pass
+
+    def read(self, timeout: float = 1.0) -> np.ndarray | None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class ArraySource(AudioSource):
+    """
+    Plays an in-memory signal in CHUNK_SAMPLES chunks.
+
+    With `realtime=True` a feeder thread releases each chunk when it would
+    have arrived from a microphone (and calls `on_chunk`); otherwise chunks
+    are returned as fast as they are read (the caller paces).
+    """
+
+    def __init__(self, audio: np.ndarray, chunk_samples: int = CHUNK_SAMPLES, realtime: bool = False):
+        if audio.ndim == 2:
+            audio = audio[:, 0]
+        self.audio = np.asarray(audio, dtype=np.float32)
+        self.chunk_samples = chunk_samples
+        self.realtime = realtime
+        self.position = 0
+        self._queue = queue.Queue()
+        self._feeder = None
+
+    @property
+    def exhausted(self) -> bool:
+        if self.realtime:
+            return self._feeder is not None and not self._feeder.is_alive() and self._queue.empty()
+        return self.position >= self.audio.shape[0]
+
+    @property
+    def duration_sec(self) -> float:
+        return self.audio.shape[0] / self.sample_rate
+
+    def start(self) -> None:
+        if self.realtime and self._feeder is None:
+            self._feeder = threading.Thread(target=self._feed, daemon=True)
+            self._feeder.start()
+
+    def _next_chunk(self) -> np.ndarray:
+        end = min(self.position + self.chunk_samples, self.audio.shape[0])
+        # (frames, 1) like a sounddevice callback block.
+        chunk = self.audio[self.position:end].reshape(-1, 1)
+        self.position = end
+        return chunk
+
+    def _feed(self) -> None:
+        started = time.time()
+        while self.position < self.audio.shape[0]:
+            chunk = self._next_chunk()
+            delay = started + self.position / self.sample_rate - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self._queue.put((chunk, time.time() - chunk.shape[0] / self.sample_rate))
+            if self.on_chunk is not None:
+                self.on_chunk()
+        if self.on_chunk is not None:
+            self.on_chunk()
+
+    def read(self, timeout: float = 1.0) -> np.ndarray | None:
+        if not self.realtime:
+            return None if self.exhausted else self._next_chunk()
+        try:
+            if timeout <= 0:
+                chunk, self.last_capture_time = self._queue.get_nowait()
+            else:
+                chunk, self.last_capture_time = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return chunk
+
+    def clear(self) -> None:
+        with self._queue.mutex:
+            self._queue.queue.clear()
+
+
+def synthetic_speech(sec: float = 1.0, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Speech-like synthetic audio (a gliding voiced tone with noise) for warm-up
+    decodes. Pure silence can be skipped early by the decoder, leaving the
+    first real utterance to pay for the kernels it never ran.
+    """
+    t = np.arange(int(sec * sample_rate), dtype=np.float32) / sample_rate
+    pitch = 120.0 + 40.0 * np.sin(2 * np.pi * 3.0 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4.0 * t)
+    noise = np.random.default_rng(0).standard_normal(t.shape[0])
+    return (0.1 * envelope * voiced + 0.005 * noise).astype(np.float32)
+
+
+def load_wav(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """16-bit PCM WAV -> mono float32 at `sample_rate` (linear resampling if needed)."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        frames = wav.readframes(wav.getnframes())
+    audio = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate and audio.shape[0]:
+        positions = np.arange(int(audio.shape[0] * sample_rate / rate)) * (rate / sample_rate)
+        audio = np.interp(positions, np.arange(audio.shape[0]), audio).astype(np.float32)
+    return audio
+
+
+class WavFileSource(ArraySource):
+    """A recorded call from a WAV file, optionally followed by silence."""
+
+    def __init__(self, path: str, chunk_samples: int = CHUNK_SAMPLES, realtime: bool = False, tail_silence_sec: float = 0.0):
+        audio = load_wav(path)
+        if tail_silence_sec > 0:
+            audio = np.concatenate([audio, np.zeros(int(SAMPLE_RATE * tail_silence_sec), dtype=np.float32)])
+        super().__init__(audio, chunk_samples=chunk_samples, realtime=realtime)
+        self.path = path
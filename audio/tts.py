@@ -1,42 +1,184 @@
+import os
+import queue
+import tempfile
 import threading
 import time
-import pyttsx3
+from collections import deque
+
+from audio.sinks import AudioSink, SoundDeviceSink
+from audio.tts_cache import DEFAULT_CACHE_DIR, TTSAudioCache, load_wav_pcm
+from llm.streaming import ClauseChunker
+
+BLOCK_SEC = 0.04   # sink write size; barge-in silences the bot within one block
 
 
 class TextToSpeech:
-    def __init__(self):
+    """
+    Sentence-chunked TTS that writes PCM to a pluggable AudioSink.
+
+    A synthesis thread renders each text one sentence/clause at a time
+    (from the clip cache when possible, otherwise pyttsx3 `save_to_file`);
+    a playback thread writes every chunk to the sink in BLOCK_SEC blocks
+    as soon as it is ready, so the first sentence plays while the next one
+    is still being synthesized. `last_start_time` is when the sink accepted
+    the first samples of the current reply. `stop()` cancels both threads
+    and aborts the sink within one block. `on_audio("start"/"end")`, if
+    given, is called from the playback thread when a reply starts playing
+    and when playback runs dry.
+    """
+
+    def __init__(
+        self,
+        sink: AudioSink | None = None,
+        rate: int = 165,
+        cache_dir: str | None = None,
+        clock=None,
+        on_audio=None,
+    ):
+        import pyttsx3
+
         print("🔊 Initializing TTS (pyttsx3)")
         self.engine = pyttsx3.init()
-        self.engine.setProperty("rate", 165)  # natural speed
-        self._thread = None
-        self._stop_flag = False
+        self.engine.setProperty("rate", rate)  # natural speed
+        self.sink = sink or SoundDeviceSink()
+        self.cache = None
+        if os.getenv("TTS_CACHE_ENABLED", "1") == "1":
+            # Fixed phrases play from memory; everything else is synthesized live.
+            self.cache = TTSAudioCache(
+                cache_dir or os.getenv("TTS_CACHE_DIR", DEFAULT_CACHE_DIR),
+                voice=self.engine.getProperty("voice"),
+                rate=rate,
+            )
+        # last_start_time is reported in the session's clock (see bot/replay.py).
+        self.clock = clock or time.time
+        self.on_audio = on_audio
         self.last_start_time = None
-        self._bind_callbacks()
+        # Bumped by speak()/stop(); work tagged with an older generation is dropped.
+        self._generation = 0
+        self._pending = deque()
+        self._cond = threading.Condition()
+        # pyttsx3 engines are not thread-safe: prerender() vs the synthesis thread.
+        self._engine_lock = threading.Lock()
+        self._chunks = queue.Queue()
+        self._playing = False
+        threading.Thread(target=self._synth_loop, daemon=True).start()
+        threading.Thread(target=self._play_loop, daemon=True).start()
 
-    def _bind_callbacks(self):
-        def on_start(_name):
-            self.last_start_time = time.time()
+    def prerender(self, phrases: list[str]) -> int:
+        """Render/load cached clips for `phrases`; call before the first speak()."""
+        if self.cache is None:
+            return 0
+        started = time.time()
+        with self._engine_lock:
+            loaded = self.cache.prerender(self.engine, phrases)
+        print(f"🔊 TTS cache: {loaded}/{len(phrases)} phrases ready in {time.time() - started:.1f}s")
+        return loaded
 
-        # Use engine callbacks to capture actual speech start timing.
-        self.engine.connect("started-utterance", on_start)
+    def warm_up(self, text: str = "Okay.") -> None:
+        """
+        Synthesize one short phrase live (bypassing the clip cache) so the
+        speech driver is started before the first uncached reply.
+        """
+        with self._engine_lock:
+            self._render(text)
+
+    @property
+    def is_speaking(self) -> bool:
+        return bool(self._pending) or not self._chunks.empty() or self._playing
 
     def speak(self, text: str):
-        self._stop_flag = False
-        self.last_start_time = None
-        self._thread = threading.Thread(
-            target=self._run,
-            args=(text,),
-            daemon=True
-        )
-        self._thread.start()
-
-    def _run(self, text: str):
-        if self._stop_flag:
-            return
-        self.engine.say(text)
-        self.engine.runAndWait()
+        with self._cond:
+            interrupted = self.is_speaking
+            self._cancel_locked()
+            self.last_start_time = None
+            self.sink.mark_utterance()
+            self._pending.append((self._generation, text))
+            self._cond.notify()
+        if interrupted:
+            self.sink.abort()
+
+    def enqueue(self, text: str):
+        """Speak `text` after what is already playing (streamed LLM clauses)."""
+        with self._cond:
+            self._pending.append((self._generation, text))
+            self._cond.notify()
 
     def stop(self):
         print("🛑 Stopping TTS")
-        self._stop_flag = True
-        self.engine.stop()
+        with self._cond:
+            self._cancel_locked()
+        self.sink.abort()
+
+    def _cancel_locked(self):
+        self._generation += 1
+        self._pending.clear()
+
+    # ----------------------------------------------------------- synthesis
+
+    def _synth_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                generation, text = self._pending.popleft()
+            for chunk in self._split(text):
+                if generation != self._generation:
+                    break
+                with self._engine_lock:
+                    clip = self._synthesize(chunk)
+                if clip is not None:
+                    self._chunks.put((generation, *clip))
+
+    def _split(self, text: str) -> list[str]:
+        # A whole cached phrase plays as one clip.
+        if self.cache is not None and self.cache.key(text) in self.cache.clips:
+            return [text]
+        chunker = ClauseChunker()
+        chunks = chunker.feed(text + " ")
+        tail = chunker.flush()
+        return chunks + ([tail] if tail else [])
+
+    def _synthesize(self, text: str):
+        clip = self.cache.get(text) if self.cache is not None else None
+        if clip is not None:
+            return clip
+        return self._render(text)
+
+    def _render(self, text: str):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            return load_wav_pcm(path)
+        finally:
+            os.remove(path)
+
+    # ------------------------------------------------------------ playback
+
+    def _play_loop(self):
+        while True:
+            generation, pcm, sample_rate = self._chunks.get()
+            if generation != self._generation:
+                continue
+            self._playing = True
+            block = max(1, int(sample_rate * BLOCK_SEC))
+            for start in range(0, pcm.shape[0], block):
+                if generation != self._generation:
+                    break
+                if self.last_start_time is None:
+                    # First samples of this reply are handed to the sink now.
+                    self.last_start_time = self.clock()
+                    self._notify("start")
+                self.sink.write(pcm[start:start + block], sample_rate)
+            self._playing = False
+            if not self.is_speaking:
+                self._notify("end")
+
+    def _notify(self, kind: str) -> None:
+        if self.on_audio is not None:
+            self.on_audio(kind)
+
+    def close(self):
+        self.stop()
+        self.sink.close()
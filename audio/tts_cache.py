@@ -0,0 +1,137 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import hashlib
+import json
+import wave
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "tts_cache")
+
+
+def load_wav_pcm(path: str) -> tuple[np.ndarray, int] | None:
+    """16-bit WAV -> (int16 mono samples, sample rate), or None if unusable."""
+    try:
+        with wave.open(path, "rb") as wav:
+            sample_rate = wav.getframerate()
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            frames = wav.readframes(wav.getnframes())
+    except (OSError, EOFError, wave.Error) as exc:
+        # e.g. some platforms' drivers write AIFF regardless of extension;
+        # those phrases just stay on live synthesis.
+        print(f"[TTS] Cannot read {path}: {exc}")
+        return None
+    if width != 2:
+        print(f"[TTS] Skipping {path}: {8 * width}-bit audio")
+        return None
+    pcm = np.frombuffer(frames, dtype="<i2")
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return pcm, sample_rate
+
+
+class TTSAudioCache:
+    """
+    Pre-synthesized speech for phrases the bot says verbatim.
+
+    Clips are keyed on text + voice + rate, so changing the voice or speed
+    re-renders instead of playing stale audio. On disk each clip is a 16-bit
+    mono WAV named by its key, with `index.json` mapping keys back to text;
+    in memory they are int16 arrays ready to hand to the audio device.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, voice: str | None = None, rate: int = 165):
+        self.cache_dir = cache_dir
+        self.voice = voice or ""
+        self.rate = rate
+        self.clips: dict[str, tuple[np.ndarray, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.voice}|{self.rate}|{text.strip()}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def get(self, text: str) -> tuple[np.ndarray, int] | None:
+        clip = self.clips.get(self.key(text))
+        if clip is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return clip
+
+    def prerender(self, engine, phrases: list[str]) -> int:
+        """
+        Load cached clips for `phrases`, rendering missing ones with the
+        pyttsx3 `engine` (save_to_file). Call before playback starts: the
+        engine's run loop is not shared with live speech.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        missing = []
+        for text in phrases:
+            key = self.key(text)
+            if key in self.clips:
+                continue
+            if not os.path.exists(self._path(key)):
+                missing.append((key, text))
+                engine.save_to_file(text, self._path(key))
+        if missing:
+            print(f"🔊 Rendering {len(missing)} TTS clip(s) to {self.cache_dir}")
+            engine.runAndWait()
+            self._update_index(missing)
+
+        loaded = 0
+        for text in phrases:
+            key = self.key(text)
+            if key in self.clips:
+                loaded += 1
+                continue
+            clip = load_wav_pcm(self._path(key))
+            if clip is not None:
+                self.clips[key] = clip
+                loaded += 1
+        return loaded
+
+    def _update_index(self, rendered: list[tuple[str, str]]) -> None:
+        index_path = os.path.join(self.cache_dir, "index.json")
+        index = {}
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                index = {}
+        for key, text in rendered:
+            index[key] = {"text": text, "voice": self.voice, "rate": self.rate}
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "clips": float(len(self.clips)),
+            "memory_kb": sum(pcm.nbytes for pcm, _ in self.clips.values()) / 1024.0,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def main():
+    """Build-time render of every fixed prompt and FAQ answer."""
+    from audio.tts import TextToSpeech
+    from bot.session import cacheable_phrases
+    from logic.state_machine import load_faq
+
+    tts = TextToSpeech()
+    loaded = tts.prerender(cacheable_phrases(load_faq()))
+    print(f"✅ {loaded} phrase(s) cached in {tts.cache.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
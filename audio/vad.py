@@ -1,11 +1,188 @@
-import torch
+from dataclasses import dataclass, field
+
 import numpy as np
-from silero_vad import load_silero_vad, get_speech_timestamps
+
+# torch and silero_vad are imported by VADDetector, so importing this module
+# (stream classes, FRAME_SAMPLES) stays cheap.
+
+
+# Silero VAD consumes fixed 512-sample frames at 16 kHz (32 ms).
+FRAME_SAMPLES = 512
+
+# The model's recurrent state (silero-vad 5): saved and restored per stream.
+_STATE_ATTRS = ("_state", "_context", "_last_sr", "_last_batch_size")
+
+
+@dataclass
+class VADStreamResult:
+    probs: list[float] = field(default_factory=list)
+    events: list[str] = field(default_factory=list)   # "start" / "end"
+    speaking: bool = False
+
+
+class VADStream:
+    """
+    Stateful streaming VAD over one audio stream.
+
+    Every 512-sample frame is scored exactly once; the model's recurrent
+    state is carried between calls so no audio is re-processed.
+    """
+
+    def __init__(self, detector, threshold=0.3, min_silence_ms=100, min_speech_ms=64):
+        self.detector = detector
+        self.threshold = threshold
+        self.neg_threshold = max(threshold - 0.15, 0.01)
+        self.min_silence_samples = int(detector.sample_rate * min_silence_ms / 1000)
+        self.min_speech_samples = int(detector.sample_rate * min_speech_ms / 1000)
+        self.reset()
+
+    def reset(self):
+        if getattr(self.detector, "_active_stream", None) is self:
+            self.detector._active_stream = None
+        self._model_state = None
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.triggered = False
+        self._speech_samples = 0
+        self._silence_samples = 0
+        self.last_prob = 0.0
+        self._collected = VADStreamResult()
+
+    def process_chunk(self, chunk: np.ndarray) -> VADStreamResult:
+        """
+        chunk: numpy array (frames, 1) or (frames,) of any length
+        returns: per-frame probabilities and start/end events for this chunk
+        """
+        result = VADStreamResult(speaking=self.triggered)
+        if chunk is None:
+            return result
+        if chunk.ndim == 2:
+            chunk = chunk[:, 0]
+
+        if self._pending.shape[0]:
+            audio = np.concatenate([self._pending, chunk.astype(np.float32, copy=False)])
+        else:
+            audio = chunk
+        result, consumed = self.process_frames(audio)
+        self._pending = np.array(audio[consumed:], dtype=np.float32)
+        return result
+
+    def process_frames(self, audio: np.ndarray) -> tuple[VADStreamResult, int]:
+        """
+        Score every complete frame at the start of `audio` (e.g. a ring buffer view).
+        returns: (result, number of samples consumed); the caller keeps the remainder.
+        """
+        result = VADStreamResult(speaking=self.triggered)
+        n_frames = audio.shape[0] // FRAME_SAMPLES
+        for i in range(n_frames):
+            frame = audio[i * FRAME_SAMPLES:(i + 1) * FRAME_SAMPLES]
+            self._update(self.process_frame(frame), result)
+        result.speaking = self.triggered
+        return result, n_frames * FRAME_SAMPLES
+
+    def submit_frames(self, audio: np.ndarray) -> int:
+        """
+        Queue every complete frame at the start of `audio` for scoring; results
+        are picked up with collect(). A plain stream scores immediately.
+        returns: number of samples consumed
+        """
+        result, consumed = self.process_frames(audio)
+        self._collected.probs.extend(result.probs)
+        self._collected.events.extend(result.events)
+        return consumed
+
+    def collect(self) -> VADStreamResult:
+        """Probabilities and events scored since the last collect()."""
+        result = self._collected
+        result.speaking = self.triggered
+        self._collected = VADStreamResult(speaking=self.triggered)
+        return result
+
+    def close(self):
+        if getattr(self.detector, "_active_stream", None) is self:
+            self.detector._active_stream = None
+
+    def process_frame(self, frame: np.ndarray) -> float:
+        """Score a single 512-sample frame, carrying model state."""
+        prob = self.detector.frame_prob(frame, self)
+        self.last_prob = prob
+        return prob
+
+    def _update(self, prob: float, result: VADStreamResult):
+        result.probs.append(prob)
+        if prob >= self.threshold:
+            self._silence_samples = 0
+            if not self.triggered:
+                self._speech_samples += FRAME_SAMPLES
+                if self._speech_samples >= self.min_speech_samples:
+                    self.triggered = True
+                    result.events.append("start")
+        elif prob < self.neg_threshold or not self.triggered:
+            self._speech_samples = 0
+            if self.triggered:
+                self._silence_samples += FRAME_SAMPLES
+                if self._silence_samples >= self.min_silence_samples:
+                    self.triggered = False
+                    self._silence_samples = 0
+                    result.events.append("end")
+
 
 class VADDetector:
     def __init__(self, sample_rate=16000):
+        import torch
+        from silero_vad import load_silero_vad
+
+        self.torch = torch
         self.sample_rate = sample_rate
         self.model = load_silero_vad()
+        self.model.reset_states()
+        missing = [name for name in _STATE_ATTRS if not hasattr(self.model, name)]
+        if missing:
+            # Without them every stream would silently share one state.
+            raise RuntimeError(
+                f"silero_vad model has no {', '.join(missing)}; "
+                "per-stream VAD state needs the silero-vad 5 model"
+            )
+        self._active_stream = None
+
+    def warm_up(self, sec: float = 1.0) -> None:
+        """One streaming pass over synthetic audio so the first caller's frames run warm."""
+        from audio.sources import synthetic_speech
+
+        stream = self.create_stream()
+        stream.process_chunk(synthetic_speech(sec, self.sample_rate))
+        stream.close()
+
+    def create_stream(self, **kwargs) -> VADStream:
+        return VADStream(self, **kwargs)
+
+    def frame_prob(self, frame: np.ndarray, stream: VADStream) -> float:
+        # The model keeps its recurrent state internally; swap in the state
+        # belonging to this stream so several streams can share one model.
+        if self._active_stream is not stream:
+            if self._active_stream is not None:
+                self._active_stream._model_state = self._save_state()
+            self._restore_state(stream._model_state)
+            self._active_stream = stream
+        torch = self.torch
+        with torch.no_grad():
+            prob = self.model(torch.from_numpy(frame).float(), self.sample_rate).item()
+        return prob
+
+    def release_model_state(self):
+        """Store the loaded stream's recurrent state back on the stream."""
+        if self._active_stream is not None:
+            self._active_stream._model_state = self._save_state()
+            self._active_stream = None
+
+    def _save_state(self):
+        return {name: getattr(self.model, name) for name in _STATE_ATTRS}
+
+    def _restore_state(self, state):
+        if not state:
+            self.model.reset_states()
+            return
+        for name, value in state.items():
+            setattr(self.model, name, value)
 
     def is_speech(self, audio_chunk: np.ndarray) -> bool:
         """
@@ -18,7 +195,13 @@ class VADDetector:
         if audio_chunk.ndim == 2:
             audio_chunk = audio_chunk[:, 0]
 
-        audio_tensor = torch.from_numpy(audio_chunk).float()
+        from silero_vad import get_speech_timestamps
+
+        audio_tensor = self.torch.from_numpy(audio_chunk).float()
+
+        # get_speech_timestamps resets model state; make sure no stream
+        # keeps assuming its state is still loaded.
+        self.release_model_state()
 
         timestamps = get_speech_timestamps(
             audio_tensor,
@@ -0,0 +1,158 @@
+from collections import deque
+
+import numpy as np
+
+from audio.vad import FRAME_SAMPLES, VADStream, VADStreamResult
+
+
+class BatchedVADStream(VADStream):
+    """
+    VAD stream whose frames are scored by a BatchedVADService.
+
+    `submit_frames()` only queues frames; the service scores them together
+    with every other stream's frames on its next tick, and `collect()`
+    returns the results. `process_frames()` keeps the synchronous API by
+    running the service immediately.
+    """
+
+    def __init__(self, service, **kwargs):
+        self.service = service
+        super().__init__(service.detector, **kwargs)
+
+    def reset(self):
+        super().reset()
+        self._frames = deque()
+        torch = self.service.detector.torch
+        self._state = torch.zeros(*self.service.state_shape)
+        self._context = torch.zeros(*self.service.context_shape)
+
+    def submit_frames(self, audio: np.ndarray) -> int:
+        n_frames = audio.shape[0] // FRAME_SAMPLES
+        for i in range(n_frames):
+            # Copy: the caller's buffer (often a ring view) may be overwritten.
+            self._frames.append(np.array(audio[i * FRAME_SAMPLES:(i + 1) * FRAME_SAMPLES], dtype=np.float32))
+        return n_frames * FRAME_SAMPLES
+
+    def process_frames(self, audio: np.ndarray) -> tuple[VADStreamResult, int]:
+        consumed = self.submit_frames(audio)
+        self.service.run()
+        return self.collect(), consumed
+
+    def process_frame(self, frame: np.ndarray) -> float:
+        self.submit_frames(frame)
+        self.service.run()
+        return self.last_prob
+
+    def _score(self, prob: float) -> None:
+        self.last_prob = prob
+        self._update(prob, self._collected)
+
+    def close(self):
+        self.service.streams.discard(self)
+
+
+class BatchedVADService:
+    """
+    One Silero forward pass per tick for all active streams.
+
+    Each tick takes the oldest queued frame from every stream that has one,
+    stacks the frames and the streams' recurrent states along the batch axis,
+    runs the model once, and hands each stream back its probability and state.
+    Works with a single stream too, so single-session main() can use it.
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+        self.model = detector.model
+        self.sample_rate = detector.sample_rate
+        self.streams: set[BatchedVADStream] = set()
+        self.ticks = 0
+        self.frames_scored = 0
+        self.state_shape, self.context_shape = self._probe_state()
+
+    def _probe_state(self) -> tuple[tuple, tuple]:
+        """
+        One stream's recurrent state and context shapes, read from the model
+        after a single-frame pass (Silero 5 at 16 kHz: (2, 1, 128) and (1, 64)).
+        Raises if they are not batched along the axes tick() stacks on.
+        """
+        torch = self.detector.torch
+        model = self.model
+        self.detector.release_model_state()
+        model.reset_states()
+        with torch.no_grad():
+            model(torch.zeros(1, FRAME_SAMPLES), self.sample_rate)
+        state_shape, context_shape = tuple(model._state.shape), tuple(model._context.shape)
+        model.reset_states()
+        if len(state_shape) != 3 or state_shape[1] != 1 or len(context_shape) != 2 or context_shape[0] != 1:
+            raise RuntimeError(
+                f"unexpected Silero state {state_shape} / context {context_shape}; "
+                "batched VAD needs (layers, batch, hidden) and (batch, samples)"
+            )
+        return state_shape, context_shape
+
+    def create_stream(self, **kwargs) -> BatchedVADStream:
+        stream = BatchedVADStream(self, **kwargs)
+        self.streams.add(stream)
+        return stream
+
+    def tick(self) -> dict[BatchedVADStream, float]:
+        """Score one frame per stream with queued audio; returns per-stream probability."""
+        active = [stream for stream in self.streams if stream._frames]
+        if not active:
+            return {}
+
+        # Streams created directly on the detector may have their state loaded.
+        self.detector.release_model_state()
+        torch = self.detector.torch
+        model = self.model
+        frames = torch.from_numpy(np.stack([stream._frames.popleft() for stream in active]))
+        model._state = torch.cat([stream._state for stream in active], dim=1)
+        model._context = torch.cat([stream._context for stream in active], dim=0)
+        model._last_sr = self.sample_rate
+        model._last_batch_size = len(active)
+        with torch.no_grad():
+            probs = model(frames, self.sample_rate).reshape(-1).tolist()
+        new_state, new_context = model._state, model._context
+        if new_state.shape[1] != len(active) or new_context.shape[0] != len(active):
+            raise RuntimeError(
+                f"Silero returned state {tuple(new_state.shape)} / context {tuple(new_context.shape)} "
+                f"for a batch of {len(active)}"
+            )
+
+        results = {}
+        for i, (stream, prob) in enumerate(zip(active, probs)):
+            stream._state = new_state[:, i:i + 1]
+            stream._context = new_context[i:i + 1]
+            stream._score(prob)
+            results[stream] = prob
+        # Leave the model in a clean single-stream state for the detector.
+        model.reset_states()
+
+        self.ticks += 1
+        self.frames_scored += len(active)
+        return results
+
+    def warm_up(self, sec: float = 1.0) -> None:
+        """One batched pass over synthetic audio (see VADDetector.warm_up)."""
+        from audio.sources import synthetic_speech
+
+        stream = self.create_stream()
+        stream.submit_frames(synthetic_speech(sec, self.sample_rate))
+        self.run()
+        stream.close()
+
+    def run(self) -> int:
+        """Tick until every queued frame is scored; returns the number of ticks."""
+        ticks = 0
+        while self.tick():
+            ticks += 1
+        return ticks
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "streams": float(len(self.streams)),
+            "ticks": float(self.ticks),
+            "frames_scored": float(self.frames_scored),
+            "avg_batch_size": self.frames_scored / self.ticks if self.ticks else 0.0,
+        }
@@ -0,0 +1,79 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import subprocess
+import time
+
+HEAVY_MODULES = ("torch", "silero_vad", "faster_whisper", "ctranslate2", "pyttsx3")
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[int(round((len(values) - 1) * q))] if values else 0.0
+
+
+def child(parallel: bool) -> dict:
+    """One cold start in this (fresh) process: imports, then load + warm-up of every component."""
+    started = time.perf_counter()
+    from audio.sinks import NullSink
+    from audio.tts import TextToSpeech
+    from bot.models import SharedModels
+    from bot.startup import StartupOrchestrator
+    import app  # noqa: F401  (entry point import cost)
+
+    import_ms = (time.perf_counter() - started) * 1000.0
+    # Entry points should not pay for model libraries until a model is built.
+    eager = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    startup = StartupOrchestrator(parallel=parallel)
+    tts_future = startup.submit("tts", TextToSpeech, sink=NullSink(), warm_up=lambda tts: tts.warm_up())
+    models = SharedModels.load(startup=startup)
+    tts = tts_future.result()
+    report = startup.finish()
+    tts.close()
+    models.shutdown()
+    return {"import_ms": import_ms, "eager_imports": eager, **report}
+
+
+def run(parallel: bool, runs: int) -> dict:
+    reports = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "parallel" if parallel else "sequential"],
+            capture_output=True, text=True, check=True,
+        )
+        # The child's last line is its JSON report; the rest is startup logging.
+        reports.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    keys = [key for key in reports[0] if key.endswith("_ms")]
+    return {
+        "runs": runs,
+        "eager_imports": reports[0]["eager_imports"],
+        **{f"{key.removesuffix('_ms')}_p50_ms": _pct([r.get(key, 0.0) for r in reports], 0.5) for key in keys},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time: sequential vs parallel model loading")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes per mode")
+    parser.add_argument("--child", choices=["parallel", "sequential"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child == "parallel")))
+        return
+
+    results = {
+        "sequential": run(False, args.runs),
+        "parallel": run(True, args.runs),
+    }
+    results["wall_saved_ms"] = results["sequential"]["wall_p50_ms"] - results["parallel"]["wall_p50_ms"]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import json
+import wave
+
+import numpy as np
+
+from bot import protocol
+
+CHUNK_SAMPLES = 512
+
+
+def load_wav(path: str) -> np.ndarray:
+    """16 kHz mono int16 WAV -> float32 samples."""
+    with wave.open(path, "rb") as wav:
+        if wav.getframerate() != 16000 or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16 kHz mono 16-bit PCM")
+        pcm = wav.readframes(wav.getnframes())
+    return protocol.decode_audio(pcm)
+
+
+async def stream_file(path: str, host="127.0.0.1", port=8765, tail_silence_sec=3.0, language=None):
+    """
+    Stream a WAV to the server in real time and print every event it sends.
+    `language` (e.g. "hi") pins the caller's language instead of detecting it.
+    """
+    audio = load_wav(path)
+    audio = np.concatenate([audio, np.zeros(int(16000 * tail_silence_sec), dtype=np.float32)])
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def receive():
+        while True:
+            frame = await protocol.read_frame(reader)
+            if frame is None:
+                return
+            kind, payload = frame
+            if kind == protocol.JSON:
+                print(json.loads(payload.decode("utf-8")))
+
+    receiver = asyncio.create_task(receive())
+    hello = {"type": "hello", "call_id": os.path.basename(path)}
+    if language:
+        hello["language"] = language
+    writer.write(protocol.encode_json(hello))
+    chunk_sec = CHUNK_SAMPLES / 16000
+    for start in range(0, audio.shape[0], CHUNK_SAMPLES):
+        writer.write(protocol.encode_audio(audio[start:start + CHUNK_SAMPLES]))
+        await writer.drain()
+        await asyncio.sleep(chunk_sec)
+    writer.write(protocol.encode_json({"type": "bye"}))
+    await writer.drain()
+    writer.close()
+    await receiver
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python bot/client.py <utterance.wav> [host] [port] [language]")
+        sys.exit(1)
+    asyncio.run(
+        stream_file(
+            sys.argv[1],
+            host=sys.argv[2] if len(sys.argv) > 2 else "127.0.0.1",
+            port=int(sys.argv[3]) if len(sys.argv) > 3 else 8765,
+            language=sys.argv[4] if len(sys.argv) > 4 else None,
+        )
+    )
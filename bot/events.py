@@ -0,0 +1,49 @@
+import select
+import socket
+
+
+class Wakeup:
+    """
+    Wakes a session loop when something it waits for happens.
+
+    Producers on any thread (mic callback, ASR/LLM future callbacks, TTS
+    playback) call `set()`; the loop blocks in `wait()` until one of them
+    fires or its next timer is due, so an idle call costs no CPU and a stage
+    starts as soon as the previous one finishes. A `set()` that lands while
+    the loop is busy is remembered, never lost.
+
+    It is a self-pipe: `set()` writes one byte to a non-blocking socket and
+    takes no lock, so it is safe to call from the PortAudio callback.
+    """
+
+    def __init__(self):
+        self._recv, self._send = socket.socketpair()
+        self._recv.setblocking(False)
+        self._send.setblocking(False)
+        self.wakeups = 0
+
+    def set(self, *_args) -> None:
+        # Accepts and ignores arguments so it can be a done-callback directly.
+        try:
+            self._send.send(b"\0")
+        except OSError:
+            # Buffer full (a wakeup is already pending) or closed.
+            pass
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until set() or `timeout` seconds; returns True if set() fired."""
+        readable, _, _ = select.select([self._recv], [], [], timeout)
+        if not readable:
+            return False
+        # One wakeup for everything set() since the last wait().
+        try:
+            while self._recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        self.wakeups += 1
+        return True
+
+    def close(self) -> None:
+        self._recv.close()
+        self._send.close()
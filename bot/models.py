@@ -0,0 +1,144 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from audio.vad import VADDetector
+from audio.vad_service import BatchedVADService
+from asr.worker_pool import ASRWorkerPool
+from asr.batch_scheduler import BatchingASRScheduler
+from asr.router import ASRTierRouter, parse_tiers
+from llm.llm_client import LLMClient
+from llm.response_cache import ResponseCache
+from logic.state_machine import load_faq
+from logic.verify import load_users
+from metrics.latency import LatencyTracker
+from metrics.tracing import load_tracer
+from bot.startup import StartupOrchestrator
+
+
+class SharedModels:
+    """
+    Everything that is loaded once per process and shared by all sessions:
+    VAD model, ASR worker pool, LLM client, FAQ and user data.
+
+    Sessions keep only their own per-call state (VAD streams, buffers,
+    conversation state), so memory stays flat as the number of calls grows.
+    """
+
+    def __init__(self, vad, asr, llm, faq_list, users, llm_workers: int | None = None, response_cache=None):
+        self.vad = vad
+        self.asr = asr
+        self.llm = llm
+        # Shared by all sessions: one caller's LLM reply serves the next caller.
+        self.response_cache = response_cache
+        self.faq_list = faq_list
+        self.users = users
+        # Process-wide per-stage latency; every session's tracker feeds it.
+        self.latency = LatencyTracker()
+        # Per-turn spans to TRACE_PATH (JSONL); a no-op tracer when unset.
+        self.tracer = load_tracer()
+        # LLM requests are network-bound; run them off the audio loop.
+        self.llm_executor = ThreadPoolExecutor(
+            max_workers=int(llm_workers or os.getenv("LLM_WORKERS", "8")),
+            thread_name_prefix="llm",
+        )
+
+    @staticmethod
+    def load_vad():
+        vad = VADDetector()
+        if os.getenv("VAD_BATCHED", "1") == "1":
+            # One Silero forward per tick for every session's newest frames.
+            vad = BatchedVADService(vad)
+        return vad
+
+    @staticmethod
+    def load_asr_backend(asr_workers: int | None = None, model_size: str = "medium"):
+        """
+        ASR_BACKEND=pool  (default): one Whisper per worker process
+        ASR_BACKEND=batch: one in-process Whisper, utterances from all
+                           sessions batched by BatchingASRScheduler
+        """
+        backend = os.getenv("ASR_BACKEND", "pool")
+        if backend == "batch":
+            from asr.whisper_asr import WhisperASR
+
+            asr = BatchingASRScheduler(
+                WhisperASR(model_size=model_size),
+                max_batch_size=int(os.getenv("ASR_MAX_BATCH", "8")),
+                max_wait_ms=float(os.getenv("ASR_BATCH_WAIT_MS", "30")),
+                slo_ms=float(os.getenv("ASR_SLO_MS", "1500")),
+            )
+            print(f"[CONFIG] ASR_BACKEND=batch model={model_size} max_batch={asr.max_batch_size}")
+        elif backend == "pool":
+            asr = ASRWorkerPool(model_size=model_size, num_workers=asr_workers)
+            print(f"[CONFIG] ASR_BACKEND=pool model={model_size} ASR_WORKERS={asr.num_workers}")
+        else:
+            raise ValueError(f"Unknown ASR_BACKEND: {backend}")
+        return asr
+
+    @classmethod
+    def load_asr(cls, asr_workers: int | None = None):
+        """
+        ASR_TIERS=base,medium (smallest first) loads one backend per model and
+        routes each turn between them (ASRTierRouter); otherwise a single
+        medium backend.
+        """
+        tiers = parse_tiers(os.getenv("ASR_TIERS"))
+        if len(tiers) < 2:
+            return cls.load_asr_backend(asr_workers, tiers[0] if tiers else "medium")
+        router = ASRTierRouter(
+            {name: cls.load_asr_backend(asr_workers, name) for name in tiers},
+            short_sec=float(os.getenv("ASR_SHORT_SEC", "1.5")),
+            min_logprob=float(os.getenv("ASR_ESCALATE_LOGPROB", "-0.7")),
+            max_no_speech=float(os.getenv("ASR_ESCALATE_NO_SPEECH", "0.6")),
+        )
+        print(f"[CONFIG] ASR_TIERS={','.join(tiers)} (fast={router.fast}, large={router.large})")
+        return router
+
+    @staticmethod
+    def load_response_cache() -> ResponseCache | None:
+        if os.getenv("LLM_CACHE_ENABLED", "1") != "1":
+            return None
+        return ResponseCache(
+            max_entries=int(os.getenv("LLM_CACHE_SIZE", "512")),
+            ttl_sec=float(os.getenv("LLM_CACHE_TTL_SEC", str(24 * 3600))),
+            similarity=float(os.getenv("LLM_CACHE_SIMILARITY", "0.8")),
+            path=os.getenv("LLM_CACHE_PATH") or None,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        asr_workers: int | None = None,
+        llm: LLMClient | None = None,
+        startup: StartupOrchestrator | None = None,
+    ) -> "SharedModels":
+        """
+        Load and warm every component concurrently. Pass `startup` to load
+        other components (e.g. TTS) alongside; otherwise the breakdown is
+        printed here.
+        """
+        own_startup = startup is None
+        startup = startup or StartupOrchestrator()
+        vad_future = startup.submit("vad", cls.load_vad, warm_up=lambda vad: vad.warm_up())
+        asr_future = startup.submit("asr", cls.load_asr, asr_workers, warm_up=lambda asr: asr.warm_up())
+        llm_future = startup.submit("llm", lambda: llm or LLMClient(), warm_up=lambda client: client.warm_up())
+        data_future = startup.submit("data", lambda: (load_faq(), load_users(), cls.load_response_cache()))
+        faq_list, users, response_cache = data_future.result()
+        models = cls(
+            vad=vad_future.result(),
+            asr=asr_future.result(),
+            llm=llm_future.result(),
+            faq_list=faq_list,
+            users=users,
+            response_cache=response_cache,
+        )
+        if own_startup:
+            startup.finish()
+            startup.print_report()
+        return models
+
+    def shutdown(self) -> None:
+        self.asr.shutdown()
+        self.llm_executor.shutdown(wait=False, cancel_futures=True)
+        self.llm.close()
+        self.tracer.close()
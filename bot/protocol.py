@@ -0,0 +1,56 @@
+"""
+Wire format between the voice bot server and its clients (TCP).
+
+Every frame is: 1-byte kind | 4-byte big-endian payload length | payload.
+
+- AUDIO (b"A"): mono 16 kHz little-endian int16 PCM, any number of samples
+- JSON  (b"J"): UTF-8 JSON object with a "type" field
+    client -> server: {"type": "hello", "call_id": "...", "language": "hi"}
+                      (optional, before the first audio; both fields optional),
+                      {"type": "bye"}
+    server -> client: {"type": "ready" | "partial" | "transcript" | "speak" |
+                       "stop" | "barge_in" | "metrics", ...}
+"""
+import asyncio
+import json
+import struct
+
+import numpy as np
+
+AUDIO = b"A"
+JSON = b"J"
+
+_HEADER = struct.Struct(">cI")
+MAX_FRAME_BYTES = 1 << 20
+
+
+def encode_frame(kind: bytes, payload: bytes) -> bytes:
+    return _HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_json(message: dict) -> bytes:
+    return encode_frame(JSON, json.dumps(message, ensure_ascii=False).encode("utf-8"))
+
+
+def encode_audio(audio: np.ndarray) -> bytes:
+    if audio.ndim == 2:
+        audio = audio[:, 0]
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767.0).astype("<i2")
+    return encode_frame(AUDIO, pcm.tobytes())
+
+
+def decode_audio(payload: bytes) -> np.ndarray:
+    return np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[bytes, bytes] | None:
+    """Returns (kind, payload), or None when the peer closed the connection."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        kind, length = _HEADER.unpack(header)
+        if length > MAX_FRAME_BYTES:
+            raise ValueError(f"frame too large: {length} bytes")
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+    return kind, payload
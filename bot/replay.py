@@ -0,0 +1,311 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import glob
+import json
+import platform
+import resource
+import subprocess
+import time
+
+import numpy as np
+
+from audio.sinks import NullSink
+from audio.sources import SAMPLE_RATE, WavFileSource
+from bot.events import Wakeup
+from bot.session import Session, cacheable_phrases
+from metrics.latency import STAGES as TURN_STAGES
+
+STAGES = list(TURN_STAGES) + ["first_audio_ms"]
+MAX_SETTLE_SEC = 30.0
+
+
+class ReplayClock:
+    """
+    Session time for replays: wall-clock time plus skipped idle time.
+
+    While the bot is busy (ASR, LLM, waiting for first audio) the clock runs
+    at wall speed, so stage latencies are real. Idle stretches (the caller
+    talking or silent, speaking windows) are skipped with `skip()`, which
+    is what makes an accelerated replay faster than real time.
+    """
+
+    def __init__(self):
+        self.offset = 0.0
+
+    def __call__(self) -> float:
+        return time.time() + self.offset
+
+    def skip(self, sec: float) -> None:
+        self.offset += sec
+
+
+def _busy(session: Session) -> bool:
+    if session.sm.is_processing() or session.llm_stream is not None:
+        return True
+    return session.sm.is_speaking() and "Audio_first_byte_time" not in session.latency_log
+
+
+def _cpu_sec() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS of the whole process so far (never decreases)."""
+    # ru_maxrss is KB on Linux, bytes on macOS.
+    scale = 1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def replay_call(models, tts, clock: ReplayClock, source, speed: float = 0.0) -> dict:
+    """
+    Push one recorded call through a fresh Session: VAD -> ASR -> FAQ/LLM ->
+    TTS. `speed` 1 replays in real time, N skips idle waits to run N times
+    faster, 0 skips them entirely. Returns per-turn stage latencies and the
+    call's CPU time.
+    """
+    turns = []
+    events = {}
+    texts = {"transcript": None, "response": None}
+
+    def on_event(kind: str, payload: dict):
+        events[kind] = events.get(kind, 0) + 1
+        if kind in texts:
+            texts[kind] = payload.get("text")
+        elif kind == "metrics":
+            turn = dict(payload)
+            turn["first_audio_ms"] = turn["turn_ms"] + turn["tts_startup_ms"]
+            turn["transcript"] = texts["transcript"]
+            turn["response"] = texts["response"]
+            turns.append(turn)
+
+    wakeup = Wakeup()
+    tts.on_audio = wakeup.set
+    session = Session(
+        models,
+        speaker=tts,
+        session_id=getattr(source, "path", "array"),
+        on_event=on_event,
+        clock=clock,
+        wakeup=wakeup.set,
+    )
+    chunk_sec = source.chunk_samples / SAMPLE_RATE
+    silence = np.zeros((source.chunk_samples, 1), dtype=np.float32)
+
+    wall_start = time.time()
+    cpu_start = _cpu_sec()
+    rss_start = _peak_rss_mb()
+    session.start()
+    source.start()
+    next_due = clock()
+    settle_until = None
+    while True:
+        now = clock()
+        if now >= next_due:
+            chunk = source.read(timeout=0)
+            if chunk is None:
+                # Recording is over: keep the line open with silence until the
+                # last turn has been answered.
+                if settle_until is None:
+                    settle_until = now + MAX_SETTLE_SEC
+                idle = session.sm.is_listening() and not session.recording and not _busy(session)
+                if idle or now >= settle_until:
+                    break
+                chunk = silence
+            session.step(chunk)
+            next_due += chunk_sec
+            continue
+        if _busy(session):
+            # Real work in flight: wait for its result (or the next chunk).
+            timeout = next_due - now
+            session_timeout = session.next_timeout()
+            if session_timeout is not None:
+                timeout = min(timeout, session_timeout)
+            wakeup.wait(timeout)
+            session.step(None)
+            continue
+        wait = next_due - now
+        if speed > 0:
+            time.sleep(wait / speed)
+            clock.skip(wait - wait / speed)
+        else:
+            clock.skip(wait)
+    session.close()
+    wakeup.close()
+
+    return {
+        "call": session.session_id,
+        "audio_sec": source.duration_sec,
+        "wall_sec": time.time() - wall_start,
+        "cpu_sec": _cpu_sec() - cpu_start,
+        # The process peak is shared by every call; only how far this call raised it is its own.
+        "peak_rss_growth_mb": _peak_rss_mb() - rss_start,
+        "events": events,
+        "turns": turns,
+        "language": session.language.stats() if session.language is not None else None,
+        "speculation": session.speculator.stats() if session.speculator is not None else None,
+    }
+
+
+def _pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[int(round((len(values) - 1) * q))] if values else 0.0
+
+
+def summarize(calls: list[dict]) -> dict:
+    stages = {}
+    for stage in STAGES:
+        values = [turn[stage] for call in calls for turn in call["turns"] if stage in turn]
+        stages[stage] = {
+            "count": len(values),
+            "mean": sum(values) / len(values) if values else 0.0,
+            "p50": _pct(values, 0.5),
+            "p90": _pct(values, 0.9),
+            "p95": _pct(values, 0.95),
+            "p99": _pct(values, 0.99),
+            "max": max(values) if values else 0.0,
+        }
+    audio_sec = sum(call["audio_sec"] for call in calls)
+    wall_sec = sum(call["wall_sec"] for call in calls)
+    # Per-call language pinning and speculation counters, summed (rates are per-call, so not summed).
+    language, speculation = {}, {}
+    for call in calls:
+        for key, value in (call.get("language") or {}).items():
+            if not key.endswith("_per_sec"):
+                language[key] = language.get(key, 0.0) + value
+        for key, value in (call.get("speculation") or {}).items():
+            if key not in ("win_rate", "saved_ms_per_turn"):
+                speculation[key] = speculation.get(key, 0.0) + value
+    if speculation:
+        turns = speculation["wins"] + speculation["misses"]
+        speculation["win_rate"] = speculation["wins"] / turns if turns else 0.0
+        speculation["saved_ms_per_turn"] = speculation["saved_ms"] / turns if turns else 0.0
+    return {
+        "calls": len(calls),
+        "turns": sum(len(call["turns"]) for call in calls),
+        "audio_sec": audio_sec,
+        "wall_sec": wall_sec,
+        "realtime_factor": audio_sec / wall_sec if wall_sec else 0.0,
+        "cpu_sec": sum(call["cpu_sec"] for call in calls),
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages_ms": stages,
+        "language": language or None,
+        "speculation": speculation or None,
+    }
+
+
+def compare(result: dict, baseline: dict) -> dict:
+    """Per-stage p50/p95 change vs an earlier result (negative = faster)."""
+    deltas = {}
+    for stage, current in result["summary"]["stages_ms"].items():
+        before = baseline.get("summary", {}).get("stages_ms", {}).get(stage)
+        if before:
+            deltas[stage] = {
+                "p50": current["p50"] - before["p50"],
+                "p95": current["p95"] - before["p95"],
+            }
+    return deltas
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() or None
+
+
+def _corpus(paths: list[str]) -> list[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.wav"))))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded calls through the full pipeline and report latency")
+    parser.add_argument("corpus", nargs="+", help="WAV files (one call each) or directories of them")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="1 = real time, N = N times faster, 0 = skip every idle wait (default)")
+    parser.add_argument("--tail-silence-sec", type=float, default=1.0)
+    parser.add_argument("--llm-first-token-ms", type=float, default=300.0)
+    parser.add_argument("--llm-token-ms", type=float, default=30.0)
+    parser.add_argument("--llm-cache", action="store_true", help="keep the LLM response cache on")
+    parser.add_argument("--output", help="also write the result JSON here")
+    parser.add_argument("--baseline", help="earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    # In-process ASR, so CPU time and peak RSS cover the whole pipeline.
+    os.environ.setdefault("ASR_BACKEND", "batch")
+    from bot.models import SharedModels
+    from audio.tts import TextToSpeech
+    from llm.llm_client import LLMClient
+    from llm.stub_server import start_stub_server
+
+    files = _corpus(args.corpus)
+    if not files:
+        parser.error("no WAV files found")
+
+    server, base_url = start_stub_server(first_token_ms=args.llm_first_token_ms, token_ms=args.llm_token_ms)
+    models = SharedModels.load(llm=LLMClient(api_key="stub", base_url=base_url))
+    if not args.llm_cache:
+        # Every run starts cold, so results compare across versions.
+        models.response_cache = None
+    clock = ReplayClock()
+    tts = TextToSpeech(sink=NullSink(), clock=clock)
+    tts.prerender(cacheable_phrases(models.faq_list))
+
+    calls = []
+    try:
+        for path in files:
+            print(f"▶️ Replaying {path}")
+            source = WavFileSource(path, tail_silence_sec=args.tail_silence_sec)
+            calls.append(replay_call(models, tts, clock, source, speed=args.speed))
+    finally:
+        tts.close()
+        models.shutdown()
+        server.shutdown()
+
+    result = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "speed": args.speed,
+            "llm_first_token_ms": args.llm_first_token_ms,
+            "llm_token_ms": args.llm_token_ms,
+            "llm_cache": args.llm_cache,
+            **{
+                name: os.getenv(name)
+                for name in (
+                    "ASR_BACKEND", "ASR_TIERS", "STREAMING_ASR_ENABLED", "STREAMING_LLM_ENABLED",
+                    "SPECULATION_ENABLED", "ENDPOINTING", "BARGE_IN_ENABLED", "VAD_BATCHED",
+                )
+                if os.getenv(name) is not None
+            },
+        },
+        "summary": summarize(calls),
+        "calls": calls,
+    }
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            result["vs_baseline"] = compare(result, json.load(f))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
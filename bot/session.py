@@ -0,0 +1,909 @@
+import os
+import time
+from collections import deque
+
+from audio.endpointing import load_endpointer
+from audio.ring_buffer import AudioRingBuffer
+from asr.language import load_language_tracker
+from asr.router import STRUCTURED_STATES
+from asr.streaming import StreamingTranscriber
+from bot.speculation import Speculator
+from llm.streaming import ResponseStream
+from logic.state_machine import ConversationStateMachine, State, match_faq
+from logic.verify import best_candidate, extract_mobile, extract_last4, extract_dob, verify_user
+from metrics.latency import LatencyTracker
+from metrics.tracing import NULL_SPAN, Tracer
+
+SAMPLE_RATE = 16000
+PREROLL_SEC = 0.2
+# Capture beyond the longest utterance: the max-length cut lands after a whole
+# chunk, and batched ingest may queue several chunks before advance() runs.
+CAPTURE_HEADROOM_SEC = 2.0
+
+PREROLL_SAMPLES = int(SAMPLE_RATE * PREROLL_SEC)
+
+BARGE_IN_MIN_DELAY_SEC = 0.8
+BARGE_IN_MIN_RMS = 0.01
+BARGE_IN_WINDOW_SEC = 1.5
+NO_BARGE_IN_HOLD_SEC = 0.12
+FIRST_BYTE_WAIT_SEC = 3.0   # fallback for speakers that never report first audio
+
+WELCOME_TEXT = "Welcome. Please tell me your mobile number."
+ASK_SECONDARY_TEXT = "Thanks. Please tell me the last 4 digits or your date of birth."
+REPEAT_MOBILE_TEXT = "Sorry, I didn't catch your mobile number. Please repeat it."
+VERIFIED_TEXT = "Verified. How can I help you today?"
+VERIFY_FAILED_TEXT = "Sorry, I couldn't verify. Please try again later."
+VERIFY_RETRY_TEXT = "I couldn't verify that. Please tell me your mobile number again."
+HOLD_TEXT = "Hmm... let me check that for you."
+FILLERS = ["Hmm, ", "Haan, ", "Ek second, "]
+SYSTEM_PROMPT = (
+    "You are a helpful insurance support assistant. "
+    "Reply in Hinglish (Hindi + English mix) with a natural, friendly tone. "
+    "Use small fillers like 'haan', 'hmm', 'theek hai', 'acha' to sound human. "
+    "If the user's question is unclear or incomplete, ask a brief clarifying question."
+)
+LLM_FALLBACK_TEXT = "Haan, main help kar sakta hoon. Thoda aur detail share karoge?"
+NOISE_PHRASES = ["thank you", "you", "yeah", "okay", "hello"]
+SENSITIVE_TERMS = ["otp", "mobile", "number", "dob", "date of birth", "last 4", "digits"]
+
+
+def is_sensitive_prompt(text: str) -> bool:
+    probe = text.lower()
+    return any(term in probe for term in SENSITIVE_TERMS)
+
+
+def _has_filler(text: str) -> bool:
+    return text.lower().startswith(("hmm", "haan", "ek second"))
+
+
+def cacheable_phrases(faq_list) -> list[str]:
+    """
+    Every string a session can speak that does not come from the LLM: fixed
+    prompts, the LLM fallback and each FAQ answer in every filler variant
+    `apply_filler_if_allowed` can produce. Used to pre-render TTS audio.
+    """
+    phrases = [
+        WELCOME_TEXT, ASK_SECONDARY_TEXT, REPEAT_MOBILE_TEXT, VERIFIED_TEXT,
+        VERIFY_FAILED_TEXT, VERIFY_RETRY_TEXT, HOLD_TEXT, LLM_FALLBACK_TEXT,
+    ]
+    for item in faq_list:
+        answer = item["answer"]
+        if is_sensitive_prompt(answer) or _has_filler(answer):
+            phrases.append(answer)
+        else:
+            phrases.extend(filler + answer for filler in FILLERS)
+    return list(dict.fromkeys(phrases))
+
+
+class Session:
+    """
+    One caller's conversation: turn state, audio buffers and VAD/ASR streams.
+
+    The session owns no devices and no models. It is driven by `step(chunk)`
+    with 16 kHz float32 audio (or None when no audio arrived), or by
+    `ingest(chunk)` + `advance()` when VAD is batched across sessions. It talks back
+    through `speaker` (anything with speak/stop/last_start_time). Heavy models
+    come from a `SharedModels` instance shared by every session in the process.
+
+    The driver does not need to poll: `wakeup()` (if given) is called from
+    worker threads when an ASR or LLM result lands, and `next_timeout()` says
+    when the next timer (speaking windows) is due.
+    """
+
+    def __init__(
+        self,
+        models,
+        speaker,
+        session_id: str = "local",
+        on_event=None,
+        input_flush=None,
+        barge_in_enabled: bool | None = None,
+        streaming_asr_enabled: bool | None = None,
+        streaming_llm_enabled: bool | None = None,
+        structured_asr_enabled: bool | None = None,
+        language_pinning_enabled: bool | None = None,
+        speculation_enabled: bool | None = None,
+        endpointer=None,
+        clock=None,
+        wakeup=None,
+    ):
+        self.models = models
+        self.speaker = speaker
+        self.session_id = session_id
+        self.on_event = on_event
+        # Source of every timestamp and timer; a replay can run faster than real time.
+        self.clock = clock or time.time
+        self.wakeup = wakeup
+        # Called before each listening turn to drop stale input (bot echo / backlog).
+        self.input_flush = input_flush
+
+        if barge_in_enabled is None:
+            barge_in_enabled = os.getenv("BARGE_IN_ENABLED", "0") == "1"
+        if streaming_asr_enabled is None:
+            streaming_asr_enabled = os.getenv("STREAMING_ASR_ENABLED", "0") == "1"
+        self.barge_in_enabled = barge_in_enabled
+        self.streamer = StreamingTranscriber(models.asr, clock=self.clock) if streaming_asr_enabled else None
+        if streaming_llm_enabled is None:
+            streaming_llm_enabled = os.getenv("STREAMING_LLM_ENABLED", "1") == "1"
+        # Streamed replies are spoken clause by clause, so the speaker must queue.
+        self.streaming_llm_enabled = streaming_llm_enabled and hasattr(speaker, "enqueue")
+        if structured_asr_enabled is None:
+            structured_asr_enabled = os.getenv("ASR_STRUCTURED_ENABLED", "1") == "1"
+        # Verification turns (digits, dates) use WhisperASR.transcribe_structured.
+        self.structured_asr_enabled = structured_asr_enabled and hasattr(models.asr, "submit_structured")
+        self.structured_asr_kwargs = {
+            "language": os.getenv("ASR_STRUCTURED_LANGUAGE", "en"),
+            "alternatives": int(os.getenv("ASR_STRUCTURED_ALTERNATIVES", "3")),
+        }
+        if language_pinning_enabled is None:
+            language_pinning_enabled = os.getenv("LANGUAGE_PINNING", "1") == "1"
+        # Whisper detects the language only until this caller's is known.
+        self.language = (
+            load_language_tracker() if language_pinning_enabled and hasattr(models.asr, "submit_scored") else None
+        )
+        if speculation_enabled is None:
+            speculation_enabled = os.getenv("SPECULATION_ENABLED", "0") == "1"
+        # Route streaming partials before the endpoint; needs streaming ASR.
+        self.speculator = None
+        if speculation_enabled and self.streamer is not None:
+            self.speculator = Speculator(
+                self._prepare_speculation,
+                similarity=float(os.getenv("SPECULATION_SIMILARITY", "0.85")),
+                llm_enabled=os.getenv("SPECULATION_LLM", "1") == "1",
+                llm_min_words=int(os.getenv("SPECULATION_LLM_MIN_WORDS", "3")),
+                clock=self.clock,
+            )
+
+        self.sm = ConversationStateMachine()
+        self.latency_tracker = LatencyTracker(parent=getattr(models, "latency", None))
+        self.latency_log = {}
+        # One trace per turn: vad -> asr -> faq/verify/llm_cache/llm -> tts.
+        # Same writer as the process tracer, but span times on the session clock.
+        self.tracer = Tracer(getattr(getattr(models, "tracer", None), "writer", None), clock=self.clock)
+        self._turn_span = NULL_SPAN
+        self._asr_span = NULL_SPAN
+        self._llm_span = NULL_SPAN
+        self._tts_span = NULL_SPAN
+        self.filler_cycle = deque(FILLERS)
+
+        # End of turn from VAD probabilities, the line's noise floor and the dialogue state.
+        self.endpointer = endpointer or load_endpointer()
+        # All captured audio goes through one preallocated ring; buffers are
+        # absolute sample cursors into it instead of lists of chunks.
+        self.capture = AudioRingBuffer(
+            int(SAMPLE_RATE * (self.endpointer.longest_utterance_sec + CAPTURE_HEADROOM_SEC)) + PREROLL_SAMPLES
+        )
+        self.vad_stream = models.vad.create_stream()
+        # Barge-in needs ~0.25s of sustained speech before interrupting the bot.
+        self.barge_stream = models.vad.create_stream(min_speech_ms=250)
+        self.vad_cursor = 0
+        self.vad_result = None
+        self.chunk_rms = 0.0
+        self._chunk_start = 0
+        self._audio_time = None   # capture time of the newest ingested sample, if known
+        self._new_audio_start = None   # first sample not yet acted on
+        self.utterance_start = None   # includes pre-roll
+        self.utterance_end = None
+        self.speech_onset = None
+        self._onset_time = None
+        self.recording = False
+
+        self.response_text = None
+        self.pending_mobile = None
+        self.verify_attempts = 0
+        self.next_state_after_speaking = None
+        self.last_listen_state = None
+        self.asr_future = None
+        self._asr_structured = False
+        self.asr_alternatives = None   # [(text, logprob)] of a structured decode
+        self._asr_language = None   # language given to the decode (None = detected)
+        self._asr_started = None
+        self.llm_future = None
+        self.llm_stream = None
+        self._pending_clauses = []
+        self._llm_query = None
+
+        self._speaking_started = False
+        self._spoke_state_target = None
+        self._speech_end_time = None
+        self._first_byte_deadline = None
+        self._barge_cursor = 0
+        self._barge_onset = None
+
+    def _notify(self, *_args) -> None:
+        if self.wakeup is not None:
+            self.wakeup()
+
+    def _emit(self, kind: str, **payload) -> None:
+        if self.on_event is not None:
+            self.on_event(kind, payload)
+
+    def start(self) -> None:
+        self.sm.on_start()
+        self.response_text = WELCOME_TEXT
+        self.next_state_after_speaking = State.VERIFY_MOBILE
+        self.sm.transition_to(State.SPEAKING)
+
+    def close(self) -> None:
+        if self.asr_future is not None:
+            self.asr_future.cancel()
+        if self.llm_future is not None:
+            self.llm_future.cancel()
+        self._cancel_llm_stream()
+        self._end_turn(closed=True)
+        if self.streamer:
+            self.streamer.reset()
+        if self.speculator is not None:
+            self.speculator.cancel()
+            if self.speculator.wins + self.speculator.misses:
+                stats = self.speculator.stats()
+                print(
+                    f"[SPEC] wins={int(stats['wins'])} misses={int(stats['misses'])} "
+                    f"win_rate={stats['win_rate']:.0%} saved={stats['saved_ms_per_turn']:.0f} ms/turn"
+                )
+        if self.language is not None and self.language.pinned_turns:
+            stats = self.language.stats()
+            print(
+                f"[LANG] detected={int(stats['detected_turns'])} pinned={int(stats['pinned_turns'])} "
+                f"redetections={int(stats['redetections'])} saved≈{stats['saved_ms']:.0f} ms"
+            )
+        self.vad_stream.close()
+        self.barge_stream.close()
+        self.speaker.stop()
+
+    def pin_language(self, language: str) -> None:
+        """Caller's language known before the first turn: skip detection from the start."""
+        if self.language is not None:
+            self.language.pin(language)
+
+    def apply_filler_if_allowed(self, text: str) -> str:
+        if not text or is_sensitive_prompt(text):
+            return text
+        prefix = self.filler_cycle[0]
+        self.filler_cycle.rotate(-1)
+        if _has_filler(text):
+            return text
+        return prefix + text
+
+    # ------------------------------------------------------------------ loop
+
+    def next_timeout(self) -> float | None:
+        """
+        Seconds until advance() must run even if no audio or result arrives;
+        None if the session is only waiting on events (audio, ASR/LLM results).
+        """
+        sm = self.sm
+        if not sm.is_speaking():
+            return None
+        if not self._speaking_started:
+            return 0.0
+        now = self.clock()
+        deadlines = []
+        if now < self._speech_end_time:
+            deadlines.append(self._speech_end_time)
+        if "Audio_first_byte_time" not in self.latency_log:
+            deadlines.append(self._first_byte_deadline)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+
+    def step(self, chunk=None, capture_time: float | None = None) -> None:
+        """Advance the session by one mic chunk (or a timer tick when None)."""
+        if chunk is not None:
+            self.ingest(chunk, capture_time)
+            # Single-session use: score the queued frames now instead of
+            # waiting for a server-wide tick.
+            run_vad = getattr(self.models.vad, "run", None)
+            if run_vad is not None:
+                run_vad()
+        self.advance()
+
+    def ingest(self, chunk, capture_time: float | None = None) -> None:
+        """
+        Buffer a chunk and queue its frames for VAD without acting on it.
+        With a BatchedVADService the frames are scored on the service's next
+        tick, together with every other session's frames; call advance() after.
+        `capture_time` (session clock) is when the chunk's first sample was
+        recorded; speech/silence timing and USER_STOP_TIME then follow the
+        audio instead of when the loop got around to it.
+        """
+        sm = self.sm
+        self._audio_time = None if capture_time is None else capture_time + chunk.shape[0] / SAMPLE_RATE
+        if sm.is_speaking():
+            if self.barge_in_enabled and self._speaking_started:
+                self._ingest_barge(chunk)
+            return
+
+        # Keep capturing and running VAD while ASR decodes in the background.
+        capture = self.capture
+        capture.append(chunk)
+        if self._new_audio_start is None:
+            self._new_audio_start = capture.total_written - chunk.shape[0]
+        self.vad_cursor = max(self.vad_cursor, capture.oldest)
+        # Streaming VAD over zero-copy ring views: each frame is scored once.
+        self.vad_cursor += self.vad_stream.submit_frames(capture.window(self.vad_cursor))
+
+    def advance(self) -> None:
+        """Act on audio ingested (and VAD-scored) since the last call, and on timers."""
+        sm = self.sm
+        if sm.is_speaking():
+            self._step_speaking()
+            return
+        has_audio = self._new_audio_start is not None
+        if not has_audio and not sm.is_processing():
+            return
+
+        if has_audio:
+            self._chunk_start = self._new_audio_start
+            self._new_audio_start = None
+            self.vad_result = self.vad_stream.collect()
+            self.chunk_rms = self.capture.rms(max(self._chunk_start, self.capture.oldest))
+            if sm.is_listening():
+                self._step_listening()
+
+            # User resumed talking while we decode: the endpoint was premature,
+            # so drop the pending transcript and keep recording the same utterance.
+            if (
+                self.barge_in_enabled
+                and sm.is_processing()
+                and self.llm_future is None
+                and self.llm_stream is None
+                and "start" in self.vad_result.events
+            ):
+                print("[BARGE-IN] User kept talking; resuming the utterance")
+                if self.asr_future is not None:
+                    self.asr_future.cancel()
+                    self.asr_future = None
+                self._end_turn(resumed=True)
+                sm.transition_to(self.last_listen_state or State.LISTENING)
+                self.endpointer.resume(self.clock())
+                return
+
+        if sm.is_processing():
+            self._step_processing()
+        if sm.is_speaking() and not self._speaking_started:
+            self._begin_speaking()
+
+    def _now_audio(self) -> float:
+        """Capture time of the newest audio if the source reports it, else now."""
+        return self._audio_time if self._audio_time is not None else self.clock()
+
+    def _end_of_utterance(self, endpoint: str = "silence") -> None:
+        self.last_listen_state = self.sm.state
+        stop = self._now_audio()
+        self.latency_log["USER_STOP_TIME"] = stop
+        self.utterance_end = self.capture.total_written
+        self.sm.on_user_finished_speaking()
+
+        onset = self._onset_time if self._onset_time is not None else stop
+        audio_sec = (self.utterance_end - self.utterance_start) / SAMPLE_RATE
+        self._end_turn(superseded=True)
+        self._turn_span = self.tracer.start_span(
+            "turn", start_time=onset,
+            session=self.session_id, state=self.last_listen_state.name, audio_sec=audio_sec,
+        )
+        self.tracer.record(
+            "vad", onset, stop, parent=self._turn_span,
+            endpoint=endpoint, audio_sec=audio_sec, **self.endpointer.stats(),
+        )
+
+    def _end_turn(self, **attrs) -> None:
+        """Close the current turn's trace; open child spans are closed with it."""
+        for span in (self._asr_span, self._llm_span, self._tts_span):
+            span.end(cancelled=True)
+        self._turn_span.end(**attrs)
+        self._turn_span = self._asr_span = self._llm_span = self._tts_span = NULL_SPAN
+
+    def _reset_listen(self) -> None:
+        self.vad_stream.reset()
+        self.vad_cursor = self.capture.total_written
+        self.endpointer.reset()
+        self.recording = False
+
+    def _step_listening(self) -> None:
+        capture = self.capture
+        endpointer = self.endpointer
+        event = endpointer.update(self.vad_result, self.chunk_rms, self._now_audio(), self.sm.state)
+
+        if event == "speech":
+            if not self.recording:
+                self.recording = True
+                self._onset_time = self._now_audio()
+                self.speech_onset = self._chunk_start
+                self.utterance_start = max(self._chunk_start - PREROLL_SAMPLES, capture.oldest)
+                if self.streamer:
+                    self.streamer.reset()
+                    self.streamer.language = self._pinned_language()
+        elif event == "end":
+            if capture.total_written - self.speech_onset >= int(SAMPLE_RATE * endpointer.min_utterance_sec):
+                if capture.rms(max(self.speech_onset, capture.oldest)) >= endpointer.utterance_min_rms():
+                    self._end_of_utterance()
+                else:
+                    print("⚠️ Ignored low-energy (silence) audio")
+                    self.vad_stream.reset()
+                    self.vad_cursor = capture.total_written
+                    self.recording = False
+            if self.sm.is_listening():
+                self.recording = False
+
+        if self.streamer and self.recording and self.sm.is_listening():
+            partial = self.streamer.update(self._utterance_audio())
+            if partial:
+                print("📝 partial:", partial)
+                self._emit("partial", text=partial)
+                # A partial with the whole number in it lets the endpointer stop waiting.
+                endpointer.hint(partial)
+                if self.speculator is not None:
+                    self.speculator.update(partial, self.sm.state)
+        if self.recording and self.sm.is_listening() and (
+            capture.total_written - self.speech_onset >= int(SAMPLE_RATE * endpointer.max_sec(self.sm.state))
+        ):
+            print("⚠️ Max utterance length reached, processing partial audio")
+            self._end_of_utterance(endpoint="max_length")
+
+    def _pinned_language(self) -> str | None:
+        return self.language.language if self.language is not None else None
+
+    def _utterance_audio(self, end: int | None = None):
+        """
+        Ring view of the current utterance. A turn cut at max length can end
+        past the ring's reach (the check runs after whole chunks), so the
+        oldest pre-roll is dropped rather than read from overwritten audio.
+        """
+        self.utterance_start = max(self.utterance_start, self.capture.oldest)
+        return self.capture.window(self.utterance_start, end)
+
+    # ------------------------------------------------------------ processing
+
+    def _step_processing(self) -> None:
+        if self.llm_future is not None:
+            self._finish_llm()
+            return
+        if self.llm_stream is not None:
+            self._poll_llm_stream()
+            return
+
+        if self.asr_future is None:
+            print("⏳ ASR processing...")
+            utterance_audio = self._utterance_audio(self.utterance_end)
+            self._asr_structured = self.structured_asr_enabled and self.last_listen_state in STRUCTURED_STATES
+            # Scored decodes feed the language tracker; a pinned language skips detection.
+            scored = self.language is not None and not self._asr_structured
+            self._asr_language = self._pinned_language() if scored else None
+            if self._asr_structured:
+                # Digits/dates: constrained decode with alternatives for the extractors.
+                # With streaming ASR the partials only fed the endpointer and
+                # speculation; the final pass decodes the whole utterance.
+                if self.streamer:
+                    self.streamer.reset()
+                self.asr_future = self.models.asr.submit_structured(utterance_audio, **self.structured_asr_kwargs)
+            elif self.streamer:
+                # Committed words are final; only the unstable tail is decoded now.
+                self.streamer.language = self._asr_language
+                self.asr_future = self.streamer.finalize_async(utterance_audio, scored=scored)
+            else:
+                # A tiered ASR picks its model from the turn (digits vs open question).
+                submit_turn = getattr(self.models.asr, "submit_turn", None)
+                if submit_turn is not None:
+                    self.asr_future = submit_turn(
+                        utterance_audio, self.last_listen_state, language=self._asr_language, scored=scored
+                    )
+                elif scored:
+                    self.asr_future = self.models.asr.submit_scored(utterance_audio, language=self._asr_language)
+                else:
+                    self.asr_future = self.models.asr.submit(utterance_audio)
+            self._asr_started = self.clock()
+            self._asr_span = self.tracer.start_span(
+                "asr", parent=self._turn_span,
+                model=getattr(self.models.asr, "model_size", None),
+                audio_sec=utterance_audio.shape[0] / SAMPLE_RATE,
+                streaming=self.streamer is not None,
+                structured=self._asr_structured,
+                language_pinned=self._asr_language is not None,
+            )
+            self.asr_future.add_done_callback(self._notify)
+            return
+        if not self.asr_future.done():
+            return
+        self.asr_alternatives = None
+        try:
+            text = self.asr_future.result()
+        except Exception as exc:
+            print(f"[ASR] Transcription failed: {exc}")
+            self._asr_span.set(error=type(exc).__name__)
+            text = ""
+        if self._asr_structured and isinstance(text, list):
+            self.asr_alternatives = text
+            text = text[0][0] if text else ""
+            self._asr_span.set(alternatives=len(self.asr_alternatives))
+        elif not isinstance(text, str):
+            # ScoredTranscript: tells the tracker whether to pin or re-detect.
+            # A streaming finalize only decoded the tail.
+            if self.streamer:
+                audio_sec = self.streamer.last_tail_sec
+            else:
+                audio_sec = (self.utterance_end - self.utterance_start) / SAMPLE_RATE
+            asr_ms = (self.clock() - self._asr_started) * 1000.0
+            self.language.observe(text, self._asr_language, asr_ms, audio_sec)
+            self._asr_span.set(language=text.language)
+            text = text.text
+        tier = getattr(self.asr_future, "asr_tier", None)
+        if tier is not None:
+            print(f"[ASR] tier={tier}" + (" (escalated)" if self.asr_future.escalated else ""))
+            self._asr_span.set(model=tier, escalated=self.asr_future.escalated)
+        self.asr_future = None
+        self._asr_span.end(transcript_chars=len(text))
+        if self.streamer:
+            if not self._asr_structured:
+                print(
+                    f"[ASR] finalize={self.streamer.last_finalize_sec * 1000:.0f} ms "
+                    f"tail={self.streamer.last_tail_sec:.2f}s passes={self.streamer.passes}"
+                )
+            self.streamer.reset()
+        print("📝 USER SAID:", text)
+        self._emit("transcript", text=text)
+
+        self.latency_log["ASR_end_time"] = self.clock()
+        self._reset_listen()
+        self._route(text)
+
+    def _route(self, text: str) -> None:
+        sm = self.sm
+
+        # 🔒 HARD FILTER
+        if not text or len(text.strip()) < 4:
+            print("⚠️ Ignoring noise / short utterance")
+            self._end_turn(route="noise")
+            if self.speculator is not None:
+                self.speculator.cancel()
+            sm.transition_to(self.last_listen_state or State.LISTENING)
+            return
+
+        # Optional: ignore common hallucinations
+        if text.strip().lower() in NOISE_PHRASES:
+            print("⚠️ Ignoring hallucinated phrase")
+            self._end_turn(route="noise")
+            if self.speculator is not None:
+                self.speculator.cancel()
+            sm.transition_to(self.last_listen_state or State.LISTENING)
+            return
+
+        self.latency_log["LLM_start_time"] = self.clock()
+        self.latency_log.pop("LLM_end_time", None)
+        # Work prepared from a partial transcript, if the final one still matches it.
+        spec = self.speculator.take(text, self.last_listen_state) if self.speculator is not None else None
+        if spec is not None and spec.route != "llm":
+            self._turn_span.set(speculated_ms=self.speculator.commit(spec))
+
+        # Verification flow (voice-only)
+        if self.last_listen_state in {State.VERIFY_MOBILE, State.VERIFY_FAILED}:
+            self._turn_span.set(route="verify")
+            with self.tracer.start_span("verify", parent=self._turn_span, step="mobile") as span:
+                mobile = spec.value if spec is not None else self._extract(text, extract_mobile)
+                span.set(found=mobile is not None)
+            if mobile:
+                self.pending_mobile = mobile
+                self.response_text = ASK_SECONDARY_TEXT
+                self.next_state_after_speaking = State.VERIFY_SECONDARY
+            else:
+                self.response_text = REPEAT_MOBILE_TEXT
+                self.next_state_after_speaking = State.VERIFY_MOBILE
+            sm.transition_to(State.SPEAKING)
+
+        elif self.last_listen_state == State.VERIFY_SECONDARY:
+            self._turn_span.set(route="verify")
+            with self.tracer.start_span("verify", parent=self._turn_span, step="secondary") as span:
+                if spec is not None:
+                    last4, dob, user = spec.value
+                else:
+                    last4 = self._extract(text, extract_last4)
+                    dob = self._extract(text, extract_dob)
+                    user = verify_user(self.models.users, self.pending_mobile or "", last4=last4, dob=dob)
+                span.set(last4=last4 is not None, dob=dob is not None, verified=bool(user))
+            if user:
+                self.response_text = VERIFIED_TEXT
+                self.next_state_after_speaking = State.LISTENING
+                self.verify_attempts = 0
+            else:
+                self.verify_attempts += 1
+                self.pending_mobile = None
+                if self.verify_attempts >= 2:
+                    self.response_text = VERIFY_FAILED_TEXT
+                    self.next_state_after_speaking = State.VERIFY_FAILED
+                else:
+                    self.response_text = VERIFY_RETRY_TEXT
+                    self.next_state_after_speaking = State.VERIFY_MOBILE
+            sm.transition_to(State.SPEAKING)
+
+        else:
+            with self.tracer.start_span("faq", parent=self._turn_span) as span:
+                if spec is not None and spec.route == "faq":
+                    faq_answer = spec.value
+                else:
+                    faq_answer = match_faq(text, self.models.faq_list)
+                span.set(hit=faq_answer is not None)
+            if faq_answer:
+                if spec is not None and spec.route == "llm":
+                    self.speculator.discard(spec)
+                self._turn_span.set(route="faq")
+                self._respond(faq_answer)
+                return
+            cache = self.models.response_cache
+            cached = None
+            if cache is not None:
+                with self.tracer.start_span("llm_cache", parent=self._turn_span) as span:
+                    cached = cache.get(text, SYSTEM_PROMPT)
+                    span.set(hit=cached is not None)
+            if cached:
+                if spec is not None and spec.route == "llm":
+                    self.speculator.discard(spec)
+                self._turn_span.set(route="cache")
+                print(f"[CACHE] Reusing LLM reply (hit rate {cache.stats()['hit_rate']:.0%})")
+                self._respond(cached)
+                return
+
+            self._turn_span.set(route="llm")
+            self._llm_span = self.tracer.start_span(
+                "llm", parent=self._turn_span,
+                model=getattr(self.models.llm, "model", None),
+                streaming=self.streaming_llm_enabled,
+                prompt_chars=len(text),
+                speculative=spec is not None,
+            )
+            if spec is not None:
+                # Already in flight since the partial; the cache entry is keyed on what was asked.
+                self._llm_span.set(saved_ms=self.speculator.commit(spec))
+                self._llm_query = spec.text
+                llm = spec.llm
+            else:
+                self._llm_query = text
+                llm = self._start_llm(text)
+            if isinstance(llm, ResponseStream):
+                self.llm_stream = llm
+            else:
+                self.llm_future = llm
+
+    def _start_llm(self, text: str):
+        """LLM request off the audio loop: a ResponseStream, or a Future of the full reply."""
+        if self.streaming_llm_enabled:
+            # Speak the first clause while the rest is still generating.
+            return ResponseStream(
+                self.models.llm, self.models.llm_executor, text,
+                system_text=SYSTEM_PROMPT, on_update=self._notify, clock=self.clock,
+            )
+        # Network-bound; poll for it instead of stalling audio capture.
+        future = self.models.llm_executor.submit(self.models.llm.generate, text, system_text=SYSTEM_PROMPT)
+        future.add_done_callback(self._notify)
+        return future
+
+    def _prepare_speculation(self, text: str, state: State, allow_llm: bool):
+        """
+        Route a partial transcript the way _route would, without acting on
+        it: (route, value, llm request in flight) or None if nothing to prepare.
+        """
+        if len(text.strip()) < 4 or text.strip().lower() in NOISE_PHRASES:
+            return None
+        if state in {State.VERIFY_MOBILE, State.VERIFY_FAILED}:
+            return "verify", extract_mobile(text), None
+        if state == State.VERIFY_SECONDARY:
+            last4, dob = extract_last4(text), extract_dob(text)
+            user = verify_user(self.models.users, self.pending_mobile or "", last4=last4, dob=dob)
+            return "verify", (last4, dob, user), None
+        faq_answer = match_faq(text, self.models.faq_list)
+        if faq_answer:
+            return "faq", faq_answer, None
+        if not allow_llm:
+            return None
+        return "llm", None, self._start_llm(text)
+
+    def _extract(self, text: str, extract) -> str | None:
+        """Extract from the transcript, or vote across a structured decode's alternatives."""
+        if not self.asr_alternatives:
+            return extract(text)
+        value = best_candidate(self.asr_alternatives, extract)
+        if value != extract(text):
+            print(f"[VERIFY] {extract.__name__}: alternatives picked {value} over the top transcript")
+        return value
+
+    def _finish_llm(self) -> None:
+        if not self.llm_future.done():
+            return
+        try:
+            response_text = self.llm_future.result()
+        except Exception as exc:
+            print(f"[LLM] Request failed: {exc}")
+            response_text = None
+        self.llm_future = None
+        self.latency_log["LLM_end_time"] = self.clock()
+        self._llm_span.end(ok=bool(response_text), response_chars=len(response_text or ""))
+        if response_text:
+            self._cache_reply(response_text, self.clock() - self.latency_log["LLM_start_time"])
+        else:
+            response_text = LLM_FALLBACK_TEXT
+        self._respond(response_text)
+
+    def _poll_llm_stream(self) -> None:
+        stream = self.llm_stream
+        clauses = stream.poll()
+        if clauses:
+            self.latency_log["LLM_end_time"] = self.clock()
+            # The rest of the reply is queued behind the first clause while speaking.
+            self._pending_clauses = clauses[1:]
+            self._respond(clauses[0])
+        elif stream.done:
+            # Stream failed or came back empty.
+            self.llm_stream = None
+            self._llm_span.end(ok=False, response_chars=0)
+            self._respond(LLM_FALLBACK_TEXT)
+
+    def _speak_streamed_clauses(self) -> None:
+        stream = self.llm_stream
+        clauses = self._pending_clauses + stream.poll()
+        self._pending_clauses = []
+        for clause in clauses:
+            self.speaker.enqueue(clause)
+            self._emit("response_part", text=clause)
+        if stream.done:
+            self.llm_stream = None
+            print("🗣️ Bot reply streamed:", stream.text)
+            if stream.first_clause_time is not None:
+                self._llm_span.set(first_clause_ms=(stream.first_clause_time - stream.started_at) * 1000)
+            self._llm_span.end(ok=bool(stream.text), response_chars=len(stream.text))
+            if stream.first_clause_time is not None:
+                print(f"[LLM] first clause={(stream.first_clause_time - stream.started_at) * 1000:.0f} ms")
+                # A hit saves what the caller waited for: the first clause.
+                self._cache_reply(stream.text, stream.first_clause_time - stream.started_at)
+
+    def _cache_reply(self, response_text: str, cost_sec: float) -> None:
+        cache = self.models.response_cache
+        if cache is not None and self._llm_query:
+            cache.put(self._llm_query, response_text, SYSTEM_PROMPT, cost_ms=cost_sec * 1000.0)
+        self._llm_query = None
+
+    def _cancel_llm_stream(self) -> None:
+        if self.llm_stream is not None:
+            self.llm_stream.cancel()
+            self.llm_stream = None
+        self._pending_clauses = []
+
+    def _respond(self, response_text: str) -> None:
+        self.response_text = self.apply_filler_if_allowed(response_text)
+        self.sm.on_processing_done()
+
+    # -------------------------------------------------------------- speaking
+
+    def _begin_speaking(self) -> None:
+        if not self.response_text:
+            self.response_text = HOLD_TEXT
+        print("🗣️ Bot speaking:", self.response_text)
+        self._emit("response", text=self.response_text)
+
+        now = self.clock()
+        self.latency_log["TTS_start_time"] = now
+        self.latency_log.pop("Audio_first_byte_time", None)
+        self._tts_span = self.tracer.start_span(
+            "tts", parent=self._turn_span, start_time=now, chars=len(self.response_text),
+        )
+        self.speaker.speak(self.response_text)
+
+        self._speaking_started = True
+        self._spoke_state_target = self.next_state_after_speaking
+        self.next_state_after_speaking = None
+        self._first_byte_deadline = now + FIRST_BYTE_WAIT_SEC
+        # While bot is speaking, monitor mic and allow interrupt. No need to
+        # hold for a long fixed window when barge-in is disabled.
+        hold = BARGE_IN_WINDOW_SEC if self.barge_in_enabled else NO_BARGE_IN_HOLD_SEC
+        self._speech_end_time = now + hold
+        self._barge_cursor = self.capture.total_written
+        self._barge_onset = None
+
+    def _step_speaking(self) -> None:
+        if not self._speaking_started:
+            self._begin_speaking()
+        now = self.clock()
+
+        # Prefer the time the first samples reached the audio sink; fall back
+        # to the current time if the speaker never reports it.
+        if "Audio_first_byte_time" not in self.latency_log:
+            if self.speaker.last_start_time is not None:
+                self.latency_log["Audio_first_byte_time"] = self.speaker.last_start_time
+                self._tts_span.end(self.speaker.last_start_time)
+            elif now >= self._first_byte_deadline:
+                self.latency_log["Audio_first_byte_time"] = now
+                self._tts_span.end(now, first_byte="timeout")
+
+        if self.barge_in_enabled and now < self._speech_end_time:
+            if self._check_barge_in():
+                return
+        if self.llm_stream is not None:
+            self._speak_streamed_clauses()
+
+        if (
+            now >= self._speech_end_time
+            and "Audio_first_byte_time" in self.latency_log
+            and self.llm_stream is None
+        ):
+            self._finish_speaking()
+
+    def _ingest_barge(self, chunk) -> None:
+        capture = self.capture
+        capture.append(chunk)
+        chunk_start = capture.total_written - chunk.shape[0]
+        if (self.clock() - self.latency_log["TTS_start_time"]) < BARGE_IN_MIN_DELAY_SEC:
+            self._barge_cursor = capture.total_written
+            return
+
+        if capture.rms(chunk_start) < BARGE_IN_MIN_RMS:
+            self._barge_cursor = capture.total_written
+            return
+
+        if self._barge_onset is None:
+            self._barge_onset = chunk_start
+        self._barge_cursor = max(self._barge_cursor, capture.oldest)
+        self._barge_cursor += self.barge_stream.submit_frames(capture.window(self._barge_cursor))
+
+    def _check_barge_in(self) -> bool:
+        if not self.barge_stream.collect().speaking:
+            return False
+        capture = self.capture
+
+        print("[BARGE-IN] User interrupted current bot speech")
+        self._end_turn(barge_in=True)
+        self._cancel_llm_stream()
+        self.speaker.stop()
+        target = self._spoke_state_target or State.LISTENING
+        self.sm.transition_to(target)
+        self.response_text = None
+        self._speaking_started = False
+        # Seed the new utterance with the interruption audio already in the ring.
+        self.speech_onset = max(self._barge_onset, capture.oldest)
+        self.utterance_start = max(self.speech_onset - PREROLL_SAMPLES, capture.oldest)
+        self.vad_stream.reset()
+        self.vad_cursor = capture.total_written
+        self._new_audio_start = None
+        self.recording = True
+        self._onset_time = self.clock()
+        self.endpointer.resume(self._onset_time)
+        if self.streamer:
+            self.streamer.reset()
+            self.streamer.language = self._pinned_language()
+        self.barge_stream.reset()
+        self._emit("barge_in")
+        return True
+
+    def _finish_speaking(self) -> None:
+        current_metrics = self.latency_tracker.record(self.latency_log)
+        if current_metrics:
+            print(
+                "📊 Turn latency (ms): "
+                f"total={current_metrics['turn_ms']:.1f}, "
+                f"asr={current_metrics['asr_ms']:.1f}, "
+                f"asr->llm={current_metrics['asr_to_llm_ms']:.1f}, "
+                f"llm->tts={current_metrics['llm_to_tts_ms']:.1f}, "
+                f"tts_startup={current_metrics['tts_startup_ms']:.1f}"
+                + (f", llm={current_metrics['llm_ms']:.1f}" if "llm_ms" in current_metrics else "")
+            )
+            summary = self.latency_tracker.summary()
+            print(
+                "📈 Latency aggregate: "
+                f"count={int(summary['turn_count'])}, "
+                f"avg={summary['turn_avg_ms']:.1f} ms, "
+                f"p95={summary['turn_p95_ms']:.1f} ms"
+            )
+            self._emit("metrics", **current_metrics)
+        self._end_turn()
+
+        self._speaking_started = False
+        if self._spoke_state_target is not None:
+            self.sm.transition_to(self._spoke_state_target)
+        else:
+            self.sm.on_tts_finished()
+        self._spoke_state_target = None
+        # Drop stale chunks (bot echo / old backlog) before next listen turn.
+        if self.input_flush is not None:
+            self.input_flush()
+        self.vad_stream.reset()
+        self.vad_cursor = self.capture.total_written
+        self._new_audio_start = None
+        self.response_text = None
+        self.barge_stream.reset()
@@ -0,0 +1,145 @@
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from llm.response_cache import normalize_query, text_similarity
+
+
+class Speculation:
+    """What one partial transcript was routed to, prepared before the endpoint."""
+
+    __slots__ = ("text", "state", "route", "value", "llm", "started_at", "ready_at", "prepare_ms")
+
+    def __init__(self, text, state, route, value, llm, started_at, prepare_ms):
+        self.text = text
+        self.state = state
+        self.route = route          # "verify" | "faq" | "llm"
+        self.value = value          # extracted fields / FAQ answer
+        self.llm = llm              # ResponseStream or Future already in flight
+        self.started_at = started_at
+        self.ready_at = None        # LLM reply (first clause) available
+        self.prepare_ms = prepare_ms
+
+    @property
+    def llm_ready_at(self) -> float | None:
+        return getattr(self.llm, "first_clause_time", None) or self.ready_at
+
+    def cancel(self) -> None:
+        if self.llm is not None:
+            self.llm.cancel()
+
+
+class Speculator:
+    """
+    Speculative turn preparation on partial transcripts.
+
+    `update(text, state)` runs on every new partial transcript while the user
+    is speaking or inside the silence window. Unless the partial is close
+    to the current speculation, that one is cancelled and `prepare(text,
+    state, allow_llm)` routes the partial the way the session would: the
+    verification fields, the FAQ answer, or an LLM request started right
+    away (`allow_llm` once the partial has `llm_min_words`). It returns
+    (route, value, llm) or None.
+
+    At the endpoint `take(final_text, state)` hands back the speculation if
+    the final transcript is close to the partial it came from (trigram
+    similarity >= `similarity`; verification turns must match exactly after
+    normalization) and cancels it otherwise. The session then `commit()`s
+    it, or `discard()`s it if the final turn routed elsewhere.
+
+    Saved time is the LLM's head start on `clock` (the session clock, which
+    ResponseStream also uses), capped at its time to first clause; for verify/FAQ turns it is the
+    preparation time.
+    """
+
+    def __init__(
+        self, prepare, similarity: float = 0.85, llm_enabled: bool = True, llm_min_words: int = 3, clock=None
+    ):
+        self.prepare = prepare
+        self.clock = clock or time.time
+        self.similarity = similarity
+        self.llm_enabled = llm_enabled
+        self.llm_min_words = llm_min_words
+        self.current: Speculation | None = None
+
+        self.prepared = 0
+        self.llm_requests = 0
+        self.wins = 0
+        self.misses = 0
+        self.route_wins = Counter()
+        self.saved_ms = 0.0
+
+    def _matches(self, spec: Speculation, text: str) -> bool:
+        if spec.route == "verify":
+            return normalize_query(text) == normalize_query(spec.text)
+        return text_similarity(text, spec.text) >= self.similarity
+
+    def update(self, text: str, state) -> None:
+        current = self.current
+        if current is not None and current.state == state and self._matches(current, text):
+            return
+        self.cancel()
+        started = self.clock()
+        allow_llm = self.llm_enabled and len(text.split()) >= self.llm_min_words
+        prepared = self.prepare(text, state, allow_llm)
+        if prepared is None:
+            return
+        route, value, llm = prepared
+        spec = Speculation(text, state, route, value, llm, started, (self.clock() - started) * 1000.0)
+        if isinstance(llm, Future):
+            llm.add_done_callback(lambda _f: setattr(spec, "ready_at", self.clock()))
+        self.prepared += 1
+        self.llm_requests += llm is not None
+        self.current = spec
+        print(f"[SPEC] {route} prepared from partial: {text}")
+
+    def take(self, text: str, state) -> Speculation | None:
+        """The speculation if `text` (the final transcript) matches it; cancelled otherwise."""
+        spec, self.current = self.current, None
+        if spec is None:
+            return None
+        if spec.state == state and self._matches(spec, text):
+            return spec
+        self.discard(spec)
+        return None
+
+    def commit(self, spec: Speculation) -> float:
+        """Count a speculation the session used; returns the ms it saved."""
+        if spec.llm is not None:
+            now = self.clock()
+            ready = spec.llm_ready_at
+            saved = (min(now, ready) if ready is not None else now) - spec.started_at
+            saved_ms = max(saved, 0.0) * 1000.0
+        else:
+            saved_ms = spec.prepare_ms
+        self.wins += 1
+        self.route_wins[spec.route] += 1
+        self.saved_ms += saved_ms
+        print(f"[SPEC] {spec.route} speculation committed (saved {saved_ms:.0f} ms)")
+        return saved_ms
+
+    def discard(self, spec: Speculation) -> None:
+        spec.cancel()
+        self.misses += 1
+        print(f"[SPEC] {spec.route} speculation discarded")
+
+    def cancel(self) -> None:
+        """Drop the current speculation without scoring it (a new partial, noise, hang-up)."""
+        if self.current is not None:
+            self.current.cancel()
+            self.current = None
+
+    def stats(self) -> dict[str, float]:
+        turns = self.wins + self.misses
+        stats = {
+            "prepared": float(self.prepared),
+            "llm_requests": float(self.llm_requests),
+            "wins": float(self.wins),
+            "misses": float(self.misses),
+            "win_rate": self.wins / turns if turns else 0.0,
+            "saved_ms": self.saved_ms,
+            "saved_ms_per_turn": self.saved_ms / turns if turns else 0.0,
+        }
+        for route, wins in self.route_wins.items():
+            stats[f"{route}_wins"] = float(wins)
+        return stats
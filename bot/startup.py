@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class StartupOrchestrator:
+    """
+    Loads process components (VAD, ASR, TTS, LLM, data) concurrently and
+    records how long each load and warm-up took.
+
+    Model loads are mostly native code (torch, CTranslate2, ASR worker
+    processes) that releases the GIL, so threads overlap them; startup then
+    takes about as long as the slowest component instead of the sum.
+    STARTUP_PARALLEL=0 runs every loader inline, in submit order.
+    """
+
+    def __init__(self, parallel: bool | None = None, max_workers: int = 6):
+        if parallel is None:
+            parallel = os.getenv("STARTUP_PARALLEL", "1") == "1"
+        self.parallel = parallel
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup") if parallel else None
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._finished = None
+        self.timings: dict[str, float] = {}   # component -> ms
+
+    def _record(self, name: str, started: float) -> None:
+        with self._lock:
+            self.timings[name] = (time.perf_counter() - started) * 1000.0
+
+    def submit(self, name: str, load, *args, warm_up=None, **kwargs) -> Future:
+        """
+        Run `load(*args, **kwargs)`, then `warm_up(component)` if given.
+        Both steps are timed ("<name>" and "<name>_warm_up"); the future
+        resolves to the loaded component.
+        """
+
+        def run():
+            started = time.perf_counter()
+            component = load(*args, **kwargs)
+            self._record(name, started)
+            if warm_up is not None:
+                started = time.perf_counter()
+                warm_up(component)
+                self._record(f"{name}_warm_up", started)
+            return component
+
+        if self._executor is not None:
+            return self._executor.submit(run)
+        future = Future()
+        try:
+            future.set_result(run())
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def finish(self) -> dict[str, float]:
+        """Stop the loader threads and return the startup breakdown."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._finished is None:
+            self._finished = time.perf_counter()
+        return self.report()
+
+    def report(self) -> dict[str, float]:
+        end = self._finished or time.perf_counter()
+        with self._lock:
+            report = {f"{name}_ms": ms for name, ms in self.timings.items()}
+            report["sum_ms"] = sum(self.timings.values())
+        report["wall_ms"] = (end - self._started) * 1000.0
+        return report
+
+    def print_report(self) -> None:
+        report = self.report()
+        parts = ", ".join(f"{name.removesuffix('_ms')}={ms:.0f}" for name, ms in report.items() if name not in {"sum_ms", "wall_ms"})
+        print(
+            f"⏱️ Startup ready in {report['wall_ms']:.0f} ms "
+            f"(components {report['sum_ms']:.0f} ms, {'parallel' if self.parallel else 'sequential'}): {parts}"
+        )
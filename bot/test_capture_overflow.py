@@ -0,0 +1,60 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+
+from audio.vad import VADStream
+from bot.session import SAMPLE_RATE, Session
+from logic.state_machine import State
+
+# Turns cut at max length, fed in chunk sizes that do not divide the limit
+# evenly, must still hand the whole utterance to ASR.
+LEAD_SEC = 1.0
+
+
+class LoudnessVAD:
+    """Speech wherever the frame is loud; no model needed."""
+
+    sample_rate = SAMPLE_RATE
+
+    def create_stream(self, **kwargs) -> VADStream:
+        return VADStream(self, **kwargs)
+
+    def frame_prob(self, frame, stream) -> float:
+        return 0.9 if float(np.sqrt(np.mean(frame ** 2))) > 0.01 else 0.0
+
+
+class PendingASR:
+    def __init__(self):
+        self.audio = None
+
+    def submit(self, audio):
+        self.audio = np.array(audio)
+        return Future()
+
+
+for chunk_samples in (512, 700, 1000, 4000):
+    for state in (State.LISTENING, State.VERIFY_MOBILE):
+        asr = PendingASR()
+        models = SimpleNamespace(vad=LoudnessVAD(), asr=asr)
+        session = Session(models, SimpleNamespace(stop=lambda: None), streaming_asr_enabled=False)
+        session.sm.transition_to(state)
+
+        limit = int(SAMPLE_RATE * session.endpointer.max_sec(state))
+        silence = np.zeros(chunk_samples, dtype=np.float32)
+        speech = np.full(chunk_samples, 0.1, dtype=np.float32)
+        fed = 0
+        while not session.sm.is_processing():
+            session.step(silence if fed < LEAD_SEC * SAMPLE_RATE else speech)
+            fed += chunk_samples
+            assert fed < LEAD_SEC * SAMPLE_RATE + 2 * limit, "max utterance length never reached"
+
+        assert asr.audio is not None, "utterance not submitted to ASR"
+        assert asr.audio.shape[0] >= limit, (asr.audio.shape[0], limit)
+        print(f"✅ chunk={chunk_samples} state={state.name}: {asr.audio.shape[0] / SAMPLE_RATE:.2f}s to ASR")
@@ -0,0 +1,83 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm.llm_client import LLMClient
+from llm.stub_server import start_stub_server
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[int(round((len(values) - 1) * q))] if values else 0.0
+
+
+def run(base_url: str, pool_size: int, requests: int, sessions: int, prewarm: int, handshake_ms: float) -> dict:
+    client = LLMClient(api_key="bench", base_url=base_url, pool_size=pool_size)
+    if pool_size:
+        client.warm_up(prewarm)
+        # The stub charges its handshake after accept(); let it finish, as a
+        # real TLS pre-warm would have before connect() returned.
+        time.sleep(handshake_ms / 1000.0)
+
+    def call(_):
+        t0 = time.perf_counter()
+        client.generate("claim status kya hai?")
+        return (time.perf_counter() - t0) * 1000.0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        latencies = list(pool.map(call, range(requests)))
+    wall = time.perf_counter() - start
+    stats = client.pool.stats()
+    client.close()
+    return {
+        "mode": "pooled" if pool_size else "new_connection_per_request",
+        "pool_size": pool_size,
+        "requests": requests,
+        "sessions": sessions,
+        "wall_sec": wall,
+        "latency_p50_ms": _pct(latencies, 0.5),
+        "latency_p95_ms": _pct(latencies, 0.95),
+        "pool": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM keep-alive pool vs fresh connections against the local stub")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--prewarm", type=int, default=4)
+    parser.add_argument("--handshake-ms", type=float, default=120.0,
+                        help="simulated DNS+TCP+TLS cost per new connection")
+    parser.add_argument("--first-token-ms", type=float, default=150.0)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(
+        first_token_ms=args.first_token_ms,
+        token_ms=args.token_ms,
+        handshake_ms=args.handshake_ms,
+    )
+    # With the stub the simulated handshake is paid after TCP accept, so it
+    # shows up in ttfb of the first request on a connection rather than in
+    # connect_ms; against the real API the TLS handshake lands in connect_ms.
+    results = {
+        "handshake_ms": args.handshake_ms,
+        "fresh": run(base_url, 0, args.requests, args.sessions, 0, args.handshake_ms),
+        "pooled": run(base_url, args.pool_size, args.requests, args.sessions, args.prewarm, args.handshake_ms),
+    }
+    results["p50_saved_ms"] = results["fresh"]["latency_p50_ms"] - results["pooled"]["latency_p50_ms"]
+    server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
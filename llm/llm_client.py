@@ -1,7 +1,13 @@
+import http.client
 import json
 import os
-import urllib.request
-import urllib.error
+import ssl
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import urlsplit
 
 
 def _load_dotenv(dotenv_path: str) -> None:
@@ -22,6 +28,205 @@ def _load_dotenv(dotenv_path: str) -> None:
         return
 
 
+@dataclass
+class RequestTiming:
+    connect_ms: float   # 0 when a pooled connection was reused
+    ttfb_ms: float      # request sent -> response headers
+    body_ms: float      # headers -> last byte read
+    reused: bool
+    status: int
+
+
+class PooledResponse:
+    """
+    An HTTP response on a pooled connection. Closing it returns the
+    connection to the pool if the body was fully read and the server allows
+    keep-alive; otherwise the connection is dropped.
+    """
+
+    def __init__(self, pool, conn, response: http.client.HTTPResponse, timing: RequestTiming):
+        self.pool = pool
+        self.conn = conn
+        self.response = response
+        self.status = response.status
+        self.timing = timing
+        self._body_start = time.perf_counter()
+
+    def read(self) -> bytes:
+        return self.response.read()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            line = self.response.readline()
+            if not line:
+                return
+            yield line
+
+    def close(self) -> None:
+        if self.conn is None:
+            return
+        self.timing.body_ms = (time.perf_counter() - self._body_start) * 1000.0
+        if self.response.isclosed() and not self.response.will_close:
+            self.pool.release(self.conn)
+        else:
+            self.response.close()
+            self.pool.discard(self.conn)
+        self.conn = None
+        self.pool.record(self.timing)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HTTPConnectionPool:
+    """
+    Keep-alive connections to one host, shared by every session's LLM calls.
+
+    Up to `max_idle` connections are kept after use; idle connections older
+    than `idle_timeout_sec` are reaped before the server drops them. More than
+    `max_idle` requests can be in flight at once, the extra connections are
+    just closed afterwards. `max_idle=0` disables reuse.
+    """
+
+    def __init__(self, base_url: str, max_idle: int = 8, idle_timeout_sec: float = 60.0, timeout_sec: float = 30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path_prefix = parts.path.rstrip("/")
+        self.max_idle = max_idle
+        self.idle_timeout_sec = idle_timeout_sec
+        self.timeout_sec = timeout_sec
+        self._ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+        self._idle = deque()   # (conn, last_used); oldest on the left
+        self._lock = threading.Lock()
+        self.timings = deque(maxlen=256)
+        self.opened = 0
+        self.reaped = 0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout_sec, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout_sec)
+
+    def acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Most recently used idle connection (least likely to be stale), or a new one."""
+        with self._lock:
+            self._reap_locked(time.monotonic())
+            if self._idle:
+                conn, _ = self._idle.pop()
+                return conn, True
+            self.opened += 1
+        return self._new_connection(), False
+
+    def release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def discard(self, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+
+    def record(self, timing: RequestTiming) -> None:
+        self.timings.append(timing)
+
+    def reap_idle(self) -> int:
+        with self._lock:
+            return self._reap_locked(time.monotonic())
+
+    def _reap_locked(self, now: float) -> int:
+        reaped = 0
+        while self._idle and now - self._idle[0][1] > self.idle_timeout_sec:
+            conn, _ = self._idle.popleft()
+            conn.close()
+            reaped += 1
+        self.reaped += reaped
+        return reaped
+
+    def prewarm(self, count: int) -> int:
+        """Open `count` connections (DNS + TCP + TLS) in parallel and park them."""
+        count = min(count, self.max_idle)
+
+        def connect():
+            with self._lock:
+                self.opened += 1
+            conn = self._new_connection()
+            try:
+                conn.connect()
+            except OSError as exc:
+                print(f"[LLM] Pre-warm connect failed: {exc}")
+                conn.close()
+                return
+            self.release(conn)
+
+        threads = [threading.Thread(target=connect, daemon=True) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return len(self._idle)
+
+    def post(self, path: str, body: bytes, headers: dict) -> PooledResponse:
+        for attempt in range(2):
+            conn, reused = self.acquire()
+            started = time.perf_counter()
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                connected = time.perf_counter()
+                conn.request("POST", self.path_prefix + path, body=body, headers=headers)
+                response = conn.getresponse()
+            except ConnectionError:
+                conn.close()
+                # The server dropped an idle keep-alive connection; retry once fresh.
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            timing = RequestTiming(
+                connect_ms=(connected - started) * 1000.0,
+                ttfb_ms=(time.perf_counter() - connected) * 1000.0,
+                body_ms=0.0,
+                reused=reused,
+                status=response.status,
+            )
+            return PooledResponse(self, conn, response, timing)
+
+    def stats(self) -> dict[str, float]:
+        timings = list(self.timings)
+        count = len(timings)
+
+        def avg(values):
+            values = list(values)
+            return sum(values) / len(values) if values else 0.0
+
+        return {
+            "requests": float(count),
+            "reused": float(sum(t.reused for t in timings)),
+            "opened": float(self.opened),
+            "idle": float(len(self._idle)),
+            "reaped": float(self.reaped),
+            "connect_avg_ms": avg(t.connect_ms for t in timings),
+            "ttfb_avg_ms": avg(t.ttfb_ms for t in timings),
+            "body_avg_ms": avg(t.body_ms for t in timings),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                conn.close()
+
+
 class LLMClient:
     def __init__(
         self,
@@ -29,6 +234,7 @@ class LLMClient:
         base_url: str | None = None,
         model: str | None = None,
         timeout_sec: int | None = None,
+        pool_size: int | None = None,
     ) -> None:
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         _load_dotenv(os.path.join(project_root, ".env"))
@@ -42,18 +248,44 @@ class LLMClient:
         ).rstrip("/")
         self.model = model or os.getenv("GEMINI_MODEL") or os.getenv("LLM_MODEL") or "gemini-2.5-flash"
         self.timeout_sec = int(timeout_sec or os.getenv("LLM_TIMEOUT_SEC", "30"))
+        if pool_size is None:
+            pool_size = int(os.getenv("LLM_POOL_SIZE", "8"))
+        # Keep-alive connections reused across turns and sessions, so only the
+        # first request (or the pre-warm) pays for DNS + TCP + TLS.
+        self.pool = HTTPConnectionPool(
+            self.base_url,
+            max_idle=pool_size,
+            idle_timeout_sec=float(os.getenv("LLM_POOL_IDLE_SEC", "60")),
+            timeout_sec=self.timeout_sec,
+        )
 
-    def generate(
-        self,
-        user_text: str,
-        system_text: str | None = None,
-        temperature: float = 0.4,
-        max_tokens: int = 256,
-    ) -> str | None:
+    def warm_up(self, connections: int | None = None) -> int:
+        """Pre-open pooled connections so the first turn skips the handshake."""
         if not self.api_key:
-            print("[LLM] Missing GEMINI_API_KEY; skipping LLM call.")
-            return None
+            return 0
+        if connections is None:
+            connections = int(os.getenv("LLM_PREWARM", "2"))
+        started = time.perf_counter()
+        ready = self.pool.prewarm(connections)
+        print(f"[LLM] Pre-warmed {ready} connection(s) in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return ready
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _post(self, method: str, payload: dict, query: str = "") -> PooledResponse:
+        headers = {
+            "x-goog-api-key": self.api_key,
+            "Content-Type": "application/json",
+        }
+        return self.pool.post(
+            f"/models/{self.model}:{method}{query}",
+            body=json.dumps(payload).encode("utf-8"),
+            headers=headers,
+        )
 
+    @staticmethod
+    def _payload(user_text: str, system_text: str | None, temperature: float, max_tokens: int) -> dict:
         payload = {
             "contents": [{"role": "user", "parts": [{"text": user_text}]}],
             "generationConfig": {
@@ -63,25 +295,91 @@ class LLMClient:
         }
         if system_text:
             payload["systemInstruction"] = {"parts": [{"text": system_text}]}
+        return payload
 
-        url = f"{self.base_url}/models/{self.model}:generateContent"
-        headers = {
-            "x-goog-api-key": self.api_key,
-            "Content-Type": "application/json",
-        }
+    def generate(
+        self,
+        user_text: str,
+        system_text: str | None = None,
+        temperature: float = 0.4,
+        max_tokens: int = 256,
+    ) -> str | None:
+        if not self.api_key:
+            print("[LLM] Missing GEMINI_API_KEY; skipping LLM call.")
+            return None
 
-        request = urllib.request.Request(
-            url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers=headers,
-            method="POST",
-        )
+        payload = self._payload(user_text, system_text, temperature, max_tokens)
 
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout_sec) as response:
+            with self._post("generateContent", payload) as response:
                 body = response.read().decode("utf-8")
-                data = json.loads(body)
-                return data["candidates"][0]["content"]["parts"][0]["text"].strip()
-        except (urllib.error.URLError, urllib.error.HTTPError, KeyError, IndexError, json.JSONDecodeError) as exc:
+            _log_timing(response.timing)
+            if response.status != 200:
+                print(f"[LLM] Request failed: HTTP {response.status}: {body[:200]}")
+                return None
+            data = json.loads(body)
+            # A candidate stopped early (safety, token limit) can come without content.
+            candidate = (data.get("candidates") or [{}])[0]
+            parts = candidate.get("content", {}).get("parts", [])
+            text = "".join(part.get("text", "") for part in parts).strip()
+            if not text:
+                print(f"[LLM] Empty reply (finishReason={candidate.get('finishReason')})")
+                return None
+            return text
+        except (OSError, http.client.HTTPException, KeyError, IndexError, json.JSONDecodeError) as exc:
             print(f"[LLM] Request failed: {exc}")
             return None
+
+    def stream_generate(
+        self,
+        user_text: str,
+        system_text: str | None = None,
+        temperature: float = 0.4,
+        max_tokens: int = 256,
+    ) -> Iterator[str]:
+        """
+        Yield text deltas as the model produces them (`:streamGenerateContent`
+        over SSE). Stops quietly on errors, like generate() returning None;
+        closing the generator closes the connection.
+        """
+        if not self.api_key:
+            print("[LLM] Missing GEMINI_API_KEY; skipping LLM call.")
+            return
+
+        payload = self._payload(user_text, system_text, temperature, max_tokens)
+
+        try:
+            with self._post("streamGenerateContent", payload, query="?alt=sse") as response:
+                if response.status != 200:
+                    print(f"[LLM] Stream failed: HTTP {response.status}: {response.read()[:200]!r}")
+                    return
+                for data in _iter_sse_data(response):
+                    # The closing event may carry only finishReason / usageMetadata.
+                    candidate = (data.get("candidates") or [{}])[0]
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+            _log_timing(response.timing)
+        except (OSError, http.client.HTTPException, KeyError, IndexError, json.JSONDecodeError) as exc:
+            print(f"[LLM] Stream failed: {exc}")
+
+
+def _iter_sse_data(response) -> Iterator[dict]:
+    """JSON payloads of the `data:` fields of an SSE stream, one per event."""
+    lines = []
+    for raw_line in response:
+        line = raw_line.decode("utf-8").rstrip("\r\n")
+        if line.startswith("data:"):
+            lines.append(line[5:].lstrip())
+        elif not line and lines:
+            yield json.loads("\n".join(lines))
+            lines = []
+    if lines:
+        yield json.loads("\n".join(lines))
+
+
+def _log_timing(timing: RequestTiming) -> None:
+    print(
+        f"[LLM] connect={timing.connect_ms:.0f} ms ttfb={timing.ttfb_ms:.0f} ms "
+        f"body={timing.body_ms:.0f} ms reused={timing.reused}"
+    )
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Devanagari -> rough Hinglish spelling, so "क्लेम कब आएगा" and
+# "claim kab aayega" normalize to the same key.
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "व": "v", "श": "sh",
+    "ष": "sh", "स": "s", "ह": "h",
+    "क़": "q", "ख़": "kh", "ग़": "g", "ज़": "z", "फ़": "f", "ड़": "r", "ढ़": "rh",
+}
+_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ee", "उ": "u", "ऊ": "oo",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऋ": "ri", "ऑ": "o",
+}
+_MATRAS = {
+    "ा": "aa", "ि": "i", "ी": "ee", "ु": "u", "ू": "oo", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॉ": "o", "ॅ": "e",
+}
+_NASALS = {"ं": "n", "ँ": "n", "ः": "h"}
+_VIRAMA = "्"
+_NUKTA = "़"
+_NUKTA_BASE = {"क": "क़", "ख": "ख़", "ग": "ग़", "ज": "ज़", "फ": "फ़", "ड": "ड़", "ढ": "ढ़"}
+_DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+# Words that carry no intent; dropped from the spelling-folded query.
+FILLER_WORDS = {
+    "han", "hm", "um", "uh", "acha", "ach", "thik", "ok", "oke", "okai", "okay", "ji",
+    "please", "plz", "yar", "bhai", "sir", "madam", "toh", "matlab",
+    "actually", "so", "well", "basically", "hai", "h", "ek", "second",
+}
+# Never fillers: "cancel mat karo" is not "cancel karo". A near match must
+# agree on these too.
+NEGATION_WORDS = {"na", "nahi", "nhi", "ni", "mat", "no", "not", "never", "nothing"}
+
+_NEGATED_CONTRACTION = re.compile(r"n['’]t\b")
+_NON_WORD = re.compile(r"[^a-z0-9\s]+")
+_REPEATS = re.compile(r"([a-z])\1+")
+
+
+def transliterate_devanagari(text: str) -> str:
+    out = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in _CONSONANTS and i + 1 < len(text) and text[i + 1] == _NUKTA:
+            char = _NUKTA_BASE.get(char, char)
+            i += 1
+        if char in _CONSONANTS:
+            out.append(_CONSONANTS[char])
+            following = text[i + 1] if i + 1 < len(text) else ""
+            if following == _VIRAMA:
+                i += 1
+            elif following not in _MATRAS:
+                # Inherent vowel; dropped again at word end (schwa deletion).
+                out.append("\x00")
+        elif char in _MATRAS:
+            out.append(_MATRAS[char])
+        elif char in _VOWELS:
+            out.append(_VOWELS[char])
+        elif char in _NASALS:
+            out.append(_NASALS[char])
+        elif char != _NUKTA:
+            out.append(char)
+        i += 1
+    latin = re.sub(r"\x00(?=[^a-z]|$)", "", "".join(out))
+    return latin.replace("\x00", "a")
+
+
+def _fold_spelling(word: str) -> str:
+    """Hinglish spelling variants: aa/a, ee/i, oo/u, ai/e, c/k/s, w/v, y/i, hain/hai."""
+    word = word.replace("ee", "i").replace("oo", "u").replace("w", "v")
+    word = _REPEATS.sub(r"\1", word)
+    word = re.sub(r"c(?=[eiy])", "s", word)
+    word = re.sub(r"c(?!h)", "k", word)
+    word = word.replace("ai", "e")
+    word = re.sub(r"(?<=[aeiou])y(?=[aeiou])", "", word)
+    word = re.sub(r"(?<=.)y$", "i", word)
+    return re.sub(r"(?<=[ei])n$", "", word)
+
+
+# Query words are compared after folding, so the word lists are folded the
+# same way ("actually" -> "aktuali", "hai" -> "he").
+_FOLDED_FILLERS = frozenset(_fold_spelling(word) for word in FILLER_WORDS)
+_FOLDED_NEGATIONS = frozenset(_fold_spelling(word) for word in NEGATION_WORDS)
+
+
+def normalize_query(text: str) -> str:
+    """
+    Case, punctuation, script and spelling-variant folding for cache keys:
+    "Haan, CLAIM kab aayega??" and "क्लेम कब आएगा" both become "klem kab aega".
+    """
+    text = transliterate_devanagari(text.translate(_DEVANAGARI_DIGITS)).lower()
+    text = _NEGATED_CONTRACTION.sub(" not", text)
+    text = _NON_WORD.sub(" ", text)
+    words = []
+    for word in text.split():
+        word = _fold_spelling(word)
+        if word not in _FOLDED_FILLERS:
+            words.append(word)
+    return " ".join(words)
+
+
+def _trigrams(normalized: str) -> frozenset[str]:
+    grams = set()
+    for word in normalized.split():
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def _negations(normalized: str) -> frozenset[str]:
+    return frozenset(word for word in normalized.split() if word in _FOLDED_NEGATIONS)
+
+
+def text_similarity(a: str, b: str) -> float:
+    """Character-trigram Jaccard of the normalized texts; 1.0 = same query, 0.0 if one is negated."""
+    a, b = normalize_query(a), normalize_query(b)
+    if _negations(a) != _negations(b):
+        return 0.0
+    return _jaccard(_trigrams(a), _trigrams(b))
+
+
+class ResponseCache:
+    """
+    LLM replies keyed on the normalized user query (and the system prompt).
+
+    Exact hits compare normalized keys; with `similarity` > 0 a miss falls
+    back to the most similar cached query by character-trigram Jaccard, if it
+    clears the threshold and has the same negation words. Entries are evicted LRU beyond `max_entries` and
+    expire after `ttl_sec`. With `path`, entries are written to a JSON file
+    on every put and reloaded at startup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_sec: float = 24 * 3600,
+        similarity: float = 0.8,
+        path: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.similarity = similarity
+        self.path = path
+        # key -> (response, created_at, cost_ms, trigrams); insertion order = LRU order
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.saved_ms = 0.0
+        if path:
+            self._load()
+
+    @staticmethod
+    def _key(text: str, system_text: str | None) -> tuple[str, str]:
+        prompt = hashlib.sha1((system_text or "").encode("utf-8")).hexdigest()[:8]
+        normalized = normalize_query(text)
+        return f"{prompt}|{normalized}", normalized
+
+    def get(self, text: str, system_text: str | None = None) -> str | None:
+        key, normalized = self._key(text, system_text)
+        if not normalized:
+            return None
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            entry = self._live(key, now)
+            if entry is not None:
+                self.exact_hits += 1
+            elif self.similarity > 0:
+                key, entry = self._nearest(key, normalized, now)
+                if entry is not None:
+                    self.near_hits += 1
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.saved_ms += entry[2]
+            return entry[0]
+
+    def put(self, text: str, response: str, system_text: str | None = None, cost_ms: float = 0.0) -> None:
+        """Store a reply; `cost_ms` is what the LLM call took, counted as saved on each hit."""
+        key, normalized = self._key(text, system_text)
+        if not normalized or not response:
+            return
+        with self._lock:
+            self._entries[key] = (response, time.time(), cost_ms, _trigrams(normalized))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                self._save_locked()
+
+    def _live(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] > self.ttl_sec:
+            del self._entries[key]
+            return None
+        return entry
+
+    def _nearest(self, key: str, normalized: str, now: float):
+        prefix = key.split("|", 1)[0] + "|"
+        grams = _trigrams(normalized)
+        negations = _negations(normalized)
+        best_key, best_entry, best_score = None, None, self.similarity
+        for other_key, entry in self._entries.items():
+            if not other_key.startswith(prefix) or now - entry[1] > self.ttl_sec:
+                continue
+            if _negations(other_key[len(prefix):]) != negations:
+                continue
+            score = _jaccard(grams, entry[3])
+            if score >= best_score:
+                best_key, best_entry, best_score = other_key, entry, score
+        return best_key, best_entry
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"[CACHE] Could not load {self.path}: {exc}")
+            return
+        now = time.time()
+        for item in stored[-self.max_entries:]:
+            if now - item["created_at"] > self.ttl_sec:
+                continue
+            normalized = item["key"].split("|", 1)[1]
+            self._entries[item["key"]] = (
+                item["response"], item["created_at"], item.get("cost_ms", 0.0), _trigrams(normalized)
+            )
+        print(f"[CACHE] Loaded {len(self._entries)} cached replies from {self.path}")
+
+    def _save_locked(self) -> None:
+        stored = [
+            {"key": key, "response": response, "created_at": created_at, "cost_ms": cost_ms}
+            for key, (response, created_at, cost_ms, _) in self._entries.items()
+        ]
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print(f"[CACHE] Could not save {self.path}: {exc}")
+
+    def stats(self) -> dict[str, float]:
+        hits = self.exact_hits + self.near_hits
+        return {
+            "entries": float(len(self._entries)),
+            "lookups": float(self.lookups),
+            "exact_hits": float(self.exact_hits),
+            "near_hits": float(self.near_hits),
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            "saved_ms": self.saved_ms,
+        }
@@ -0,0 +1,147 @@
+import queue
+import re
+import threading
+import time
+
+# Sentence ends: . ! ? and the Devanagari danda / double danda.
+_SENTENCE_END = re.compile(r"[.!?।॥]+[\"')\]]*(?=\s)")
+# Clause breaks, only used once enough text has built up.
+_CLAUSE_END = re.compile(r"[,;:—]+(?=\s)")
+# "Rs. 500" is not the end of a sentence.
+_ABBREVIATIONS = {"rs", "mr", "mrs", "ms", "dr", "no", "vs", "etc", "approx", "st"}
+
+
+class ClauseChunker:
+    """
+    Turns a stream of LLM text deltas into speakable pieces.
+
+    Complete sentences are released as soon as their terminator is followed
+    by whitespace (so "2.5" or "Rs." mid-token is not split). A long sentence
+    is also cut at a comma/semicolon once it has `min_clause_chars`, and the
+    first piece may be cut earlier (`first_clause_chars`) so TTS can start.
+    """
+
+    def __init__(self, min_clause_chars: int = 60, first_clause_chars: int = 20):
+        self.min_clause_chars = min_clause_chars
+        self.first_clause_chars = first_clause_chars
+        self._buffer = ""
+        self._emitted = 0
+
+    def feed(self, delta: str) -> list[str]:
+        self._buffer += delta
+        pieces = []
+        while True:
+            piece = self._next_piece()
+            if piece is None:
+                break
+            if piece:
+                pieces.append(piece)
+        return pieces
+
+    def flush(self) -> str | None:
+        piece = self._buffer.strip()
+        self._buffer = ""
+        if piece:
+            self._emitted += 1
+            return piece
+        return None
+
+    def _next_piece(self) -> str | None:
+        match = None
+        for candidate in _SENTENCE_END.finditer(self._buffer):
+            words = self._buffer[:candidate.start()].split()
+            if candidate.group().startswith(".") and words and words[-1].lower() in _ABBREVIATIONS:
+                continue
+            match = candidate
+            break
+        if match is None:
+            min_chars = self.first_clause_chars if self._emitted == 0 else self.min_clause_chars
+            for candidate in _CLAUSE_END.finditer(self._buffer):
+                if candidate.end() >= min_chars:
+                    match = candidate
+                    break
+        if match is None:
+            return None
+        piece = self._buffer[:match.end()].strip()
+        self._buffer = self._buffer[match.end():].lstrip()
+        if piece:
+            self._emitted += 1
+        return piece
+
+
+class ResponseStream:
+    """
+    Runs `llm.stream_generate` on an executor and exposes speakable clauses.
+
+    The session polls `poll()` from its loop; clauses arrive while the rest of
+    the reply is still being generated, and `on_update()` (if given) is called
+    after each new clause and when the stream ends. `cancel()` stops reading
+    the stream (barge-in, hang-up) and closes the connection at the next delta.
+    Timestamps come from `clock` (the session clock).
+    """
+
+    def __init__(
+        self, llm, executor, user_text: str, system_text: str | None = None, chunker=None, on_update=None, clock=None
+    ):
+        self.chunker = chunker or ClauseChunker()
+        self.on_update = on_update
+        self.clock = clock or time.time
+        self.started_at = self.clock()
+        self.first_delta_time = None
+        self.first_clause_time = None
+        self.parts: list[str] = []
+        self._clauses = queue.Queue()
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self.future = executor.submit(self._run, llm, user_text, system_text)
+
+    @property
+    def done(self) -> bool:
+        """True once the stream has ended and every clause has been polled."""
+        return self._done.is_set() and self._clauses.empty()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts).strip()
+
+    def poll(self) -> list[str]:
+        clauses = []
+        while True:
+            try:
+                clauses.append(self._clauses.get_nowait())
+            except queue.Empty:
+                return clauses
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        if self.future.cancel():
+            self._done.set()
+
+    def _put(self, clause: str) -> None:
+        if self.first_clause_time is None:
+            self.first_clause_time = self.clock()
+        self._clauses.put(clause)
+        if self.on_update is not None:
+            self.on_update()
+
+    def _run(self, llm, user_text: str, system_text: str | None) -> str:
+        deltas = llm.stream_generate(user_text, system_text=system_text)
+        try:
+            for delta in deltas:
+                if self._cancelled.is_set():
+                    break
+                if self.first_delta_time is None:
+                    self.first_delta_time = self.clock()
+                self.parts.append(delta)
+                for clause in self.chunker.feed(delta):
+                    self._put(clause)
+            else:
+                tail = self.chunker.flush()
+                if tail:
+                    self._put(tail)
+        finally:
+            deltas.close()
+            self._done.set()
+            if self.on_update is not None:
+                self.on_update()
+        return self.text
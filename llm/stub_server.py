@@ -0,0 +1,152 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "Haan, main aapki help kar sakta hoon. "
+    "Aapki policy ka premium har saal renew hota hai, aur aap ise app se bhi pay kar sakte hain. "
+    "Kya aap kuch aur jaanna chahenge?"
+)
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    """
+    Minimal Gemini REST stand-in for offline runs.
+
+    `:generateContent` returns the whole reply after `first_token_ms` plus one
+    `token_ms` per word; `:streamGenerateContent?alt=sse` sends the same reply
+    word by word as SSE events with the same timing. `handshake_ms` is charged
+    once per new connection to stand in for the TLS handshake a real API
+    costs; keep-alive requests on the same connection skip it.
+    """
+
+    protocol_version = "HTTP/1.1"
+    reply = DEFAULT_REPLY
+    first_token_ms = 300.0
+    token_ms = 30.0
+    handshake_ms = 0.0
+
+    def setup(self):
+        super().setup()
+        # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+        # on keep-alive connections.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.handshake_ms:
+            time.sleep(self.handshake_ms / 1000.0)
+
+    def log_message(self, format, *args):
+        return
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        body = self.rfile.read(length)
+        try:
+            json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+
+        words = self.reply.split(" ")
+        if ":streamGenerateContent" in self.path:
+            self._stream(words)
+        elif ":generateContent" in self.path:
+            time.sleep((self.first_token_ms + self.token_ms * len(words)) / 1000.0)
+            self._send_json(200, _response(self.reply))
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def _send_json(self, status: int, data: dict):
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _write_event(self, data: dict):
+        event = f"data: {json.dumps(data)}\r\n\r\n".encode("utf-8")
+        self.wfile.write(f"{len(event):X}\r\n".encode("ascii") + event + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, words: list[str]):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        time.sleep(self.first_token_ms / 1000.0)
+        try:
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(self.token_ms / 1000.0)
+                delta = word if i == len(words) - 1 else word + " "
+                self._write_event(_response(delta))
+            # Like Gemini, the last event has no content, only the finish reason and usage.
+            self._write_event({
+                "candidates": [{"finishReason": "STOP"}],
+                "usageMetadata": {"candidatesTokenCount": len(words)},
+            })
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled the stream (barge-in); nothing left to do.
+            self.close_connection = True
+
+
+def _response(text: str) -> dict:
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+def start_stub_server(host="127.0.0.1", port=0, reply=None, first_token_ms=None, token_ms=None, handshake_ms=None):
+    """
+    Start the stub in a daemon thread; returns (server, base_url).
+    Point LLMClient at it with base_url=... (any api_key works).
+    """
+    attrs = {}
+    if reply is not None:
+        attrs["reply"] = reply
+    if first_token_ms is not None:
+        attrs["first_token_ms"] = first_token_ms
+    if token_ms is not None:
+        attrs["token_ms"] = token_ms
+    if handshake_ms is not None:
+        attrs["handshake_ms"] = handshake_ms
+    handler = type("ConfiguredStubHandler", (StubGeminiHandler,), attrs)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1beta"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini stub with SSE streaming")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--first-token-ms", type=float, default=StubGeminiHandler.first_token_ms)
+    parser.add_argument("--token-ms", type=float, default=StubGeminiHandler.token_ms)
+    parser.add_argument("--handshake-ms", type=float, default=StubGeminiHandler.handshake_ms)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(
+        args.host,
+        args.port,
+        first_token_ms=args.first_token_ms,
+        token_ms=args.token_ms,
+        handshake_ms=args.handshake_ms,
+    )
+    print(f"🧪 LLM stub listening; run the bot with GEMINI_BASE_URL={base_url} GEMINI_API_KEY=stub")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
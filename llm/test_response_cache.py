@@ -0,0 +1,36 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from llm.response_cache import ResponseCache, normalize_query
+
+# Spelling/script variants share a key; a negated query never shares one
+# (or a near match) with its plain form.
+SAME = [
+    ("Haan, CLAIM kab aayega??", "क्लेम कब आएगा"),
+    ("policy kaise renew karu", "Policy kese renew karu please"),
+    ("ek second nominee kya hai", "nominee kya"),
+    ("actually nominee", "nominee"),
+    ("basically claim status", "claim status"),
+    ("acha well okay bhai premium kitna hain", "premium kitna"),
+]
+NEGATED = [
+    ("meri policy cancel karo", "meri policy cancel na karo"),
+    ("meri policy cancel karo please", "meri policy cancel mat karo please"),
+    ("claim mila", "claim nahi mila"),
+    ("claim nahin mila hai", "claim mila hai"),
+    ("I want to renew my policy", "I don't want to renew my policy"),
+]
+
+for a, b in SAME:
+    assert normalize_query(a) == normalize_query(b), (a, b, normalize_query(a), normalize_query(b))
+    print(f"✅ same key: {a!r} / {b!r} -> {normalize_query(a)!r}")
+
+for plain, negated in NEGATED:
+    assert normalize_query(plain) != normalize_query(negated), (plain, negated)
+    cache = ResponseCache(similarity=0.8)
+    cache.put(plain, "plain reply")
+    assert cache.get(negated) is None, (plain, negated)
+    print(f"✅ different key: {plain!r} / {negated!r}")
@@ -0,0 +1,100 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import random
+import time
+
+from logic.faq_index import FAQIndex
+from logic.state_machine import load_faq
+
+SYLLABLES = ["ka", "ri", "po", "li", "sy", "cla", "im", "pre", "mi", "um", "no", "dar", "sha", "vin", "tel", "gho", "ban"]
+
+
+def synthetic_faq(entries: int, keywords_per_entry: int, seed: int = 0) -> list[dict]:
+    """The real FAQ file plus `entries` generated entries with 1-3 word keywords."""
+    rng = random.Random(seed)
+    vocab = sorted({"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(entries)})
+    faq = list(load_faq())
+    for i in range(entries):
+        keywords = [" ".join(rng.sample(vocab, rng.randint(1, 3))) for _ in range(keywords_per_entry)]
+        faq.append({"keywords": keywords, "answer": f"synthetic answer {i}"})
+    return faq
+
+
+def legacy_match(text, faq_list):
+    """The original matcher: nested `kw in text`, first hit in file order."""
+    text = text.lower()
+    for item in faq_list:
+        for kw in item["keywords"]:
+            if kw in text:
+                return item["answer"]
+    return None
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    if len(word) < 5:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1:]
+
+
+def make_queries(faq: list[dict], count: int, seed: int = 1) -> dict[str, list[str]]:
+    rng = random.Random(seed)
+    fillers = ["mera", "kya", "hai", "batao", "please", "mujhe", "jaldi"]
+    exact, fuzzy, miss = [], [], []
+    for _ in range(count):
+        keyword = rng.choice(rng.choice(faq)["keywords"])
+        exact.append(f"{rng.choice(fillers)} {keyword} {rng.choice(fillers)}")
+        typo = " ".join(misspell(word, rng) for word in keyword.split())
+        fuzzy.append(f"{rng.choice(fillers)} {typo} {rng.choice(fillers)}")
+        miss.append(" ".join(rng.choice(fillers) for _ in range(6)))
+    return {"exact": exact, "fuzzy": fuzzy, "miss": miss}
+
+
+def _time_queries(fn, queries: list[str]) -> dict:
+    latencies = []
+    hits = 0
+    for query in queries:
+        t0 = time.perf_counter()
+        if fn(query):
+            hits += 1
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+    latencies.sort()
+    return {
+        "hit_rate": hits / len(queries),
+        "mean_ms": sum(latencies) / len(latencies),
+        "p95_ms": latencies[int(round((len(latencies) - 1) * 0.95))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAQ index vs linear keyword scan")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--keywords", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    faq = synthetic_faq(args.entries, args.keywords)
+    t0 = time.perf_counter()
+    index = FAQIndex(faq)
+    build_sec = time.perf_counter() - t0
+    queries = make_queries(faq, args.queries)
+
+    results = {
+        "entries": len(faq),
+        "keywords": sum(len(item["keywords"]) for item in faq),
+        "index_build_sec": build_sec,
+        "automaton_nodes": len(index._goto),
+        "legacy": {kind: _time_queries(lambda q: legacy_match(q, faq), qs) for kind, qs in queries.items()},
+        "index": {kind: _time_queries(lambda q: index.match(q), qs) for kind, qs in queries.items()},
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import random
+import resource
+import time
+
+from logic.import_users import import_users
+from logic.user_store import SQLiteUserStore, open_user_store
+from logic.verify import verify_user
+
+
+def _mobile(i: int) -> str:
+    return str(6000000000 + i * 7)
+
+
+def write_users(path: str, records: int, as_array: bool) -> None:
+    rng = random.Random(records)
+    with open(path, "w", encoding="utf-8") as f:
+        if as_array:
+            f.write("[\n")
+        for i in range(records):
+            user = {
+                "mobile": _mobile(i),
+                "last4": f"{rng.randrange(10000):04d}",
+                "dob": f"{rng.randint(1950, 2005)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "name": f"user{i}",
+            }
+            sep = ",\n" if as_array and i < records - 1 else "\n"
+            f.write(json.dumps(user) + sep)
+        if as_array:
+            f.write("]\n")
+
+
+def _lookups(store, records: int, count: int) -> dict:
+    rng = random.Random(1)
+    hits, misses = [], []
+    for _ in range(count):
+        mobile = _mobile(rng.randrange(records))
+        t0 = time.perf_counter()
+        verify_user(store, mobile, last4="0000")
+        hits.append((time.perf_counter() - t0) * 1e6)
+        t0 = time.perf_counter()
+        verify_user(store, str(5000000000 + rng.randrange(records)), last4="0000")
+        misses.append((time.perf_counter() - t0) * 1e6)
+    hits.sort()
+    misses.sort()
+    return {
+        "hit_p50_us": hits[len(hits) // 2],
+        "hit_p95_us": hits[int(len(hits) * 0.95)],
+        "miss_p50_us": misses[len(misses) // 2],
+    }
+
+
+def bench_sqlite(workdir: str, records: int, lookups: int) -> dict:
+    src = os.path.join(workdir, f"users_{records}.jsonl")
+    db = os.path.join(workdir, f"users_{records}.db")
+    write_users(src, records, as_array=False)
+    t0 = time.perf_counter()
+    import_users(src, db, replace=True)
+    import_sec = time.perf_counter() - t0
+    os.remove(src)
+
+    t0 = time.perf_counter()
+    store = SQLiteUserStore(db)
+    verify_user(store, _mobile(0), last4="0000")
+    startup_ms = (time.perf_counter() - t0) * 1000.0
+    result = {
+        "backend": "sqlite",
+        "records": records,
+        "import_sec": import_sec,
+        "db_mb": os.path.getsize(db) / 1e6,
+        "startup_first_lookup_ms": startup_ms,
+        **_lookups(store, records, lookups),
+    }
+    store.close()
+    os.remove(db)
+    return result
+
+
+def bench_json(workdir: str, records: int, lookups: int) -> dict:
+    src = os.path.join(workdir, f"users_{records}.json")
+    write_users(src, records, as_array=True)
+    t0 = time.perf_counter()
+    store = open_user_store(src)
+    verify_user(store, _mobile(0), last4="0000")
+    startup_ms = (time.perf_counter() - t0) * 1000.0
+    result = {
+        "backend": "json_in_memory",
+        "records": records,
+        "startup_first_lookup_ms": startup_ms,
+        **_lookups(store, records, lookups),
+        # The old linear scan, for reference (one lookup).
+        "linear_scan_ms": _time_linear(list(store), records),
+    }
+    os.remove(src)
+    return result
+
+
+def _time_linear(users: list[dict], records: int) -> float:
+    t0 = time.perf_counter()
+    verify_user(users, _mobile(records - 1), last4="0000")
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="User store startup and lookup latency")
+    parser.add_argument("--records", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--json-max", type=int, default=1_000_000,
+                        help="largest size to also load as JSON in memory (needs several GB at 10M)")
+    parser.add_argument("--workdir", default=".")
+    args = parser.parse_args()
+
+    results = []
+    for records in args.records:
+        results.append(bench_sqlite(args.workdir, records, args.lookups))
+        if records <= args.json_max:
+            results.append(bench_json(args.workdir, records, args.lookups))
+    report = {
+        "results": results,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+_NON_WORD = re.compile(r"[^\wऀ-ॿ]+")
+
+# Keywords this short must also end on a word boundary ("hi" vs "hindi").
+SHORT_KEYWORD_CHARS = 3
+# Fuzzy fallback only corrects words at least this long.
+MIN_FUZZY_WORD_CHARS = 4
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def _bigrams(word: str) -> frozenset[str]:
+    padded = f" {word} "
+    return frozenset(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+@dataclass
+class FAQMatch:
+    answer: str
+    index: int          # position of the entry in the FAQ file
+    keyword: str
+    fuzzy: bool = False
+    score: float = 1.0  # word similarity for fuzzy matches
+
+
+class FAQIndex:
+    """
+    All FAQ keywords compiled into one Aho-Corasick automaton.
+
+    `match()` scans the text once regardless of FAQ size, collects every
+    keyword hit, and picks the most specific entry: longest keyword, then
+    most distinct keywords hit, then file order. If nothing matches, words
+    that are not FAQ vocabulary are corrected to the closest keyword word
+    by character-bigram Dice similarity (ASR misspellings such as "premum"
+    or "nomini") and the scan is repeated.
+
+    Behaves like the original list of FAQ dicts for iteration and indexing.
+    """
+
+    def __init__(self, faq_list: list[dict], fuzzy_threshold: float = 0.65):
+        self.entries = list(faq_list)
+        self.fuzzy_threshold = fuzzy_threshold
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # node -> [(entry index, keyword)] for every keyword ending at that node
+        self._out: list[list[tuple[int, str]]] = [[]]
+        self.vocabulary: set[str] = set()
+        for index, item in enumerate(self.entries):
+            for keyword in item["keywords"]:
+                keyword = normalize_text(keyword)
+                if keyword:
+                    self._add(keyword, index)
+                    self.vocabulary.update(keyword.split())
+        self._build_links()
+        self._build_fuzzy_index()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    # ----------------------------------------------------------- automaton
+
+    def _add(self, keyword: str, index: int) -> None:
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((index, keyword))
+
+    def _build_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Suffix keywords end here too ("status" inside "claim status").
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _scan(self, text: str) -> list[tuple[int, str]]:
+        hits = []
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        last = len(text) - 1
+        for pos, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not out[node]:
+                continue
+            for index, keyword in out[node]:
+                start = pos - len(keyword) + 1
+                if start > 0 and text[start - 1] != " ":
+                    continue
+                if len(keyword) <= SHORT_KEYWORD_CHARS and pos < last and text[pos + 1] != " ":
+                    continue
+                hits.append((index, keyword))
+        return hits
+
+    @staticmethod
+    def _best(hits: list[tuple[int, str]]) -> tuple[int, str] | None:
+        if not hits:
+            return None
+        longest: dict[int, str] = {}
+        distinct: dict[int, set[str]] = defaultdict(set)
+        for index, keyword in hits:
+            distinct[index].add(keyword)
+            if len(keyword) > len(longest.get(index, "")):
+                longest[index] = keyword
+        index = min(longest, key=lambda i: (-len(longest[i]), -len(distinct[i]), i))
+        return index, longest[index]
+
+    # -------------------------------------------------------------- fuzzy
+
+    def _build_fuzzy_index(self) -> None:
+        # (bigram, word length) -> vocabulary words; the length key keeps the
+        # candidate lists short even for very large FAQ sets.
+        self._postings: dict[tuple[str, int], list[str]] = defaultdict(list)
+        self._word_bigrams: dict[str, frozenset[str]] = {}
+        for word in self.vocabulary:
+            if len(word) < MIN_FUZZY_WORD_CHARS:
+                continue
+            grams = _bigrams(word)
+            self._word_bigrams[word] = grams
+            for gram in grams:
+                self._postings[(gram, len(word))].append(word)
+
+    def correct_word(self, word: str) -> tuple[str, float]:
+        """Closest keyword word and its similarity, or (word, 1.0) if none is close enough."""
+        if word in self.vocabulary or len(word) < MIN_FUZZY_WORD_CHARS:
+            return word, 1.0
+        grams = _bigrams(word)
+        shared: dict[str, int] = defaultdict(int)
+        for length in range(len(word) - 2, len(word) + 3):
+            for gram in grams:
+                for candidate in self._postings.get((gram, length), ()):
+                    shared[candidate] += 1
+        best, best_score = word, 0.0
+        for candidate, count in shared.items():
+            score = 2.0 * count / (len(grams) + len(self._word_bigrams[candidate]))
+            if score > best_score or (score == best_score and candidate < best):
+                best, best_score = candidate, score
+        if best_score >= self.fuzzy_threshold:
+            return best, best_score
+        return word, 1.0
+
+    # --------------------------------------------------------------- match
+
+    def match(self, text: str, fuzzy: bool = True) -> FAQMatch | None:
+        text = normalize_text(text)
+        best = self._best(self._scan(text))
+        if best is not None:
+            index, keyword = best
+            return FAQMatch(self.entries[index]["answer"], index, keyword)
+        if not fuzzy or self.fuzzy_threshold <= 0:
+            return None
+
+        corrected, scores = [], []
+        for word in text.split():
+            fixed, score = self.correct_word(word)
+            corrected.append(fixed)
+            if fixed != word:
+                scores.append(score)
+        if not scores:
+            return None
+        best = self._best(self._scan(" ".join(corrected)))
+        if best is None:
+            return None
+        index, keyword = best
+        return FAQMatch(self.entries[index]["answer"], index, keyword, fuzzy=True, score=min(scores))
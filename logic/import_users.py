@@ -0,0 +1,102 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+import sqlite3
+import time
+from typing import Iterator
+
+from logic.user_store import create_index, create_schema, user_to_row
+
+BATCH_SIZE = 50000
+READ_CHUNK = 1 << 20
+
+
+def iter_users(path: str) -> Iterator[dict]:
+    """
+    Users from a users.json-style array or a JSON Lines file, decoded one
+    record at a time so a multi-GB export never has to fit in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        while True:
+            # Skip array brackets, separators and whitespace between records.
+            while pos < len(buffer) and buffer[pos] in "[],\r\n\t ":
+                pos += 1
+            if pos >= len(buffer) - 1 and not eof:
+                chunk = f.read(READ_CHUNK)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            if pos >= len(buffer):
+                return
+            try:
+                user, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Record split across chunks; read more and retry.
+                chunk = f.read(READ_CHUNK)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield user
+            pos = end
+
+
+def import_users(src: str, dest: str, replace: bool = False) -> int:
+    if os.path.exists(dest):
+        if not replace:
+            raise FileExistsError(f"{dest} exists (use --replace)")
+        os.remove(dest)
+
+    conn = sqlite3.connect(dest)
+    # Bulk load: no journal, no fsync, index built once at the end.
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    create_schema(conn)
+
+    count = 0
+    batch = []
+    insert = "INSERT INTO users (mobile, last4, dob, name, extra) VALUES (?, ?, ?, ?, ?)"
+    for user in iter_users(src):
+        batch.append(user_to_row(user))
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(insert, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(insert, batch)
+        count += len(batch)
+    conn.commit()
+    create_index(conn)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import users.json (array or JSON Lines) into a SQLite user store")
+    parser.add_argument("src", help="users.json or users.jsonl")
+    parser.add_argument("dest", help="output .db file")
+    parser.add_argument("--replace", action="store_true", help="overwrite dest if it exists")
+    args = parser.parse_args()
+
+    started = time.time()
+    count = import_users(args.src, args.dest, replace=args.replace)
+    print(f"✅ Imported {count} users into {args.dest} in {time.time() - started:.1f}s")
+    print(f"   run the bot with USER_STORE_PATH={args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from enum import Enum, auto
 import time
 import json
 
+from logic.faq_index import FAQIndex
+
 
 class State(Enum):
     IDLE = auto()
@@ -83,14 +85,25 @@ class ConversationStateMachine:
 
 
 def load_faq(path="logic/faq.json"):
+    """
+    Load the FAQ file and compile its keywords into a FAQIndex.
+    The index iterates like the original list of FAQ entries.
+    """
     with open(path, "r") as f:
-        return json.load(f)
+        return FAQIndex(json.load(f))
 
 
 def match_faq(text, faq_list):
-    text = text.lower()
-    for item in faq_list:
-        for kw in item["keywords"]:
-            if kw in text:
-                return item["answer"]
-    return None
+    """
+    Answer of the most specific FAQ entry whose keyword appears in `text`,
+    with a fuzzy fallback for misspelled keywords. A plain list is compiled
+    on the fly; pass the FAQIndex from load_faq() to avoid that.
+    """
+    if not isinstance(faq_list, FAQIndex):
+        faq_list = FAQIndex(faq_list)
+    match = faq_list.match(text)
+    if match is None:
+        return None
+    if match.fuzzy:
+        print(f"[FAQ] Fuzzy match on '{match.keyword}' (similarity {match.score:.2f})")
+    return match.answer
@@ -0,0 +1,113 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+
+# Columns with their own SQLite column; anything else in a user record is
+# kept as JSON in `extra`.
+USER_FIELDS = ("mobile", "last4", "dob", "name")
+
+
+class InMemoryUserStore:
+    """
+    Users held in memory with a hash index on mobile number.
+    Iterates like the plain list of user dicts that load_users() used to return.
+    """
+
+    def __init__(self, users: list[dict]):
+        self.users = list(users)
+        self._by_mobile: dict[str, list[dict]] = defaultdict(list)
+        for user in self.users:
+            self._by_mobile[user.get("mobile")].append(user)
+
+    def get_by_mobile(self, mobile: str) -> list[dict]:
+        return self._by_mobile.get(mobile, [])
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def __iter__(self):
+        return iter(self.users)
+
+
+class SQLiteUserStore:
+    """
+    Users in a SQLite file built by logic/import_users.py, looked up through
+    the index on `mobile`. Nothing is read at construction; the database is
+    opened (read-only) on the first lookup, and SQLite pages in only the
+    index and rows that lookups touch, so startup cost does not grow with
+    the number of customers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(self.path)
+            self._conn = sqlite3.connect(
+                f"file:{os.path.abspath(self.path)}?mode=ro", uri=True, check_same_thread=False
+            )
+        return self._conn
+
+    def get_by_mobile(self, mobile: str) -> list[dict]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT mobile, last4, dob, name, extra FROM users WHERE mobile = ?", (mobile,)
+            ).fetchall()
+        return [_row_to_user(row) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def __iter__(self):
+        with self._lock:
+            rows = self._connection().execute("SELECT mobile, last4, dob, name, extra FROM users").fetchall()
+        return (_row_to_user(row) for row in rows)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _row_to_user(row) -> dict:
+    user = {field: value for field, value in zip(USER_FIELDS, row[:4]) if value is not None}
+    if row[4]:
+        user.update(json.loads(row[4]))
+    return user
+
+
+def user_to_row(user: dict) -> tuple:
+    extra = {key: value for key, value in user.items() if key not in USER_FIELDS}
+    return (
+        str(user.get("mobile", "")),
+        user.get("last4"),
+        user.get("dob"),
+        user.get("name"),
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+    )
+
+
+def create_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS users ("
+        "mobile TEXT NOT NULL, last4 TEXT, dob TEXT, name TEXT, extra TEXT)"
+    )
+
+
+def create_index(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS users_mobile ON users (mobile)")
+
+
+def open_user_store(path: str):
+    """SQLiteUserStore for .db/.sqlite files, InMemoryUserStore for JSON."""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteUserStore(path)
+    with open(path, "r") as f:
+        return InMemoryUserStore(json.load(f))
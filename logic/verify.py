@@ -1,6 +1,9 @@
-import json
+import math
+import os
 import re
 
+from logic.user_store import open_user_store
+
 _DIGIT_WORDS = {
     "zero": "0",
     "oh": "0",
@@ -28,9 +31,13 @@ def _normalize_digit_words(text: str) -> str:
     return "".join(out)
 
 
-def load_users(path="logic/users.json"):
-    with open(path, "r") as f:
-        return json.load(f)
+def load_users(path=None):
+    """
+    User store indexed by mobile number. `USER_STORE_PATH` may point at a
+    SQLite file from logic/import_users.py for large customer bases.
+    """
+    path = path or os.getenv("USER_STORE_PATH", "logic/users.json")
+    return open_user_store(path)
 
 
 def extract_mobile(text: str) -> str | None:
@@ -83,8 +90,28 @@ def extract_otp(text: str) -> str | None:
     return None
 
 
+def best_candidate(hypotheses: list[tuple[str, float]], extract) -> str | None:
+    """
+    Pick a value (mobile, last 4, DOB) from several ASR hypotheses in one
+    pass: every hypothesis votes for what `extract` finds in it, weighted by
+    its probability, so a digit misheard in the top hypothesis can be
+    outvoted by the alternatives. Hypotheses are (text, log-probability).
+    """
+    votes = {}
+    for text, score in hypotheses:
+        value = extract(text)
+        if value is not None:
+            votes[value] = votes.get(value, 0.0) + math.exp(score)
+    if not votes:
+        return None
+    return max(votes, key=votes.get)
+
+
 def verify_user(users, mobile: str, last4: str | None = None, dob: str | None = None):
-    for user in users:
+    # User stores look the mobile up in their index; plain lists are scanned.
+    get_by_mobile = getattr(users, "get_by_mobile", None)
+    candidates = get_by_mobile(mobile) if get_by_mobile is not None else users
+    for user in candidates:
         if user.get("mobile") != mobile:
             continue
         if last4 and user.get("last4") == last4:
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics.latency import QUANTILES, LatencyTracker
+
+METRIC = "voicebot_stage_latency_ms"
+
+
+def json_snapshot(tracker: LatencyTracker, sessions: dict[str, LatencyTracker] | None = None) -> dict:
+    return {
+        "global": tracker.snapshot(),
+        "sessions": {session_id: t.snapshot() for session_id, t in (sessions or {}).items()},
+    }
+
+
+def _labels(stage: str, session_id: str | None, **extra) -> str:
+    labels = {"stage": stage.removesuffix("_ms")}
+    if session_id is not None:
+        labels["session"] = session_id
+    labels.update(extra)
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def prometheus_text(tracker: LatencyTracker, sessions: dict[str, LatencyTracker] | None = None) -> str:
+    """Prometheus text exposition: one summary per stage, global and per active session."""
+    lines = [
+        f"# HELP {METRIC} Voice bot per-stage turn latency in milliseconds.",
+        f"# TYPE {METRIC} summary",
+    ]
+    max_lines = [
+        f"# HELP {METRIC}_max Largest observed per-stage turn latency in milliseconds.",
+        f"# TYPE {METRIC}_max gauge",
+    ]
+    scopes = [(None, tracker)] + sorted((sessions or {}).items())
+    for session_id, scope in scopes:
+        for stage, snap in scope.snapshot().items():
+            for q in QUANTILES:
+                value = snap[f"p{round(q * 100):d}"]
+                lines.append(f"{METRIC}{{{_labels(stage, session_id, quantile=q)}}} {value:.3f}")
+            labels = _labels(stage, session_id)
+            lines.append(f"{METRIC}_sum{{{labels}}} {snap['mean'] * snap['count']:.3f}")
+            lines.append(f"{METRIC}_count{{{labels}}} {snap['count']:.0f}")
+            max_lines.append(f"{METRIC}_max{{{labels}}} {snap['max']:.3f}")
+    return "\n".join(lines + max_lines) + "\n"
+
+
+def start_metrics_server(tracker: LatencyTracker, sessions=None, host: str = "127.0.0.1", port: int = 9108):
+    """
+    Serve `/metrics` (Prometheus text) and `/metrics.json` from a daemon
+    thread. `sessions` is a callable returning {session_id: LatencyTracker}
+    for the calls currently active. Returns (server, base_url).
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            return
+
+        def do_GET(self):
+            active = sessions() if sessions is not None else {}
+            if self.path == "/metrics":
+                body = prometheus_text(tracker, active).encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body = json.dumps(json_snapshot(tracker, active)).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    print(f"📈 Metrics at {base_url}/metrics (Prometheus) and {base_url}/metrics.json")
+    return server, base_url
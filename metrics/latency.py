@@ -1,22 +1,100 @@
 from __future__ import annotations
 
-from statistics import mean
+import math
+import threading
 
+# Per-turn stages, in pipeline order. llm_ms is only recorded on turns that
+# called the LLM (time to the first speakable clause when streaming).
+STAGES = ("asr_ms", "asr_to_llm_ms", "llm_ms", "llm_to_tts_ms", "tts_startup_ms", "turn_ms")
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
 
-def _p95(values: list[float]) -> float:
-    if not values:
-        return 0.0
-    values = sorted(values)
-    idx = int(round((len(values) - 1) * 0.95))
-    return values[idx]
+
+class StreamingHistogram:
+    """
+    Fixed-memory latency histogram with log-spaced buckets (HDR-style).
+
+    A value v lands in a bucket about `precision * v` wide, so every quantile
+    is within `precision` of the true value. Buckets are allocated on first
+    use and there are at most log(max/min) / log(1 + precision) of them, so
+    memory and record() cost do not grow with the number of samples.
+    """
+
+    def __init__(self, min_value: float = 0.1, max_value: float = 600_000.0, precision: float = 0.01):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.precision = precision
+        self._log_step = math.log1p(precision)
+        self._last_index = self._index(max_value)
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_step) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        if index == 0:
+            return self.min_value
+        low = self.min_value * math.exp((index - 1) * self._log_step)
+        return low * (1.0 + self.precision / 2.0)
+
+    def record(self, value: float) -> None:
+        value = max(float(value), 0.0)
+        index = min(self._index(value), self._last_index)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: StreamingHistogram) -> None:
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Clamp the bucket estimate to what was actually observed.
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        snap = {"count": float(self.count), "mean": self.mean, "max": self.max}
+        for q in QUANTILES:
+            snap[f"p{round(q * 100):d}"] = self.quantile(q)
+        return snap
 
 
 class LatencyTracker:
-    def __init__(self) -> None:
-        self.turn_latency_ms: list[float] = []
-        self.asr_to_llm_ms: list[float] = []
-        self.llm_to_tts_ms: list[float] = []
-        self.tts_startup_ms: list[float] = []
+    """
+    Per-stage latency histograms for one session, or for the whole process.
+
+    A session tracker created with `parent=` (the process-wide tracker on
+    SharedModels) forwards every observation to it, so both per-session and
+    global percentiles are available without keeping per-turn samples.
+    """
+
+    def __init__(self, parent: LatencyTracker | None = None) -> None:
+        self.parent = parent
+        self.stages = {stage: StreamingHistogram() for stage in STAGES}
+        self._lock = threading.Lock()
 
     def record(self, log: dict[str, float]) -> dict[str, float] | None:
         required = {
@@ -29,29 +107,43 @@ class LatencyTracker:
         if not required.issubset(log.keys()):
             return None
 
-        turn_ms = (log["TTS_start_time"] - log["USER_STOP_TIME"]) * 1000.0
-        asr_to_llm_ms = (log["LLM_start_time"] - log["ASR_end_time"]) * 1000.0
-        llm_to_tts_ms = (log["TTS_start_time"] - log["LLM_start_time"]) * 1000.0
-        tts_startup_ms = (log["Audio_first_byte_time"] - log["TTS_start_time"]) * 1000.0
-
-        self.turn_latency_ms.append(turn_ms)
-        self.asr_to_llm_ms.append(asr_to_llm_ms)
-        self.llm_to_tts_ms.append(llm_to_tts_ms)
-        self.tts_startup_ms.append(tts_startup_ms)
-
-        return {
-            "turn_ms": turn_ms,
-            "asr_to_llm_ms": asr_to_llm_ms,
-            "llm_to_tts_ms": llm_to_tts_ms,
-            "tts_startup_ms": tts_startup_ms,
+        metrics = {
+            "turn_ms": (log["TTS_start_time"] - log["USER_STOP_TIME"]) * 1000.0,
+            "asr_ms": (log["ASR_end_time"] - log["USER_STOP_TIME"]) * 1000.0,
+            "asr_to_llm_ms": (log["LLM_start_time"] - log["ASR_end_time"]) * 1000.0,
+            "llm_to_tts_ms": (log["TTS_start_time"] - log["LLM_start_time"]) * 1000.0,
+            "tts_startup_ms": (log["Audio_first_byte_time"] - log["TTS_start_time"]) * 1000.0,
         }
+        if "LLM_end_time" in log:
+            metrics["llm_ms"] = (log["LLM_end_time"] - log["LLM_start_time"]) * 1000.0
+        self.observe(metrics)
+        return metrics
+
+    def observe(self, metrics: dict[str, float]) -> None:
+        with self._lock:
+            for stage, value in metrics.items():
+                histogram = self.stages.get(stage)
+                if histogram is not None:
+                    histogram.record(value)
+        if self.parent is not None:
+            self.parent.observe(metrics)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {stage: histogram.snapshot() for stage, histogram in self.stages.items()}
 
     def summary(self) -> dict[str, float]:
-        return {
-            "turn_avg_ms": mean(self.turn_latency_ms) if self.turn_latency_ms else 0.0,
-            "turn_p95_ms": _p95(self.turn_latency_ms),
-            "asr_to_llm_avg_ms": mean(self.asr_to_llm_ms) if self.asr_to_llm_ms else 0.0,
-            "llm_to_tts_avg_ms": mean(self.llm_to_tts_ms) if self.llm_to_tts_ms else 0.0,
-            "tts_startup_avg_ms": mean(self.tts_startup_ms) if self.tts_startup_ms else 0.0,
-            "turn_count": float(len(self.turn_latency_ms)),
-        }
+        with self._lock:
+            stages = self.stages
+            return {
+                "turn_avg_ms": stages["turn_ms"].mean,
+                "turn_p95_ms": stages["turn_ms"].quantile(0.95),
+                "asr_avg_ms": stages["asr_ms"].mean,
+                "asr_p95_ms": stages["asr_ms"].quantile(0.95),
+                "llm_avg_ms": stages["llm_ms"].mean,
+                "llm_p95_ms": stages["llm_ms"].quantile(0.95),
+                "asr_to_llm_avg_ms": stages["asr_to_llm_ms"].mean,
+                "llm_to_tts_avg_ms": stages["llm_to_tts_ms"].mean,
+                "tts_startup_avg_ms": stages["tts_startup_ms"].mean,
+                "turn_count": float(stages["turn_ms"].count),
+            }
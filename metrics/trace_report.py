@@ -0,0 +1,141 @@
+import sys
+import os
+
+# add project root to PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import glob
+import json
+from collections import defaultdict
+
+BAR_WIDTH = 30
+
+
+def _trace_files(path: str) -> list[str]:
+    """`path` plus its rotated backups (path.1 ... path.N), oldest first."""
+    backups = [p for p in glob.glob(f"{glob.escape(path)}.*") if p.rsplit(".", 1)[-1].isdigit()]
+    backups.sort(key=lambda p: int(p.rsplit(".", 1)[-1]), reverse=True)
+    return backups + ([path] if os.path.exists(path) else [])
+
+
+def load_spans(paths: list[str]) -> list[dict]:
+    spans = []
+    for path in paths:
+        for name in _trace_files(path):
+            with open(name, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        spans.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A crash can leave a torn last line; skip it.
+                        continue
+    return spans
+
+
+def _pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[int(round((len(values) - 1) * q))] if values else 0.0
+
+
+def aggregate(spans: list[dict]) -> dict[str, dict]:
+    """
+    Group spans by their path from the trace root ("turn;llm") and sum
+    total and self time (total minus direct children) per path.
+    """
+    by_id = {span["span"]: span for span in spans}
+    children = defaultdict(float)
+    for span in spans:
+        if span.get("parent") in by_id:
+            children[span["parent"]] += span["dur_ms"]
+
+    def path_of(span: dict) -> str:
+        names = [span["name"]]
+        parent = by_id.get(span.get("parent"))
+        while parent is not None:
+            names.append(parent["name"])
+            parent = by_id.get(parent.get("parent"))
+        return ";".join(reversed(names))
+
+    stats = defaultdict(lambda: {"durations": [], "self_ms": 0.0, "flags": defaultdict(lambda: [0, 0])})
+    for span in spans:
+        entry = stats[path_of(span)]
+        entry["durations"].append(span["dur_ms"])
+        entry["self_ms"] += max(span["dur_ms"] - children[span["span"]], 0.0)
+        # Boolean attributes (FAQ hit, cache hit, verified...) become rates.
+        for key, value in span.get("attrs", {}).items():
+            if isinstance(value, bool):
+                entry["flags"][key][0] += value
+                entry["flags"][key][1] += 1
+
+    summary = {}
+    for path, entry in stats.items():
+        durations = entry["durations"]
+        summary[path] = {
+            "count": len(durations),
+            "total_ms": sum(durations),
+            "self_ms": entry["self_ms"],
+            "mean_ms": sum(durations) / len(durations),
+            "p50_ms": _pct(durations, 0.5),
+            "p95_ms": _pct(durations, 0.95),
+            "max_ms": max(durations),
+            "rates": {key: hits / seen for key, (hits, seen) in entry["flags"].items()},
+        }
+    return summary
+
+
+def format_flame(summary: dict[str, dict]) -> str:
+    """Indented call tree; each bar is the path's share of its root's total time."""
+    roots = {path: entry["total_ms"] for path, entry in summary.items() if ";" not in path}
+    lines = [f"{'stage':<28} {'count':>6} {'total ms':>10} {'self ms':>10} {'p50':>8} {'p95':>8}  share"]
+    for path in sorted(summary):
+        entry = summary[path]
+        depth = path.count(";")
+        root_total = roots.get(path.split(";", 1)[0]) or entry["total_ms"] or 1.0
+        share = min(entry["total_ms"] / root_total, 1.0)
+        label = "  " * depth + path.rsplit(";", 1)[-1]
+        rates = " ".join(f"{key}={rate:.0%}" for key, rate in sorted(entry["rates"].items()))
+        lines.append(
+            f"{label:<28} {entry['count']:>6} {entry['total_ms']:>10.1f} {entry['self_ms']:>10.1f} "
+            f"{entry['p50_ms']:>8.1f} {entry['p95_ms']:>8.1f}  "
+            f"{'█' * round(share * BAR_WIDTH):<{BAR_WIDTH}} {share:>4.0%}"
+            + (f"  {rates}" if rates else "")
+        )
+    return "\n".join(lines)
+
+
+def format_folded(summary: dict[str, dict]) -> str:
+    """Folded stacks (self time in µs) for flamegraph.pl / speedscope."""
+    return "\n".join(
+        f"{path} {round(entry['self_ms'] * 1000)}"
+        for path, entry in sorted(summary.items())
+        if entry["self_ms"] > 0
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a TRACE_PATH span file per pipeline stage")
+    parser.add_argument("trace", nargs="+", help="trace JSONL file(s); rotated .1 .. .N backups are included")
+    parser.add_argument("--folded", action="store_true", help="print folded stacks for flamegraph tools")
+    parser.add_argument("--json", action="store_true", help="print the per-stage summary as JSON")
+    args = parser.parse_args()
+
+    spans = load_spans(args.trace)
+    if not spans:
+        parser.error("no spans found")
+    summary = aggregate(spans)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    elif args.folded:
+        print(format_folded(summary))
+    else:
+        traces = len({span["trace"] for span in spans})
+        print(f"📊 {len(spans)} spans in {traces} traces")
+        print(format_flame(summary))
+
+
+if __name__ == "__main__":
+    main()
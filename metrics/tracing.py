@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+
+
+def _new_id() -> str:
+    """Random 64-bit hex id: unique across worker processes, restarts and appended trace files."""
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    """
+    One timed step of a turn. `end()` (or leaving the `with` block) stamps the
+    end time and hands the span to the tracer's writer; attributes can be
+    added until then with `set()`.
+    """
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "start", "end_time", "attrs")
+
+    def __init__(self, tracer, name: str, trace_id: str, parent_id: str | None, start: float, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.start = start
+        self.end_time = None
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def end(self, end_time: float | None = None, **attrs) -> None:
+        if self.end_time is not None:
+            return
+        self.attrs.update(attrs)
+        self.end_time = self.tracer.clock() if end_time is None else end_time
+        self.tracer._emit(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.end()
+
+
+class _NullSpan:
+    """Span stand-in when tracing is off: every call is a no-op."""
+
+    trace_id = None
+    span_id = None
+    end_time = None
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def end(self, end_time: float | None = None, **attrs) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Creates spans and forwards finished ones to a writer (anything with
+    `submit(dict)`). Without a writer tracing is off and spans cost nothing.
+    """
+
+    def __init__(self, writer=None, clock=None):
+        self.writer = writer
+        self.clock = clock or time.time
+
+    @property
+    def enabled(self) -> bool:
+        return self.writer is not None
+
+    def start_span(self, name: str, parent=None, start_time: float | None = None, **attrs):
+        """Root span (new trace) if `parent` is None, else a child of `parent`."""
+        if self.writer is None:
+            return NULL_SPAN
+        if parent is None or parent.trace_id is None:
+            trace_id, parent_id = _new_id(), None
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        start = self.clock() if start_time is None else start_time
+        return Span(self, name, trace_id, parent_id, start, attrs)
+
+    def record(self, name: str, start: float, end: float, parent=None, **attrs) -> None:
+        """A span whose start and end are already known (e.g. measured elsewhere)."""
+        self.start_span(name, parent=parent, start_time=start, **attrs).end(end)
+
+    def _emit(self, span: Span) -> None:
+        record = {
+            "trace": span.trace_id,
+            "span": span.span_id,
+            "parent": span.parent_id,
+            "name": span.name,
+            "start": span.start,
+            "end": span.end_time,
+            "dur_ms": (span.end_time - span.start) * 1000.0,
+        }
+        if span.attrs:
+            record["attrs"] = span.attrs
+        self.writer.submit(record)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+class JSONLTraceWriter:
+    """
+    Writes span records as JSON Lines from a background thread.
+
+    `submit()` never blocks: records go into a bounded queue and are dropped
+    (and counted in `dropped`) if the writer falls behind, so tracing cannot
+    stall the audio path. The file rotates at `max_bytes`, keeping `backups`
+    old files as path.1 ... path.N.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backups: int = 3, queue_size: int = 10000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict) -> bool:
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self.written += 1
+            if self._queue.empty():
+                self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        """Flush everything queued so far and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def load_tracer(clock=None) -> Tracer:
+    """TRACE_PATH=<file.jsonl> turns tracing on; unset, spans are no-ops."""
+    path = os.getenv("TRACE_PATH")
+    if not path:
+        return Tracer(clock=clock)
+    writer = JSONLTraceWriter(
+        path,
+        max_bytes=int(float(os.getenv("TRACE_MAX_MB", "50")) * 1024 * 1024),
+        backups=int(os.getenv("TRACE_BACKUPS", "3")),
+    )
+    print(f"[TRACE] Writing spans to {path}")
+    return Tracer(writer, clock=clock)
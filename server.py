@@ -0,0 +1,184 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+
+from bot import protocol
+from bot.models import SharedModels
+from bot.session import Session
+from metrics.export import start_metrics_server
+
+IDLE_TICK_SEC = 1.0   # upper bound on sleep when no session has a timer pending
+
+
+class RemoteSpeaker:
+    """Speaker for a network session: the client renders and plays the text."""
+
+    def __init__(self, send):
+        self._send = send
+        self.last_start_time = None
+
+    def speak(self, text: str):
+        self._send({"type": "speak", "text": text})
+        # Audio playback happens on the client; the send is our first byte.
+        self.last_start_time = time.time()
+
+    def enqueue(self, text: str):
+        self._send({"type": "speak", "text": text, "append": True})
+
+    def stop(self):
+        self._send({"type": "stop"})
+
+
+class VoiceBotServer:
+    """
+    Asyncio server that runs many concurrent calls against one model set.
+
+    Each connection gets its own `Session`; VAD, ASR workers and the LLM client
+    are loaded once in `SharedModels` and shared, so memory does not grow with
+    the number of callers. See bot/protocol.py for the wire format.
+    """
+
+    def __init__(self, models: SharedModels, host="127.0.0.1", port=8765):
+        self.models = models
+        self.host = host
+        self.port = port
+        self.sessions: dict[str, Session] = {}
+        self._ids = itertools.count(1)
+        self._loop = None
+        self._tick_scheduled = False
+        self._timer = None
+        self.ticks = 0
+
+    async def serve_forever(self):
+        self._loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"🚀 Voice bot server listening on {self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def request_tick(self) -> None:
+        """Run one server tick as soon as the loop is free (coalesces requests)."""
+        if not self._tick_scheduled:
+            self._tick_scheduled = True
+            self._loop.call_soon(self._tick)
+
+    def _wake_from_thread(self) -> None:
+        # ASR/LLM callbacks fire on worker threads.
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.request_tick)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session_id = f"call-{next(self._ids)}"
+
+        def send(message: dict):
+            if not writer.is_closing():
+                writer.write(protocol.encode_json(message))
+
+        def on_event(kind: str, payload: dict):
+            send({"type": kind, "session_id": session_id, **payload})
+
+        session = Session(
+            self.models,
+            speaker=RemoteSpeaker(send),
+            session_id=session_id,
+            on_event=on_event,
+            wakeup=self._wake_from_thread,
+        )
+        self.sessions[session_id] = session
+        print(f"[SERVER] {session_id} connected ({len(self.sessions)} active)")
+        send({"type": "ready", "session_id": session_id})
+        session.start()
+        self.request_tick()
+
+        try:
+            while True:
+                frame = await protocol.read_frame(reader)
+                if frame is None:
+                    break
+                kind, payload = frame
+                if kind == protocol.AUDIO:
+                    # Scored and acted on at the next server tick, batched
+                    # with every other session's audio that arrived meanwhile.
+                    session.ingest(protocol.decode_audio(payload))
+                    self.request_tick()
+                elif kind == protocol.JSON:
+                    message = json.loads(payload.decode("utf-8"))
+                    if not isinstance(message, dict):
+                        raise ValueError(f"JSON frame is not an object: {type(message).__name__}")
+                    if message.get("type") == "hello":
+                        self._hello(session, message)
+                    elif message.get("type") == "bye":
+                        break
+                await writer.drain()
+        except (ConnectionError, ValueError) as exc:
+            print(f"[SERVER] {session_id} dropped: {exc}")
+        finally:
+            session.close()
+            del self.sessions[session_id]
+            writer.close()
+            print(f"[SERVER] {session_id} closed ({len(self.sessions)} active)")
+
+    @staticmethod
+    def _hello(session: Session, message: dict) -> None:
+        """Client metadata: its own call id (for matching logs) and the caller's language, if known."""
+        call_id = message.get("call_id")
+        if call_id:
+            print(f"[SERVER] {session.session_id} is client call {call_id}")
+        language = message.get("language")
+        if language:
+            session.pin_language(language)
+
+    def _tick(self):
+        """
+        Server-wide tick, run only when something happened: audio arrived,
+        an ASR/LLM result landed or a session timer fell due. Scores all
+        queued VAD frames in batched forward passes, lets every session act,
+        then arms one timer for the earliest pending session deadline.
+        """
+        self._tick_scheduled = False
+        self.ticks += 1
+        run_vad = getattr(self.models.vad, "run", None)
+        if run_vad is not None:
+            run_vad()
+        timeout = IDLE_TICK_SEC
+        for session in list(self.sessions.values()):
+            session.advance()
+            session_timeout = session.next_timeout()
+            if session_timeout is not None:
+                timeout = min(timeout, session_timeout)
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_later(timeout, self.request_tick) if self.sessions else None
+
+
+def main():
+    models = SharedModels.load()
+    metrics_port = os.getenv("METRICS_PORT")
+    server = VoiceBotServer(
+        models,
+        host=os.getenv("VOICEBOT_HOST", "127.0.0.1"),
+        port=int(os.getenv("VOICEBOT_PORT", "8765")),
+    )
+    if metrics_port:
+        start_metrics_server(
+            models.latency,
+            sessions=lambda: {sid: s.latency_tracker for sid, s in list(server.sessions.items())},
+            host=os.getenv("METRICS_HOST", "127.0.0.1"),
+            port=int(metrics_port),
+        )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping Voice Bot server")
+    finally:
+        models.shutdown()
+
+
+if __name__ == "__main__":
+    main()